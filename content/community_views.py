@@ -5,11 +5,15 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.views.decorators.http import require_http_methods, require_POST
-from django.http import JsonResponse, Http404, HttpResponseForbidden
+from django.http import Http404, HttpResponse
 from django.utils.text import slugify
 from django.utils import timezone
-from django.db.models import Q, Count
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Left
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.conf import settings
+from django.core.cache import cache
 from accounts.permissions import require_permission_view, _permission_denied_response
 from .models import ForumPost, ForumComment, ForumCategory, Activity
 from . import firestore_service
@@ -17,38 +21,228 @@ from .firestore_adapters import (
     FirestoreCommunityPost, FirestoreComment, FirestoreCategoryProxy,
     FirestoreActivity,
 )
+from datetime import datetime
 import logging
+import orjson
+import secrets
 import uuid
 
 logger = logging.getLogger(__name__)
 
+COMMENTS_PAGE_SIZE = 50
+
+POST_LIST_FIELDS = (
+    'id', 'title', 'slug', 'is_pinned', 'is_locked', 'view_count', 'comment_count',
+    'created_at', 'last_activity_at',
+    'author__username', 'author__first_name', 'author__last_name',
+    'category__name', 'category__slug', 'category__color',
+)
+
+# The list shows ~30 words of each post; read only a prefix of the body
+POST_EXCERPT_CHARS = 500
+
+# Firestore category proxies built from the communityMeta/categoryCounts document
+CATEGORY_COUNTS_CACHE_KEY = 'community:categories:v2'
+CATEGORY_COUNTS_CACHE_TTL = 60
+
+# Create/edit form dropdowns (categories + activities), per data backend
+FORM_CONTEXT_CACHE_KEY = 'community:form_ctx:{backend}'
+FORM_CONTEXT_CACHE_TTL = 300
+
 
 def _use_firestore():
     return getattr(settings, 'USE_FIRESTORE', False)
 
 
+def _json(data, status=200):
+    """JSON response encoded with orjson (datetimes/UUIDs serialize natively)."""
+    return HttpResponse(
+        orjson.dumps(data, option=orjson.OPT_NAIVE_UTC),
+        content_type='application/json',
+        status=status,
+    )
+
+
+def _post_fields(data, *keys):
+    """Stripped values for ``keys`` from a POST QueryDict ('' when missing)."""
+    return tuple((data.get(key) or '').strip() for key in keys)
+
+
 def _get_form_context():
-    """Get categories and activities for create/edit post forms."""
+    """Get categories and activities for create/edit post forms (cached)."""
+    backend = 'fs' if _use_firestore() else 'orm'
+    context = cache.get_or_set(
+        FORM_CONTEXT_CACHE_KEY.format(backend=backend), _build_form_context, FORM_CONTEXT_CACHE_TTL
+    )
+    # Callers add the post being edited; keep that out of the cached dict
+    return dict(context)
+
+
+def invalidate_form_context_cache():
+    """Drop the ORM form dropdowns (called when categories/activities change)."""
+    cache.delete(FORM_CONTEXT_CACHE_KEY.format(backend='orm'))
+
+
+def _build_form_context():
     if _use_firestore():
         categories = FirestoreCategoryProxy.get_all_categories()
         activities_data = firestore_service.get_published_activities()
-        activities = [FirestoreActivity.from_dict(a) for a in activities_data]
+        activities = [FirestoreActivity.from_dict_summary(a) for a in activities_data]
     else:
-        categories = ForumCategory.objects.filter(is_active=True)
-        activities = Activity.objects.filter(is_published=True)[:50]
+        # Only the columns the <select> options render
+        categories = list(ForumCategory.objects.filter(is_active=True).values('id', 'name', 'slug'))
+        activities = list(Activity.objects.filter(is_published=True).values('id', 'title', 'grade')[:50])
     return {'categories': categories, 'activities': activities}
 
 
+def _sync_to_firestore(func, *args):
+    """
+    Run a firestore_service write in the background once the current DB
+    transaction commits. Arguments must be plain data - never the request.
+    """
+    transaction.on_commit(lambda: firestore_service.async_write(func, *args))
+
+
+def _reply_count_subquery():
+    """Number of visible replies (at any depth) below each outer comment."""
+    return Coalesce(
+        Subquery(
+            ForumComment.objects.filter(
+                post=OuterRef('post'),
+                is_deleted=False,
+                tree_path__startswith=Concat(OuterRef('tree_path'), Value('/')),
+            )
+            .order_by()
+            .values('post')
+            .annotate(c=Count('pk'))
+            .values('c')
+        ),
+        0,
+    )
+
+
+def _with_slug_suffix(slug):
+    """Append a short random suffix, keeping within ForumPost.slug's max_length."""
+    return f"{slug[:193]}-{secrets.token_hex(3)}"
+
+
+def _unique_post_slug(title, slug_exists):
+    """
+    Slug for a new post: slugify(title), plus a short random suffix on
+    collision. At most one ``slug_exists`` lookup regardless of how many
+    posts share the title.
+    """
+    slug = slugify(title)[:200]
+    if slug_exists(slug):
+        slug = _with_slug_suffix(slug)
+    return slug
+
+
+def _post_list_row(row):
+    """
+    Shape a POST_LIST_FIELDS ``values()`` row like the attributes community.html
+    reads from a post (``author_name``, ``category.name``/``color``).
+    """
+    full_name = f"{row.pop('author__first_name')} {row.pop('author__last_name')}".strip()
+    username = row.pop('author__username')
+    row['author_name'] = full_name or username
+    category = {
+        'name': row.pop('category__name'),
+        'slug': row.pop('category__slug'),
+        'color': row.pop('category__color'),
+    }
+    row['category'] = category if category['name'] is not None else None
+    return row
+
+
+def _encode_post_cursor(cursor):
+    """(lastActivityAt, post id) -> '?after=' value."""
+    if not cursor or not hasattr(cursor[0], 'isoformat'):
+        return ''
+    return f"{cursor[0].isoformat()}|{cursor[1]}"
+
+
+def _decode_post_cursor(value):
+    """'?after=' value -> (lastActivityAt, post id), or None if malformed."""
+    timestamp, sep, post_id = value.partition('|')
+    if not sep or not post_id:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp), post_id
+    except ValueError:
+        return None
+
+
+def _get_cached_firestore_categories():
+    """Category proxies with post counts from the aggregate counts document (one read)."""
+    categories = cache.get(CATEGORY_COUNTS_CACHE_KEY)
+    if categories is None:
+        counts = firestore_service.get_community_category_counts()
+        categories = FirestoreCategoryProxy.get_all_categories(counts=counts)
+        cache.set(CATEGORY_COUNTS_CACHE_KEY, categories, CATEGORY_COUNTS_CACHE_TTL)
+    return categories
+
+
+def _invalidate_category_counts():
+    cache.delete(CATEGORY_COUNTS_CACHE_KEY)
+
+
+def _search_posts(posts, search_query):
+    """
+    Filter a ForumPost queryset by a search string.
+
+    On PostgreSQL this hits the GIN-indexed ``search_vector`` column and
+    annotates ``search_rank`` for relevance ordering; other backends (SQLite
+    in local dev) fall back to icontains.
+    """
+    if connection.vendor == 'postgresql':
+        query = SearchQuery(search_query, config='english', search_type='websearch')
+        return posts.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        )
+    return posts.filter(
+        Q(title__icontains=search_query) |
+        Q(content__icontains=search_query)
+    )
+
+
+def _community_perm(user, capability):
+    """
+    Whether the user has one community capability ('view', 'post', 'moderate').
+
+    Each capability is resolved on first use and memoized on the user instance
+    (one per request, like has_perm_key's ``_perm_cache``), so a view only pays
+    for the checks it actually makes.
+    """
+    perms = getattr(user, '_community_perms', None)
+    if perms is None:
+        perms = user._community_perms = {}
+    if capability not in perms:
+        perms[capability] = user.can(f'community_{capability}')
+    return perms[capability]
+
+
+def _display_name(user):
+    """Author name written to posts/comments; memoized on the user like _community_perm."""
+    name = getattr(user, '_display_name', None)
+    if name is None:
+        name = user.get_full_name() or user.username
+        user._display_name = name
+    return name
+
+
 def _can_community_access(user):
-    return user.is_authenticated and user.can('community_post')
+    return user.is_authenticated and _community_perm(user, 'post')
 
 
 def _can_community_view(user):
-    return user.is_authenticated and (user.can('community_view') or user.can('community_post'))
+    if not user.is_authenticated:
+        return False
+    return _community_perm(user, 'view') or _community_perm(user, 'post')
 
 
 def _can_moderate_community(user):
-    return user.is_authenticated and user.can('community_moderate')
+    return user.is_authenticated and _community_perm(user, 'moderate')
 
 
 @require_permission_view('community_view')
@@ -60,48 +254,57 @@ def community_home(request):
     # Get filter parameters
     category_slug = request.GET.get('category', '')
     search_query = request.GET.get('q', '')
+    after = request.GET.get('after', '')
+    next_cursor = ''
 
     if _use_firestore():
-        # Firestore path
-        posts_data = firestore_service.get_community_posts(
+        # Firestore path - cursor pagination (?after=<lastActivityAt>|<id>)
+        posts_data, cursor = firestore_service.get_community_posts_page(
             limit=20,
             category=category_slug if category_slug else None,
             search=search_query if search_query else None,
+            start_after=_decode_post_cursor(after) if after else None,
         )
         posts = [FirestoreCommunityPost.from_dict(p) for p in posts_data]
+        next_cursor = _encode_post_cursor(cursor)
 
-        # Build categories with post counts from unfiltered data
-        if category_slug or search_query:
-            all_posts_data = firestore_service.get_community_posts(limit=200)
-        else:
-            all_posts_data = posts_data
-        categories = FirestoreCategoryProxy.get_all_categories(all_posts_data)
+        # Category post counts come from the aggregate document, not the page
+        categories = _get_cached_firestore_categories()
     else:
         # Django ORM path (fallback)
-        categories = ForumCategory.objects.filter(is_active=True).annotate(
-            post_count=Count('forumpost')
+        categories = ForumCategory.objects.filter(is_active=True).only(
+            'id', 'name', 'slug', 'order', 'post_count'
         )
 
-        posts = ForumPost.objects.select_related('author', 'category').annotate(
-            comment_count=Count('comments')
+        # Only the columns community.html renders (skips search_vector etc.),
+        # as plain rows - the list page never needs model instances
+        posts = ForumPost.objects.values(*POST_LIST_FIELDS).annotate(
+            content_excerpt=Left('content', POST_EXCERPT_CHARS)
         )
 
         if category_slug:
             posts = posts.filter(category__slug=category_slug)
 
         if search_query:
-            posts = posts.filter(
-                Q(title__icontains=search_query) |
-                Q(content__icontains=search_query)
-            )
+            posts = _search_posts(posts, search_query)
 
-        posts = posts.order_by('-is_pinned', '-last_activity_at')[:20]
+        ordering = ['-is_pinned', '-last_activity_at']
+        if 'search_rank' in posts.query.annotations:
+            # Most relevant matches first; recency breaks ties
+            ordering.insert(1, '-search_rank')
+
+        posts = [
+            _post_list_row(row)
+            for row in posts.order_by(*ordering)[:20]
+        ]
 
     context = {
         'posts': posts,
         'categories': categories,
         'selected_category': category_slug,
         'search_query': search_query,
+        'is_later_page': bool(after),
+        'next_cursor': next_cursor,
     }
     return render(request, 'community.html', context)
 
@@ -115,60 +318,73 @@ def post_detail(request, slug):
     use_firestore = _use_firestore()
     used_firestore = False
     is_author = False
+    has_more_comments = False
+    try:
+        comments_page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        comments_page = 1
+
+    offset = (comments_page - 1) * COMMENTS_PAGE_SIZE
+
+    # Set by create_post: the author's redirect after posting is not a view
+    just_created_id = request.session.pop('just_created_post_id', None)
 
     if use_firestore:
         # Firestore path
-        post_data = firestore_service.get_community_post_by_slug(slug)
+        post_data = firestore_service.get_community_post_by_slug(
+            slug, include_comments=False, use_cache=True
+        )
         if post_data:
             used_firestore = True
             post = FirestoreCommunityPost.from_dict(post_data)
 
-            # Increment view count (fire-and-forget)
-            try:
-                firestore_service.increment_post_view_count(post.id)
+            # Buffered view count; flushed to Firestore in batches
+            if post.id != just_created_id:
+                firestore_service.buffer_post_view(post.id)
                 post.view_count += 1
-            except Exception:
-                pass
 
             # Check if current user is the author
             user_uid = getattr(request.user, 'firebase_uid', '') if request.user.is_authenticated else ''
             is_author = bool(user_uid and post.author_id == user_uid)
 
-            # Build threaded comments
-            all_comments = post.comments
-            top_level = []
-            replies_map = {}
-
-            for comment in all_comments:
-                if comment.is_deleted:
-                    continue
-                # Mark if current user owns this comment
-                comment.is_own = bool(user_uid and comment.author_id == user_uid)
-                if comment.parent_comment_id:
-                    replies_map.setdefault(comment.parent_comment_id, []).append(comment)
-                else:
-                    top_level.append(comment)
-
-            for comment in top_level:
-                comment._replies_list = replies_map.get(comment.id, [])
+            # Top-level comments only; replies are loaded on demand
+            comments_data = firestore_service.get_post_comments(
+                post.id, limit=offset + COMMENTS_PAGE_SIZE + 1
+            )[offset:]
+            has_more_comments = len(comments_data) > COMMENTS_PAGE_SIZE
+
+            # Skip deleted comments before building adapters
+            comments = [
+                FirestoreComment.from_dict(c) for c in comments_data[:COMMENTS_PAGE_SIZE]
+                if not c.get('isDeleted', False)
+            ]
+            # Mark comments the current user owns (is_own defaults to False)
+            if user_uid:
+                for comment in comments:
+                    comment.is_own = comment.author_id == user_uid
 
-            comments = top_level
             can_comment = not post.is_locked
 
     if not used_firestore:
         # Django ORM path (also used as fallback when Firestore post not found)
         post = get_object_or_404(
-            ForumPost.objects.select_related('author', 'category'),
+            ForumPost.objects.select_related('author', 'category', 'related_activity'),
             slug=slug
         )
 
-        post.view_count += 1
-        post.save(update_fields=['view_count'])
+        if str(post.id) != just_created_id:
+            ForumPost.objects.filter(pk=post.pk).update(view_count=F('view_count') + 1)
+            post.view_count += 1
 
-        comments = post.comments.filter(
-            is_deleted=False,
-            parent_comment=None
-        ).select_related('author').prefetch_related('replies__author')
+        # One page of top-level comments with reply counts; replies are loaded on demand
+        page = list(
+            ForumComment.objects.filter(post=post, is_deleted=False, parent_comment=None)
+            .select_related('author')
+            .annotate(reply_count=_reply_count_subquery())
+            .order_by('tree_path')[offset:offset + COMMENTS_PAGE_SIZE + 1]
+        )
+        has_more_comments = len(page) > COMMENTS_PAGE_SIZE
+        comments = page[:COMMENTS_PAGE_SIZE]
 
         can_comment = not post.is_locked
         is_author = request.user.is_authenticated and post.author == request.user
@@ -178,12 +394,15 @@ def post_detail(request, slug):
         'comments': comments,
         'can_comment': can_comment,
         'is_author': is_author,
+        'comments_page': comments_page,
+        'has_more_comments': has_more_comments,
     }
     return render(request, 'community_post_detail.html', context)
 
 
 @require_permission_view('community_post')
 @require_http_methods(["GET", "POST"])
+@transaction.atomic
 def create_post(request):
     """
     Create a new forum post
@@ -191,24 +410,18 @@ def create_post(request):
 
     if request.method == 'POST':
         try:
-            title = request.POST.get('title', '').strip()
-            content = request.POST.get('content', '').strip()
-            category_key = request.POST.get('category', '')
-            activity_id = request.POST.get('activity', '')
+            title, content, category_key, activity_id = _post_fields(
+                request.POST, 'title', 'content', 'category', 'activity'
+            )
 
             # Validation
             if not title or not content:
                 messages.error(request, 'Title and content are required')
-                return render(request, 'community_post_post.html', _get_form_context())
+                return render(request, 'community_create_post.html', _get_form_context())
 
             if _use_firestore():
                 # Firestore path - create post directly in Firestore
-                base_slug = slugify(title)
-                slug = base_slug
-                counter = 1
-                while firestore_service.check_community_slug_exists(slug):
-                    slug = f"{base_slug}-{counter}"
-                    counter += 1
+                slug = _unique_post_slug(title, firestore_service.check_community_slug_exists)
 
                 post_id = str(uuid.uuid4())
                 now = timezone.now()
@@ -219,7 +432,7 @@ def create_post(request):
                     'slug': slug,
                     'category': category_key if category_key else '',
                     'authorId': request.user.firebase_uid,
-                    'authorName': request.user.get_full_name() or request.user.username,
+                    'authorName': _display_name(request.user),
                     'status': 'active',
                     'viewCount': 0,
                     'commentCount': 0,
@@ -233,18 +446,17 @@ def create_post(request):
                     post_data['relatedActivityId'] = activity_id
 
                 firestore_service.create_community_post(post_id, post_data)
-                logger.info(f"Community post created in Firestore: {post_id} by {request.user.username}")
+                _invalidate_category_counts()
+                request.session['just_created_post_id'] = post_id
+                logger.info("Community post created in Firestore: %s by %s", post_id, request.user.username)
 
                 messages.success(request, f'Post "{title}" created successfully!')
                 return redirect('v4:community-post-detail', slug=slug)
             else:
                 # Django ORM path
-                slug = slugify(title)
-                original_slug = slug
-                counter = 1
-                while ForumPost.objects.filter(slug=slug).exists():
-                    slug = f"{original_slug}-{counter}"
-                    counter += 1
+                slug = _unique_post_slug(
+                    title, lambda s: ForumPost.objects.filter(slug=s).exists()
+                )
 
                 # Get category if provided
                 category = None
@@ -262,48 +474,62 @@ def create_post(request):
                     except Activity.DoesNotExist:
                         pass
 
-                # Create post
-                post = ForumPost.objects.create(
-                    title=title,
-                    slug=slug,
-                    content=content,
-                    author=request.user,
-                    category=category,
-                    related_activity=activity
-                )
-
-                logger.info(f"Forum post created: {post.id} by {request.user.username}")
+                # Create post; a concurrent insert may still take the slug,
+                # in which case the unique constraint fires and we retry once
+                try:
+                    with transaction.atomic():
+                        post = ForumPost.objects.create(
+                            title=title,
+                            slug=slug,
+                            content=content,
+                            author=request.user,
+                            category=category,
+                            related_activity=activity
+                        )
+                except IntegrityError:
+                    post = ForumPost.objects.create(
+                        title=title,
+                        slug=_with_slug_suffix(slugify(title)),
+                        content=content,
+                        author=request.user,
+                        category=category,
+                        related_activity=activity
+                    )
+
+                logger.info("Forum post created: %s by %s", post.id, request.user.username)
+                _invalidate_category_counts()
+                request.session['just_created_post_id'] = str(post.id)
 
                 # Sync to Firestore (non-blocking)
-                try:
-                    firestore_service.create_community_post(str(post.id), {
-                        'title': post.title,
-                        'content': post.content,
-                        'slug': post.slug,
-                        'authorId': request.user.firebase_uid,
-                        'authorName': request.user.get_full_name(),
-                        'category': post.category.name if post.category else None,
-                        'status': 'active',
-                        'viewCount': 0,
-                        'createdAt': post.created_at,
-                        'lastActivityAt': post.last_activity_at
-                    })
-                except Exception as e:
-                    logger.warning(f"Failed to sync post to Firestore: {e}")
+                _sync_to_firestore(firestore_service.create_community_post, str(post.id), {
+                    'title': post.title,
+                    'content': post.content,
+                    'slug': post.slug,
+                    'authorId': request.user.firebase_uid,
+                    'authorName': _display_name(request.user),
+                    'category': post.category.name if post.category else None,
+                    'status': 'active',
+                    'viewCount': 0,
+                    'createdAt': post.created_at,
+                    'lastActivityAt': post.last_activity_at
+                })
 
                 messages.success(request, f'Post "{title}" created successfully!')
                 return redirect('v4:community-post-detail', slug=post.slug)
 
         except Exception as e:
-            logger.error(f"Failed to create post: {e}")
+            logger.error("Failed to create post: %s", e)
+            # Roll back any partial DB writes (and their queued Firestore syncs)
+            transaction.set_rollback(True)
             messages.error(request, f'Failed to create post: {str(e)}')
 
     # GET - show form
-    return render(request, 'community_post_post.html', _get_form_context())
+    return render(request, 'community_create_post.html', _get_form_context())
 
 
 @login_required
 @require_POST
+@transaction.atomic
 def add_comment(request, post_slug):
     """
     Add a comment to a post
@@ -314,31 +540,39 @@ def add_comment(request, post_slug):
     try:
         if _use_firestore():
             # Firestore path
-            post_data = firestore_service.get_community_post_by_slug(post_slug)
+            post_data = firestore_service.get_community_post_by_slug(post_slug, include_comments=False)
             if not post_data:
-                return JsonResponse({
+                return _json({
                     'success': False,
                     'message': 'Post not found'
                 }, status=404)
 
             if post_data.get('isLocked', False):
-                return JsonResponse({
+                return _json({
                     'success': False,
                     'message': 'This post is locked and no longer accepting comments'
                 }, status=403)
 
-            content = request.POST.get('content', '').strip()
-            parent_id = request.POST.get('parent_id', '')
+            content, parent_id = _post_fields(request.POST, 'content', 'parent_id')
 
             if not content:
-                return JsonResponse({
+                return _json({
                     'success': False,
                     'message': 'Comment content is required'
                 }, status=400)
 
+            # The batch bumps the parent's replyCount, so it must be a real comment
+            if parent_id and not firestore_service.get_document(
+                f"communityPosts/{post_data['id']}/comments", parent_id, fields=['isDeleted']
+            ):
+                return _json({
+                    'success': False,
+                    'message': 'Parent comment not found'
+                }, status=400)
+
             comment_id = str(uuid.uuid4())
             now = timezone.now()
-            author_name = request.user.get_full_name() or request.user.username
+            author_name = _display_name(request.user)
 
             comment_data = {
                 'content': content,
@@ -349,43 +583,46 @@ def add_comment(request, post_slug):
                 'isDeleted': False,
             }
 
-            firestore_service.add_comment_to_post(post_data['id'], comment_id, comment_data)
-
-            # Update post's last activity time and comment count
-            from firebase_admin import firestore as fb_firestore
-            firestore_service.update_community_post(post_data['id'], {
-                'lastActivityAt': now,
-                'commentCount': fb_firestore.Increment(1),
-            })
+            # Also bumps the post's commentCount and lastActivityAt
+            if not firestore_service.add_comment_to_post(post_data['id'], comment_id, comment_data):
+                return _json({
+                    'success': False,
+                    'message': 'Failed to add comment'
+                }, status=500)
 
-            logger.info(f"Comment added to Firestore post {post_data['id']} by {request.user.username}")
+            logger.info("Comment added to Firestore post %s by %s", post_data['id'], request.user.username)
 
-            return JsonResponse({
+            return _json({
                 'success': True,
                 'message': 'Comment added successfully',
                 'comment': {
                     'id': comment_id,
                     'author': author_name,
                     'content': content,
-                    'created_at': now.strftime('%B %d, %Y at %I:%M %p')
+                    'created_at': now.isoformat()
                 }
             })
         else:
-            # Django ORM path
-            post = get_object_or_404(ForumPost, slug=post_slug)
+            # Django ORM path - only the columns we need, no model instance
+            post = ForumPost.objects.filter(slug=post_slug).values('id', 'is_locked').first()
+            if post is None:
+                return _json({
+                    'success': False,
+                    'message': 'Post not found'
+                }, status=404)
+            post_id = post['id']
 
             # Check if post is locked
-            if post.is_locked:
-                return JsonResponse({
+            if post['is_locked']:
+                return _json({
                     'success': False,
                     'message': 'This post is locked and no longer accepting comments'
                 }, status=403)
 
-            content = request.POST.get('content', '').strip()
-            parent_id = request.POST.get('parent_id', '')
+            content, parent_id = _post_fields(request.POST, 'content', 'parent_id')
 
             if not content:
-                return JsonResponse({
+                return _json({
                     'success': False,
                     'message': 'Comment content is required'
                 }, status=400)
@@ -394,67 +631,139 @@ def add_comment(request, post_slug):
             parent_comment = None
             if parent_id:
                 try:
-                    parent_comment = ForumComment.objects.get(id=parent_id, post=post)
-                except ForumComment.DoesNotExist:
-                    pass
-
-            # Create comment
+                    uuid.UUID(parent_id)
+                except ValueError:
+                    return _json({
+                        'success': False,
+                        'message': 'Parent comment not found'
+                    }, status=400)
+                parent_comment = ForumComment.objects.filter(
+                    id=parent_id, post_id=post_id
+                ).only('id', 'tree_path').first()
+                if parent_comment is not None and parent_comment.depth >= ForumComment.MAX_DEPTH:
+                    # Too deep for tree_path; attach as a sibling (to the parent's parent)
+                    grandparent_path = parent_comment.tree_path.rpartition('/')[0]
+                    parent_comment = ForumComment.objects.filter(
+                        post_id=post_id, tree_path=grandparent_path
+                    ).only('id', 'tree_path').first()
+
+            # Create comment; the post_save signal bumps the post's
+            # comment_count and last_activity_at in a single UPDATE
             comment = ForumComment.objects.create(
-                post=post,
+                post_id=post_id,
                 author=request.user,
                 content=content,
                 parent_comment=parent_comment
             )
 
-            # Update post's last activity
-            post.last_activity_at = timezone.now()
-            post.save(update_fields=['last_activity_at'])
-
-            logger.info(f"Comment added to post {post.id} by {request.user.username}")
+            logger.info("Comment added to post %s by %s", post_id, request.user.username)
 
             # Sync to Firestore (non-blocking)
-            try:
-                firestore_service.add_comment_to_post(str(post.id), str(comment.id), {
-                    'content': comment.content,
-                    'authorId': request.user.firebase_uid,
-                    'authorName': request.user.get_full_name(),
-                    'parentCommentId': str(parent_comment.id) if parent_comment else None,
-                    'createdAt': comment.created_at,
-                    'isDeleted': False
-                })
-            except Exception as e:
-                logger.warning(f"Failed to sync comment to Firestore: {e}")
+            _sync_to_firestore(firestore_service.add_comment_to_post, str(post_id), str(comment.id), {
+                'content': comment.content,
+                'authorId': request.user.firebase_uid,
+                'authorName': _display_name(request.user),
+                'parentCommentId': str(parent_comment.id) if parent_comment else None,
+                'createdAt': comment.created_at,
+                'isDeleted': False
+            })
 
-            return JsonResponse({
+            return _json({
                 'success': True,
                 'message': 'Comment added successfully',
                 'comment': {
                     'id': str(comment.id),
                     'author': comment.author_name,
                     'content': comment.content,
-                    'created_at': comment.created_at.strftime('%B %d, %Y at %I:%M %p')
+                    'created_at': comment.created_at.isoformat()
                 }
             })
 
     except Exception as e:
-        logger.error(f"Failed to add comment: {e}")
-        return JsonResponse({
+        logger.error("Failed to add comment: %s", e)
+        transaction.set_rollback(True)
+        return _json({
             'success': False,
             'message': f'Failed to add comment: {str(e)}'
         }, status=500)
 
 
+@require_permission_view('community_view')
+@require_http_methods(["GET"])
+def get_comment_replies(request, post_id, comment_id):
+    """
+    Return the replies below a comment as JSON, in thread order
+    """
+    try:
+        replies = []
+        if _use_firestore():
+            # Firestore path
+            user_uid = getattr(request.user, 'firebase_uid', '') or None
+            for reply_data in firestore_service.get_post_comments(post_id, parent_comment_id=comment_id):
+                if reply_data.get('isDeleted', False):
+                    continue
+                reply = FirestoreComment.from_dict(reply_data)
+                replies.append({
+                    'id': reply.id,
+                    'author': reply.author_name,
+                    'content': reply.content,
+                    'created_at': reply.created_at.isoformat() if reply.created_at else '',
+                    'is_own': reply.author_id == user_uid,
+                })
+        else:
+            # Django ORM path
+            parent = ForumComment.objects.filter(
+                pk=comment_id, post_id=post_id
+            ).values('tree_path').first()
+            if parent is None:
+                return _json({
+                    'success': False,
+                    'message': 'Comment not found'
+                }, status=404)
+
+            descendants = (
+                ForumComment.objects.filter(
+                    post_id=post_id,
+                    is_deleted=False,
+                    tree_path__startswith=parent['tree_path'] + '/',
+                )
+                .select_related('author')
+                .order_by('tree_path')
+            )
+            for reply in descendants:
+                replies.append({
+                    'id': str(reply.id),
+                    'author': reply.author_name,
+                    'content': reply.content,
+                    'created_at': reply.created_at.isoformat(),
+                    'is_own': reply.author_id == request.user.id,
+                })
+
+        return _json({'success': True, 'replies': replies})
+
+    except Exception as e:
+        logger.error("Failed to load replies for comment %s: %s", comment_id, e)
+        return _json({
+            'success': False,
+            'message': f'Failed to load replies: {str(e)}'
+        }, status=500)
+
+
 @login_required
 @require_POST
+@transaction.atomic
 def delete_post(request, post_id):
     """
     Delete a post (author or admin only)
     """
     try:
         if _use_firestore():
-            post_data = firestore_service.get_document('communityPosts', post_id)
+            # Permission check only needs the author (title for the message)
+            post_data = firestore_service.get_document(
+                'communityPosts', post_id, fields=['authorId', 'title']
+            )
             if not post_data:
-                return JsonResponse({
+                return _json({
                     'success': False,
                     'message': 'Post not found'
                 }, status=404)
@@ -462,48 +771,56 @@ def delete_post(request, post_id):
             user_uid = getattr(request.user, 'firebase_uid', '')
             is_author = post_data.get('authorId') == user_uid
             if not is_author and not _can_moderate_community(request.user):
-                return JsonResponse({
+                return _json({
                     'success': False,
                     'message': 'You do not have permission to delete this post'
                 }, status=403)
 
             post_title = post_data.get('title', '')
             firestore_service.delete_community_post(post_id)
-            logger.info(f"Forum post deleted from Firestore: {post_id} by {request.user.username}")
+            _invalidate_category_counts()
+            logger.info("Forum post deleted from Firestore: %s by %s", post_id, request.user.username)
 
-            return JsonResponse({
+            return _json({
                 'success': True,
                 'message': f'Post "{post_title}" deleted successfully'
             })
         else:
-            post = get_object_or_404(ForumPost, id=post_id)
-
-            # Check permission (must be author or admin)
-            if post.author != request.user and not _can_moderate_community(request.user):
-                return JsonResponse({
+            # One scoped delete; authors are limited to their own posts, moderators
+            # are not. Only the columns the delete signals read are loaded.
+            posts = ForumPost.objects.filter(id=post_id).only('id', 'category_id')
+            if not _can_moderate_community(request.user):
+                posts = posts.filter(author=request.user)
+            deleted, _ = posts.delete()
+
+            if not deleted:
+                # Only now work out why nothing was deleted
+                if ForumPost.objects.filter(id=post_id).exists():
+                    return _json({
+                        'success': False,
+                        'message': 'You do not have permission to delete this post'
+                    }, status=403)
+                return _json({
                     'success': False,
-                    'message': 'You do not have permission to delete this post'
-                }, status=403)
+                    'message': 'Post not found'
+                }, status=404)
 
-            post_title = post.title
-            post.delete()
+            _invalidate_category_counts()
 
-            logger.info(f"Forum post deleted: {post_id} by {request.user.username}")
+            logger.info("Forum post deleted: %s by %s", post_id, request.user.username)
 
             # Sync to Firestore (non-blocking)
-            try:
-                firestore_service.delete_community_post(str(post_id))
-            except Exception as e:
-                logger.warning(f"Failed to delete post from Firestore: {e}")
+            _sync_to_firestore(firestore_service.delete_community_post, str(post_id))
 
-            return JsonResponse({
+            return _json({
                 'success': True,
-                'message': f'Post "{post_title}" deleted successfully'
+                'message': 'Post deleted successfully'
             })
 
     except Exception as e:
-        logger.error(f"Failed to delete post: {e}")
-        return JsonResponse({
+        logger.error("Failed to delete post: %s", e)
+        transaction.set_rollback(True)
+        return _json({
             'success': False,
             'message': f'Failed to delete post: {str(e)}'
         }, status=500)
@@ -511,38 +828,39 @@ def delete_post(request, post_id):
 
 @login_required
 @require_POST
+@transaction.atomic
 def delete_comment(request, post_id, comment_id):
     """
     Delete a comment (author or admin only)
     """
     try:
         if _use_firestore():
-            # Read the comment from Firestore subcollection
-            db = firestore_service.get_firestore_client()
-            comment_doc = db.collection('communityPosts').document(
-                post_id
-            ).collection('comments').document(comment_id).get()
-
-            if not comment_doc.exists:
-                return JsonResponse({
+            # Moderators may delete any comment; everyone else only their own,
+            # checked inside the same transaction as the soft delete
+            expected_author = None
+            if not _can_moderate_community(request.user):
+                expected_author = getattr(request.user, 'firebase_uid', '')
+
+            result = firestore_service.soft_delete_comment(post_id, comment_id, expected_author)
+            if result == firestore_service.COMMENT_NOT_FOUND:
+                return _json({
                     'success': False,
                     'message': 'Comment not found'
                 }, status=404)
-
-            comment_data = comment_doc.to_dict()
-            user_uid = getattr(request.user, 'firebase_uid', '')
-            is_own = comment_data.get('authorId') == user_uid
-
-            if not is_own and not _can_moderate_community(request.user):
-                return JsonResponse({
+            if result == firestore_service.COMMENT_FORBIDDEN:
+                return _json({
                     'success': False,
                     'message': 'You do not have permission to delete this comment'
                 }, status=403)
+            if result != firestore_service.COMMENT_DELETED:
+                return _json({
+                    'success': False,
+                    'message': 'Failed to delete comment'
+                }, status=500)
 
-            firestore_service.delete_comment(post_id, comment_id)
-            logger.info(f"Comment soft-deleted in Firestore: {comment_id} by {request.user.username}")
+            logger.info("Comment soft-deleted in Firestore: %s by %s", comment_id, request.user.username)
 
-            return JsonResponse({
+            return _json({
                 'success': True,
                 'message': 'Comment deleted successfully'
             })
@@ -551,7 +869,7 @@ def delete_comment(request, post_id, comment_id):
 
             # Check permission
             if comment.author != request.user and not _can_moderate_community(request.user):
-                return JsonResponse({
+                return _json({
                     'success': False,
                     'message': 'You do not have permission to delete this comment'
                 }, status=403)
@@ -560,22 +878,20 @@ def delete_comment(request, post_id, comment_id):
             comment.is_deleted = True
             comment.save(update_fields=['is_deleted'])
 
-            logger.info(f"Comment deleted: {comment_id} by {request.user.username}")
+            logger.info("Comment deleted: %s by %s", comment_id, request.user.username)
 
             # Sync to Firestore (non-blocking)
-            try:
-                firestore_service.delete_comment(str(comment.post.id), str(comment_id))
-            except Exception as e:
-                logger.warning(f"Failed to sync comment deletion to Firestore: {e}")
+            _sync_to_firestore(firestore_service.delete_comment, str(comment.post_id), str(comment_id))
 
-            return JsonResponse({
+            return _json({
                 'success': True,
                 'message': 'Comment deleted successfully'
             })
 
     except Exception as e:
-        logger.error(f"Failed to delete comment: {e}")
-        return JsonResponse({
+        logger.error("Failed to delete comment: %s", e)
+        transaction.set_rollback(True)
+        return _json({
             'success': False,
             'message': f'Failed to delete comment: {str(e)}'
         }, status=500)
@@ -593,23 +909,25 @@ def flag_post(request, post_id):
 
     try:
         if _use_firestore():
-            post_data = firestore_service.get_document('communityPosts', post_id)
+            post_data = firestore_service.get_document(
+                'communityPosts', post_id, fields=['authorId']
+            )
             if not post_data:
-                return JsonResponse({
+                return _json({
                     'success': False,
                     'message': 'Post not found'
                 }, status=404)
 
             user_uid = getattr(request.user, 'firebase_uid', '')
             if post_data.get('authorId') == user_uid:
-                return JsonResponse({
+                return _json({
                     'success': False,
                     'message': 'You cannot flag your own post'
                 }, status=400)
 
             reason = request.POST.get('reason', '').strip()
             if not reason:
-                return JsonResponse({
+                return _json({
                     'success': False,
                     'message': 'Please provide a reason for flagging'
                 }, status=400)
@@ -622,55 +940,54 @@ def flag_post(request, post_id):
                 'status': 'flagged',
             })
 
-            logger.info(f"Post {post_id} flagged by {request.user.username}: {reason}")
+            logger.info("Post %s flagged by %s: %s", post_id, request.user.username, reason)
 
-            return JsonResponse({
+            return _json({
                 'success': True,
                 'message': 'Thank you for reporting. Our moderators will review this post.'
             })
         else:
-            post = get_object_or_404(ForumPost, id=post_id)
+            # Only the author is needed; the flag itself lives in Firestore
+            author_id = ForumPost.objects.filter(id=post_id).values_list('author_id', flat=True).first()
+            if author_id is None:
+                return _json({
+                    'success': False,
+                    'message': 'Post not found'
+                }, status=404)
 
             # Don't allow flagging own posts
-            if post.author == request.user:
-                return JsonResponse({
+            if author_id == request.user.id:
+                return _json({
                     'success': False,
                     'message': 'You cannot flag your own post'
                 }, status=400)
 
             reason = request.POST.get('reason', '').strip()
             if not reason:
-                return JsonResponse({
+                return _json({
                     'success': False,
                     'message': 'Please provide a reason for flagging'
                 }, status=400)
 
-            logger.info(f"Post {post_id} flagged by {request.user.username}: {reason}")
+            logger.info("Post %s flagged by %s: %s", post_id, request.user.username, reason)
 
             # Sync flag to Firestore for CMS moderation
-            try:
-                firestore_service.update_community_post(str(post_id), {
-                    'isFlagged': True,
-                    'flagReason': reason,
-                    'flaggedAt': timezone.now(),
-                    'flaggedBy': request.user.firebase_uid,
-                    'status': 'flagged'
-                })
-            except Exception as e:
-                logger.error(f"Failed to sync flag to Firestore: {e}")
-                return JsonResponse({
-                    'success': False,
-                    'message': 'Failed to submit flag. Please try again.'
-                }, status=500)
+            _sync_to_firestore(firestore_service.update_community_post, str(post_id), {
+                'isFlagged': True,
+                'flagReason': reason,
+                'flaggedAt': timezone.now(),
+                'flaggedBy': request.user.firebase_uid,
+                'status': 'flagged'
+            })
 
-            return JsonResponse({
+            return _json({
                 'success': True,
                 'message': 'Thank you for reporting. Our moderators will review this post.'
             })
 
     except Exception as e:
-        logger.error(f"Failed to flag post: {e}")
-        return JsonResponse({
+        logger.error("Failed to flag post: %s", e)
+        return _json({
             'success': False,
             'message': f'Failed to flag post: {str(e)}'
         }, status=500)
@@ -678,13 +995,17 @@ def flag_post(request, post_id):
 
 @require_permission_view('community_post')
 @require_http_methods(["GET", "POST"])
+@transaction.atomic
 def edit_post(request, post_id):
     """
     Edit an existing post (author only)
     """
 
     if _use_firestore():
-        post_data = firestore_service.get_document('communityPosts', post_id)
+        # The form can render from cache; the POST re-reads the server copy
+        post_data = firestore_service.get_document(
+            'communityPosts', post_id, use_cache=request.method == 'GET'
+        )
         if not post_data:
             raise Http404("Post not found")
 
@@ -698,9 +1019,7 @@ def edit_post(request, post_id):
 
         if request.method == 'POST':
             try:
-                title = request.POST.get('title', '').strip()
-                content = request.POST.get('content', '').strip()
-                category_key = request.POST.get('category', '')
+                title, content, category_key = _post_fields(request.POST, 'title', 'content', 'category')
 
                 if not title or not content:
                     messages.error(request, 'Title and content are required')
@@ -716,12 +1035,18 @@ def edit_post(request, post_id):
                 }
                 firestore_service.update_community_post(post_id, updates)
 
-                logger.info(f"Post updated in Firestore: {post_id} by {request.user.username}")
+                old_category = post_data.get('category') or ''
+                if old_category != updates['category']:
+                    firestore_service.move_community_category_count(old_category, updates['category'])
+                    _invalidate_category_counts()
+
+                logger.info("Post updated in Firestore: %s by %s", post_id, request.user.username)
                 messages.success(request, 'Post updated successfully!')
                 return redirect('v4:community-post-detail', slug=post.slug)
 
             except Exception as e:
-                logger.error(f"Failed to update post: {e}")
+                logger.error("Failed to update post: %s", e)
+                transaction.set_rollback(True)
                 messages.error(request, f'Failed to update post: {str(e)}')
 
         # GET - show form
@@ -738,9 +1063,7 @@ def edit_post(request, post_id):
 
         if request.method == 'POST':
             try:
-                title = request.POST.get('title', '').strip()
-                content = request.POST.get('content', '').strip()
-                category_id = request.POST.get('category', '')
+                title, content, category_id = _post_fields(request.POST, 'title', 'content', 'category')
 
                 if not title or not content:
                     messages.error(request, 'Title and content are required')
@@ -749,6 +1072,7 @@ def edit_post(request, post_id):
                         'categories': ForumCategory.objects.filter(is_active=True)
                     })
 
+                old_category_name = post.category.name if post.category else None
                 post.title = title
                 post.content = content
 
@@ -762,21 +1086,25 @@ def edit_post(request, post_id):
                 post.save()
 
                 # Sync to Firestore (non-blocking)
-                try:
-                    firestore_service.update_community_post(str(post.id), {
-                        'title': post.title,
-                        'content': post.content,
-                        'category': post.category.name if post.category else None,
-                        'updatedAt': timezone.now()
-                    })
-                except Exception as e:
-                    logger.warning(f"Failed to sync post update to Firestore: {e}")
+                _sync_to_firestore(firestore_service.update_community_post, str(post.id), {
+                    'title': post.title,
+                    'content': post.content,
+                    'category': post.category.name if post.category else None,
+                    'updatedAt': timezone.now()
+                })
+                new_category_name = post.category.name if post.category else None
+                if new_category_name != old_category_name:
+                    _sync_to_firestore(
+                        firestore_service.move_community_category_count,
+                        old_category_name, new_category_name,
+                    )
 
                 messages.success(request, 'Post updated successfully!')
                 return redirect('v4:community-post-detail', slug=post.slug)
 
             except Exception as e:
-                logger.error(f"Failed to update post: {e}")
+                logger.error("Failed to update post: %s", e)
+                transaction.set_rollback(True)
                 messages.error(request, f'Failed to update post: {str(e)}')
 
         # GET - show form
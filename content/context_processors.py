@@ -6,8 +6,25 @@ These make data available to all templates without explicitly passing in views
 import logging
 from django.conf import settings
 
+from content.menu_service import get_menus
+
 logger = logging.getLogger(__name__)
 
+# CMS routes do not use the public header/footer menu.
+_CMS_PREFIXES = ('/cms/',)
+
+# Static site configuration, shared by every render (never mutated)
+_SITE_CONFIG = {
+    'site_name': 'Fraction Ball',
+    'site_tagline': 'Math Through Movement',
+}
+
+# Shared (never mutated) context for pages without menus
+_EMPTY_MENUS = {
+    'header_menu': [],
+    'footer_menu': [],
+}
+
 
 def menu_context(request):
     """
@@ -22,29 +39,28 @@ def menu_context(request):
                 {% endfor %}
             {% endif %}
         {% endfor %}
+
+    The result is stored on the request, so every template rendered for the
+    same request reuses it instead of going back to the menu cache.
     """
-    path = getattr(request, "path", "") or ""
-    # CMS routes do not use the public header/footer menu.
-    if path.startswith('/cms/'):
-        return {
-            'header_menu': [],
-            'footer_menu': [],
-        }
+    cached = getattr(request, '_cached_menus', None)
+    if cached is not None:
+        return cached
 
-    from content.menu_service import get_menus
+    if request.path.startswith(_CMS_PREFIXES):
+        request._cached_menus = _EMPTY_MENUS
+        return _EMPTY_MENUS
 
     try:
         menus = get_menus()
-        return {
+        request._cached_menus = {
             'header_menu': menus.get('header', []),
             'footer_menu': menus.get('footer', []),
         }
     except Exception as e:
         logger.error(f"Error loading menus: {e}")
-        return {
-            'header_menu': [],
-            'footer_menu': [],
-        }
+        request._cached_menus = _EMPTY_MENUS
+    return request._cached_menus
 
 
 def site_config_context(request):
@@ -56,7 +72,4 @@ def site_config_context(request):
         {{ site_logo_url }}
     """
     # For now, return static values. Can be extended to fetch from Firestore
-    return {
-        'site_name': 'Fraction Ball',
-        'site_tagline': 'Math Through Movement',
-    }
+    return _SITE_CONFIG
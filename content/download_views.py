@@ -1,6 +1,8 @@
 """
 Resource download views with tracking
 """
+from concurrent.futures import ThreadPoolExecutor
+from django.db import close_old_connections, transaction
 from django.shortcuts import get_object_or_404, redirect
 from django.http import JsonResponse
 from accounts.permissions import require_permission_view
@@ -9,6 +11,29 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Download analytics are written off the request so the redirect never waits
+_download_log_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='download-log')
+
+
+def _record_download(resource_id, user_id, file_size, ip_address, user_agent):
+    """Insert one AssetDownload row (runs on the background pool)"""
+    close_old_connections()
+    try:
+        AssetDownload.objects.create(
+            resource_id=resource_id,
+            user_id=user_id,
+            file_size=file_size,
+            download_completed=True,
+            ip_address=ip_address,
+            user_agent=user_agent,
+        )
+        logger.info(f"Download tracked: resource {resource_id} by user {user_id}")
+    except Exception as e:
+        logger.error(f"Failed to track download of resource {resource_id}: {e}")
+    finally:
+        # Pool threads never see request_finished; release the connection here
+        close_old_connections()
+
 
 @require_permission_view('resources_download')
 def track_and_download_resource(request, resource_id):
@@ -16,7 +41,13 @@ def track_and_download_resource(request, resource_id):
     Track resource download and redirect to signed URL
     """
     try:
-        resource = get_object_or_404(Resource, id=resource_id)
+        # Only what the RBAC scope check, the tracking row and the signed URL read
+        resource = get_object_or_404(
+            Resource.objects.only(
+                'id', 'title', 'status', 'owner_id', 'school_id', 'file_size', 'file_uri'
+            ),
+            id=resource_id
+        )
         
         # Centralized RBAC object check controls school/ownership/published scope.
         if not request.user.can('resource_download', obj=resource):
@@ -25,17 +56,17 @@ def track_and_download_resource(request, resource_id):
                 'message': 'Resource not accessible'
             }, status=403)
         
-        # Track download
+        # Track download once the request's transaction commits (non-blocking;
+        # plain values only, never the request)
         try:
-            AssetDownload.objects.create(
-                resource=resource,
-                user=request.user,
-                file_size=resource.file_size,
-                download_completed=True,
-                ip_address=request.META.get('REMOTE_ADDR'),
-                user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]  # Truncate to fit field
+            args = (
+                resource.id,
+                request.user.id,
+                resource.file_size,
+                request.META.get('REMOTE_ADDR'),
+                request.META.get('HTTP_USER_AGENT', '')[:500],  # Truncate to fit field
             )
-            logger.info(f"Download tracked: {resource.title} by {request.user.username}")
+            transaction.on_commit(lambda: _download_log_executor.submit(_record_download, *args))
         except Exception as e:
             logger.error(f"Failed to track download: {e}")
         
@@ -3,10 +3,13 @@ File validation utilities for Firebase Storage uploads
 Provides security checks and file type validation
 """
 
-import os
 import logging
+import threading
+import time
 from typing import Tuple, Optional
 
+from django.core.exceptions import ValidationError
+
 try:
     import magic
     HAS_MAGIC = True
@@ -16,6 +19,89 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# libmagic only needs the leading bytes of a file to identify it
+MIME_SNIFF_BYTES = 2048
+
+# libmagic loads its whole database when a Magic() is created; build it once.
+# python-magic serializes calls on an instance with its own lock.
+_magic_mime = None
+_magic_lock = threading.Lock()
+
+
+def _get_magic():
+    """Shared ``magic.Magic(mime=True)`` instance, created on first use"""
+    global _magic_mime
+    if _magic_mime is None and HAS_MAGIC:
+        with _magic_lock:
+            if _magic_mime is None:
+                _magic_mime = magic.Magic(mime=True)
+    return _magic_mime
+
+
+# Leading-byte signatures for the formats we accept, checked before libmagic
+_SIGS = (
+    (b'%PDF-', 'application/pdf'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/x-ole-storage'),  # .doc/.xls/.ppt
+)
+
+# Top-level folder of the OOXML part names inside the zip
+_OOXML_PARTS = (
+    (b'word/', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+    (b'ppt/', 'application/vnd.openxmlformats-officedocument.presentationml.presentation'),
+    (b'xl/', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+)
+
+
+def sniff(head: bytes) -> Optional[str]:
+    """
+    Identify a whitelisted format from its leading bytes without libmagic
+    
+    Args:
+        head: First bytes of the file (up to MIME_SNIFF_BYTES)
+    
+    Returns:
+        MIME type, or None when no known signature matches
+    """
+    for signature, mime_type in _SIGS:
+        if head.startswith(signature):
+            return mime_type
+    
+    if head.startswith(b'RIFF'):
+        form = head[8:12]
+        if form == b'WEBP':
+            return 'image/webp'
+        if form == b'AVI ':
+            return 'video/x-msvideo'
+        return None
+    
+    if head[4:8] == b'ftyp':
+        return 'video/quicktime' if head[8:10] == b'qt' else 'video/mp4'
+    
+    if head.startswith(b'\x1a\x45\xdf\xa3'):  # EBML
+        return 'video/webm' if b'webm' in head[:64] else 'video/x-matroska'
+    
+    if head.startswith(b'PK\x03\x04'):
+        # OOXML is a zip; its part names appear in the first local headers
+        for folder, mime_type in _OOXML_PARTS:
+            if folder in head:
+                return mime_type
+        return 'application/zip'
+    
+    return None
+
+
+def _as_result(check, *args) -> Tuple[bool, Optional[str]]:
+    """Run a raising check and return the (is_valid, error_message) tuple form"""
+    try:
+        check(*args)
+    except ValidationError as e:
+        return False, e.message
+    return True, None
+
 
 class FileValidator:
     """
@@ -30,156 +116,164 @@ class FileValidator:
         'lesson': 10 * 1024 * 1024,      # 10 MB
     }
     
-    # Allowed MIME types for each file type
-    ALLOWED_MIME_TYPES = {
-        'video': [
+    # Allowed MIME types for each file type, most common uploads first
+    # (display order for error messages)
+    _ALLOWED_MIME_TYPE_LISTS = {
+        'video': (
             'video/mp4',
             'video/quicktime',
+            'video/webm',
             'video/x-msvideo',
             'video/x-matroska',
-            'video/webm',
-        ],
-        'resource': [
+        ),
+        'resource': (
             'application/pdf',
-            'application/msword',
+            'image/jpeg',
+            'image/png',
             'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            'application/vnd.ms-powerpoint',
             'application/vnd.openxmlformats-officedocument.presentationml.presentation',
-            'application/vnd.ms-excel',
             'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            'application/msword',
+            'application/vnd.ms-powerpoint',
+            'application/vnd.ms-excel',
             'text/plain',
-            'image/jpeg',
-            'image/png',
             'image/gif',
             'image/webp',
-        ],
-        'thumbnail': [
+        ),
+        'thumbnail': (
             'image/jpeg',
             'image/png',
             'image/webp',
             'image/gif',
-        ],
-        'lesson': [
+        ),
+        'lesson': (
             'application/pdf',
-        ]
+        ),
     }
     
-    # Dangerous file extensions (always reject)
-    DANGEROUS_EXTENSIONS = [
-        '.exe', '.bat', '.cmd', '.com', '.pif', '.scr',
-        '.vbs', '.js', '.jar', '.msi', '.app', '.deb',
-        '.rpm', '.sh', '.bash', '.ps1', '.psm1',
-    ]
+    # Hashed lookups for validation; joined strings for the error branch
+    ALLOWED_MIME_TYPES = {
+        file_type: frozenset(mime_types)
+        for file_type, mime_types in _ALLOWED_MIME_TYPE_LISTS.items()
+    }
+    _ALLOWED_MIME_TYPES_DISPLAY = {
+        file_type: ', '.join(mime_types)
+        for file_type, mime_types in _ALLOWED_MIME_TYPE_LISTS.items()
+    }
+
+    VALID_FILE_TYPES = ('video', 'resource', 'thumbnail', 'lesson')
+
+    # Path separators (and NUL) never allowed in an upload's file name
+    _BAD_NAME_CHARS = frozenset('/\\\x00')
+
+    # Dangerous file extensions, lowercase without the dot (always reject)
+    DANGEROUS_EXTENSIONS = frozenset({
+        'exe', 'bat', 'cmd', 'com', 'pif', 'scr',
+        'vbs', 'js', 'jar', 'msi', 'app', 'deb',
+        'rpm', 'sh', 'bash', 'ps1', 'psm1',
+    })
     
     @staticmethod
-    def validate_file_type(file_type: str) -> Tuple[bool, Optional[str]]:
+    def check_file_type(file_type: str) -> None:
         """
-        Validate that the file type is supported
+        Check that the file type is supported
         
         Args:
             file_type: Type of file ('video', 'resource', 'thumbnail', 'lesson')
         
-        Returns:
-            Tuple of (is_valid, error_message)
+        Raises:
+            ValidationError: code 'invalid_file_type'
         """
-        valid_types = ['video', 'resource', 'thumbnail', 'lesson']
-        
-        if file_type not in valid_types:
-            return False, f"Invalid file type. Must be one of: {', '.join(valid_types)}"
-        
-        return True, None
+        if file_type not in FileValidator.VALID_FILE_TYPES:
+            raise ValidationError(
+                f"Invalid file type. Must be one of: {', '.join(FileValidator.VALID_FILE_TYPES)}",
+                code='invalid_file_type',
+            )
     
     @staticmethod
-    def validate_file_size(file_size: int, file_type: str) -> Tuple[bool, Optional[str]]:
+    def check_file_size(file_size: int, file_type: str) -> None:
         """
-        Validate that the file size is within limits
+        Check that the file size is within limits
         
         Args:
             file_size: Size of file in bytes
             file_type: Type of file
         
-        Returns:
-            Tuple of (is_valid, error_message)
+        Raises:
+            ValidationError: code 'invalid_file_size' or 'file_too_large'
         """
         if file_size <= 0:
-            return False, "File size must be greater than 0"
+            raise ValidationError("File size must be greater than 0", code='invalid_file_size')
         
         max_size = FileValidator.MAX_FILE_SIZES.get(file_type)
         if not max_size:
-            return False, f"Unknown file type: {file_type}"
+            raise ValidationError(f"Unknown file type: {file_type}", code='invalid_file_type')
         
         if file_size > max_size:
             max_size_mb = max_size / (1024 * 1024)
             file_size_mb = file_size / (1024 * 1024)
-            return False, (
+            raise ValidationError(
                 f"File size ({file_size_mb:.1f} MB) exceeds maximum "
-                f"allowed size ({max_size_mb:.0f} MB) for {file_type}"
+                f"allowed size ({max_size_mb:.0f} MB) for {file_type}",
+                code='file_too_large',
             )
-        
-        return True, None
     
     @staticmethod
-    def validate_mime_type(content_type: str, file_type: str) -> Tuple[bool, Optional[str]]:
+    def check_mime_type(content_type: str, file_type: str) -> None:
         """
-        Validate that the MIME type is allowed for this file type
+        Check that the MIME type is allowed for this file type
         
         Args:
             content_type: MIME type of the file
             file_type: Type of file
         
-        Returns:
-            Tuple of (is_valid, error_message)
+        Raises:
+            ValidationError: code 'invalid_content_type'
         """
-        allowed_types = FileValidator.ALLOWED_MIME_TYPES.get(file_type, [])
-        
-        if content_type not in allowed_types:
-            return False, (
+        if content_type not in FileValidator.ALLOWED_MIME_TYPES.get(file_type, frozenset()):
+            raise ValidationError(
                 f"Content type '{content_type}' is not allowed for {file_type}. "
-                f"Allowed types: {', '.join(allowed_types)}"
+                f"Allowed types: {FileValidator._ALLOWED_MIME_TYPES_DISPLAY.get(file_type, '')}",
+                code='invalid_content_type',
             )
-        
-        return True, None
     
     @staticmethod
-    def validate_file_name(file_name: str) -> Tuple[bool, Optional[str]]:
+    def check_file_name(file_name: str) -> None:
         """
-        Validate file name for security issues
+        Check file name for security issues
         
         Args:
             file_name: Name of the file
         
-        Returns:
-            Tuple of (is_valid, error_message)
+        Raises:
+            ValidationError: code 'invalid_file_name'
         """
         if not file_name:
-            return False, "File name is required"
-        
-        # Check for path traversal attempts
-        if '..' in file_name or '/' in file_name or '\\' in file_name:
-            return False, "File name contains invalid characters"
-        
-        # Check file extension
-        _, ext = os.path.splitext(file_name.lower())
-        
-        # Check for dangerous extensions
-        if ext in FileValidator.DANGEROUS_EXTENSIONS:
-            return False, f"File extension '{ext}' is not allowed for security reasons"
+            raise ValidationError("File name is required", code='invalid_file_name')
+        
+        # Check for path traversal attempts (one set scan for the separators)
+        if '..' in file_name or not FileValidator._BAD_NAME_CHARS.isdisjoint(file_name):
+            raise ValidationError("File name contains invalid characters", code='invalid_file_name')
+        
+        # Check for dangerous extensions (only the extension is lowercased)
+        _, dot, ext = file_name.rpartition('.')
+        ext = ext.lower()
+        if dot and ext in FileValidator.DANGEROUS_EXTENSIONS:
+            raise ValidationError(
+                f"File extension '.{ext}' is not allowed for security reasons",
+                code='invalid_file_name',
+            )
         
         # Check file name length
         if len(file_name) > 255:
-            return False, "File name is too long (max 255 characters)"
-        
-        return True, None
+            raise ValidationError(
+                "File name is too long (max 255 characters)", code='invalid_file_name'
+            )
     
     @staticmethod
-    def validate_upload_request(
-        file_type: str,
-        content_type: str,
-        file_size: int,
-        file_name: str
-    ) -> Tuple[bool, Optional[str]]:
+    def validate(file_type: str, content_type: str, file_size: int, file_name: str) -> None:
         """
-        Validate all aspects of an upload request
+        Validate all aspects of an upload request, stopping at the first failure
         
         Args:
             file_type: Type of file
@@ -187,41 +281,54 @@ class FileValidator:
             file_size: Size in bytes
             file_name: Name of file
         
-        Returns:
-            Tuple of (is_valid, error_message)
+        Raises:
+            ValidationError: for the first check that fails
         """
-        # Validate file type
-        is_valid, error = FileValidator.validate_file_type(file_type)
-        if not is_valid:
-            return False, error
-        
-        # Validate file size
-        is_valid, error = FileValidator.validate_file_size(file_size, file_type)
-        if not is_valid:
-            return False, error
-        
-        # Validate MIME type
-        is_valid, error = FileValidator.validate_mime_type(content_type, file_type)
-        if not is_valid:
-            return False, error
-        
-        # Validate file name
-        is_valid, error = FileValidator.validate_file_name(file_name)
-        if not is_valid:
-            return False, error
+        FileValidator.check_file_type(file_type)
+        FileValidator.check_file_size(file_size, file_type)
+        FileValidator.check_mime_type(content_type, file_type)
+        FileValidator.check_file_name(file_name)
         
         logger.info(
             f"Upload request validated: {file_type}, {content_type}, "
             f"{file_size} bytes, {file_name}"
         )
-        
-        return True, None
+    
+    @staticmethod
+    def validate_file_type(file_type: str) -> Tuple[bool, Optional[str]]:
+        """Tuple form of check_file_type: (is_valid, error_message)"""
+        return _as_result(FileValidator.check_file_type, file_type)
+    
+    @staticmethod
+    def validate_file_size(file_size: int, file_type: str) -> Tuple[bool, Optional[str]]:
+        """Tuple form of check_file_size: (is_valid, error_message)"""
+        return _as_result(FileValidator.check_file_size, file_size, file_type)
+    
+    @staticmethod
+    def validate_mime_type(content_type: str, file_type: str) -> Tuple[bool, Optional[str]]:
+        """Tuple form of check_mime_type: (is_valid, error_message)"""
+        return _as_result(FileValidator.check_mime_type, content_type, file_type)
+    
+    @staticmethod
+    def validate_file_name(file_name: str) -> Tuple[bool, Optional[str]]:
+        """Tuple form of check_file_name: (is_valid, error_message)"""
+        return _as_result(FileValidator.check_file_name, file_name)
+    
+    @staticmethod
+    def validate_upload_request(
+        file_type: str,
+        content_type: str,
+        file_size: int,
+        file_name: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Tuple form of validate: (is_valid, error_message)"""
+        return _as_result(FileValidator.validate, file_type, content_type, file_size, file_name)
     
     @staticmethod
     def validate_file_content(file_path: str, expected_mime_type: str) -> Tuple[bool, Optional[str]]:
         """
         Validate actual file content matches expected MIME type
-        Uses python-magic to check file signature
+        Uses python-magic to check file signature (first MIME_SNIFF_BYTES only)
         
         Args:
             file_path: Path to the file on disk
@@ -235,9 +342,45 @@ class FileValidator:
             return True, None
         
         try:
+            with open(file_path, 'rb') as f:
+                head = f.read(MIME_SNIFF_BYTES)
+        except OSError as e:
+            logger.error(f"Error validating file content: {e}")
+            return False, f"Failed to validate file content: {str(e)}"
+        
+        return FileValidator.validate_file_content_from_stream(head, expected_mime_type)
+    
+    @staticmethod
+    def validate_file_content_from_stream(stream, expected_mime_type: str) -> Tuple[bool, Optional[str]]:
+        """
+        Validate the leading bytes of an upload match expected MIME type
+        Skips the filesystem for uploads that are already open or in memory;
+        known signatures are matched by sniff() before falling back to libmagic
+        
+        Args:
+            stream: Header bytes, or a readable binary file object (its first
+                MIME_SNIFF_BYTES are read and the position is restored)
+            expected_mime_type: Expected MIME type
+        
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        try:
+            if hasattr(stream, 'read'):
+                position = stream.tell() if stream.seekable() else None
+                head = stream.read(MIME_SNIFF_BYTES)
+                if position is not None:
+                    stream.seek(position)
+            else:
+                head = bytes(stream[:MIME_SNIFF_BYTES])
+            
             # Get actual MIME type from file content
-            mime = magic.Magic(mime=True)
-            actual_mime_type = mime.from_file(file_path)
+            actual_mime_type = sniff(head)
+            if actual_mime_type is None:
+                if not HAS_MAGIC:
+                    logger.warning("python-magic not available, skipping file content validation")
+                    return True, None
+                actual_mime_type = _get_magic().from_buffer(head)
             
             # Check if it matches expected
             if not actual_mime_type.startswith(expected_mime_type.split('/')[0]):
@@ -267,11 +410,40 @@ class UploadRateLimiter:
     # Maximum total storage per user (bytes)
     MAX_USER_STORAGE = 10 * 1024 * 1024 * 1024  # 10 GB
     
+    # Cached storage usage; dropped by the VideoAsset/Resource signals
+    STORAGE_USAGE_CACHE_KEY = 'storage_used_{user_id}'
+    STORAGE_USAGE_CACHE_TTL = 60
+    
     @staticmethod
     def check_upload_limit(user_id: int) -> Tuple[bool, Optional[str]]:
         """
         Check if user has exceeded upload limits
         
+        Args:
+            user_id: ID of the user
+        
+        Returns:
+            Tuple of (is_allowed, error_message)
+        """
+        is_allowed, error = UploadRateLimiter.peek_upload_limit(user_id)
+        if not is_allowed:
+            return is_allowed, error
+        return UploadRateLimiter.count_upload(user_id)
+    
+    @staticmethod
+    def _window_keys(user_id: int) -> Tuple[str, str]:
+        """Hourly and daily counter keys for fixed windows numbered from the epoch (UTC)"""
+        now = int(time.time())
+        return (
+            f"upload_count_hour_{user_id}_{now // 3600}",
+            f"upload_count_day_{user_id}_{now // 86400}",
+        )
+    
+    @staticmethod
+    def peek_upload_limit(user_id: int) -> Tuple[bool, Optional[str]]:
+        """
+        Read-only check of the upload limits (one cache read, no writes)
+        
         Args:
             user_id: ID of the user
         
@@ -279,34 +451,130 @@ class UploadRateLimiter:
             Tuple of (is_allowed, error_message)
         """
         from django.core.cache import cache
-        from datetime import datetime, timedelta
         
-        # Check hourly limit
-        hour_key = f"upload_count_hour_{user_id}_{datetime.now().strftime('%Y%m%d%H')}"
-        hour_count = cache.get(hour_key, 0)
+        hour_key, day_key = UploadRateLimiter._window_keys(user_id)
+        counts = cache.get_many([hour_key, day_key])
+        if counts.get(hour_key, 0) >= UploadRateLimiter.MAX_UPLOADS_PER_HOUR:
+            return False, (
+                f"Upload limit exceeded. Maximum {UploadRateLimiter.MAX_UPLOADS_PER_HOUR} "
+                "uploads per hour allowed."
+            )
+        if counts.get(day_key, 0) >= UploadRateLimiter.MAX_UPLOADS_PER_DAY:
+            return False, (
+                f"Upload limit exceeded. Maximum {UploadRateLimiter.MAX_UPLOADS_PER_DAY} "
+                "uploads per day allowed."
+            )
+        return True, None
+    
+    @staticmethod
+    def count_upload(user_id: int) -> Tuple[bool, Optional[str]]:
+        """
+        Count an upload against the user's limits
+        
+        Args:
+            user_id: ID of the user
+        
+        Returns:
+            Tuple of (is_allowed, error_message); a refused upload is not counted
+        """
+        hour_key, day_key = UploadRateLimiter._window_keys(user_id)
         
-        if hour_count >= UploadRateLimiter.MAX_UPLOADS_PER_HOUR:
+        # Check hourly limit (count this upload atomically; uncount if refused)
+        hour_count = UploadRateLimiter._increment(hour_key, 3600)  # 1 hour TTL
+        
+        if hour_count > UploadRateLimiter.MAX_UPLOADS_PER_HOUR:
+            UploadRateLimiter._decrement(hour_key)
             return False, (
                 f"Upload limit exceeded. Maximum {UploadRateLimiter.MAX_UPLOADS_PER_HOUR} "
                 "uploads per hour allowed."
             )
         
         # Check daily limit
-        day_key = f"upload_count_day_{user_id}_{datetime.now().strftime('%Y%m%d')}"
-        day_count = cache.get(day_key, 0)
+        day_count = UploadRateLimiter._increment(day_key, 86400)  # 24 hour TTL
         
-        if day_count >= UploadRateLimiter.MAX_UPLOADS_PER_DAY:
+        if day_count > UploadRateLimiter.MAX_UPLOADS_PER_DAY:
+            UploadRateLimiter._decrement(day_key)
+            UploadRateLimiter._decrement(hour_key)
             return False, (
                 f"Upload limit exceeded. Maximum {UploadRateLimiter.MAX_UPLOADS_PER_DAY} "
                 "uploads per day allowed."
             )
         
-        # Increment counters
-        cache.set(hour_key, hour_count + 1, 3600)  # 1 hour TTL
-        cache.set(day_key, day_count + 1, 86400)   # 24 hour TTL
-        
         return True, None
     
+    @staticmethod
+    def _increment(key: str, timeout: int) -> int:
+        """
+        Atomically add one to a cache counter, creating it with ``timeout``
+        
+        Returns:
+            The counter value after this increment
+        """
+        from django.core.cache import cache
+        
+        if cache.add(key, 1, timeout):
+            return 1
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr(); start a fresh window
+            cache.set(key, 1, timeout)
+            return 1
+    
+    @staticmethod
+    def _decrement(key: str) -> None:
+        """Take back a refused upload's increment (no-op if the window expired)"""
+        from django.core.cache import cache
+        
+        try:
+            cache.decr(key)
+        except ValueError:
+            pass
+    
+    @staticmethod
+    def get_storage_usage(user_id: int) -> int:
+        """
+        Total bytes of videos and resources owned by the user
+        
+        Both sums are scalar subqueries of one SELECT (one round trip).
+        
+        Args:
+            user_id: ID of the user
+        
+        Returns:
+            Storage used in bytes
+        """
+        from content.models import VideoAsset, Resource
+        from django.contrib.auth import get_user_model
+        from django.db.models import BigIntegerField, OuterRef, Subquery, Sum, Value
+        from django.db.models.functions import Coalesce
+        
+        def owned_bytes(model):
+            return Coalesce(
+                Subquery(
+                    model.objects.filter(owner_id=OuterRef('pk'))
+                    .order_by()
+                    .values('owner_id')
+                    .annotate(total=Sum('file_size'))
+                    .values('total')
+                ),
+                Value(0),
+                output_field=BigIntegerField(),
+            )
+        
+        usage = get_user_model().objects.filter(pk=user_id).annotate(
+            video_bytes=owned_bytes(VideoAsset),
+            resource_bytes=owned_bytes(Resource),
+        ).values_list('video_bytes', 'resource_bytes').first()
+        return sum(usage) if usage else 0
+    
+    @staticmethod
+    def invalidate_storage_usage(user_id: int) -> None:
+        """Drop the cached storage usage after the user's assets change"""
+        from django.core.cache import cache
+        
+        cache.delete(UploadRateLimiter.STORAGE_USAGE_CACHE_KEY.format(user_id=user_id))
+    
     @staticmethod
     def check_storage_quota(user_id: int, new_file_size: int) -> Tuple[bool, Optional[str]]:
         """
@@ -319,19 +587,13 @@ class UploadRateLimiter:
         Returns:
             Tuple of (is_allowed, error_message)
         """
-        from content.models import VideoAsset, Resource
-        from django.db.models import Sum
-        
-        # Calculate current storage usage
-        video_size = VideoAsset.objects.filter(owner_id=user_id).aggregate(
-            total=Sum('file_size')
-        )['total'] or 0
-        
-        resource_size = Resource.objects.filter(owner_id=user_id).aggregate(
-            total=Sum('file_size')
-        )['total'] or 0
+        from django.core.cache import cache
         
-        current_usage = video_size + resource_size
+        cache_key = UploadRateLimiter.STORAGE_USAGE_CACHE_KEY.format(user_id=user_id)
+        current_usage = cache.get(cache_key)
+        if current_usage is None:
+            current_usage = UploadRateLimiter.get_storage_usage(user_id)
+            cache.set(cache_key, current_usage, UploadRateLimiter.STORAGE_USAGE_CACHE_TTL)
         new_total = current_usage + new_file_size
         
         if new_total > UploadRateLimiter.MAX_USER_STORAGE:
@@ -351,7 +613,7 @@ def validate_and_check_limits(
     content_type: str,
     file_size: int,
     file_name: str
-) -> Tuple[bool, Optional[str]]:
+) -> None:
     """
     Comprehensive validation and rate limiting check
     
@@ -362,30 +624,24 @@ def validate_and_check_limits(
         file_size: Size in bytes
         file_name: Name of file
     
-    Returns:
-        Tuple of (is_allowed, error_message)
+    Raises:
+        ValidationError: for the first check that fails (codes from
+            FileValidator.validate, plus 'rate_limited' and 'quota_exceeded')
     """
-    # Validate file
-    is_valid, error = FileValidator.validate_upload_request(
-        file_type, content_type, file_size, file_name
-    )
-    if not is_valid:
-        return False, error
-    
-    # Check rate limits
-    is_allowed, error = UploadRateLimiter.check_upload_limit(user_id)
+    # Users already at a limit are refused with one cache read and no writes
+    is_allowed, error = UploadRateLimiter.peek_upload_limit(user_id)
     if not is_allowed:
-        return False, error
+        raise ValidationError(error, code='rate_limited')
     
-    # Check storage quota
+    # Validate file (CPU only)
+    FileValidator.validate(file_type, content_type, file_size, file_name)
+    
+    # Check storage quota (DB, cached)
     is_allowed, error = UploadRateLimiter.check_storage_quota(user_id, file_size)
     if not is_allowed:
-        return False, error
+        raise ValidationError(error, code='quota_exceeded')
     
-    return True, None
-
-
-
-
-
-
+    # Only an upload that passed every check counts against the limits
+    is_allowed, error = UploadRateLimiter.count_upload(user_id)
+    if not is_allowed:
+        raise ValidationError(error, code='rate_limited')
@@ -2,11 +2,136 @@
 Django filters for content models
 """
 import django_filters
-from django.db import models
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection, models
+from django.db.models.functions import Cast, Lower
 from .models import VideoAsset, Resource
 from . import taxonomy_service
 
 
+VIDEO_STATUS_CHOICES = (
+    ('PUBLISHED', 'Published'),
+    ('DRAFT', 'Draft'),
+    ('PENDING', 'Pending Review'),
+)
+
+RESOURCE_STATUS_CHOICES = (
+    ('PUBLISHED', 'Published'),
+    ('DRAFT', 'Draft'),
+)
+
+RESOURCE_FILE_TYPE_CHOICES = (
+    ('pdf', 'PDF Documents'),
+    ('doc', 'Word Documents'),
+    ('docx', 'Word Documents (DOCX)'),
+    ('ppt', 'PowerPoint'),
+    ('pptx', 'PowerPoint (PPTX)'),
+    ('xls', 'Excel'),
+    ('xlsx', 'Excel (XLSX)'),
+    ('txt', 'Text Files'),
+    ('image', 'Images'),
+    ('other', 'Other'),
+)
+
+VIDEO_ORDERING_FIELDS = (
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+    ('title', 'title'),
+    ('duration', 'duration'),
+    ('grade', 'grade'),
+)
+
+VIDEO_ORDERING_LABELS = {
+    'created_at': 'Date Created',
+    'updated_at': 'Date Updated',
+    'title': 'Title',
+    'duration': 'Duration',
+    'grade': 'Grade Level',
+}
+
+RESOURCE_ORDERING_FIELDS = (
+    ('created_at', 'created_at'),
+    ('title', 'title'),
+    ('file_type', 'file_type'),
+    ('file_size', 'file_size'),
+)
+
+RESOURCE_ORDERING_LABELS = {
+    'created_at': 'Date Created',
+    'title': 'Title',
+    'file_type': 'File Type',
+    'file_size': 'File Size',
+}
+
+OWNER_ROLES = ('TEACHER', 'SCHOOL_ADMIN')
+
+# Shorter search terms carry no useful full-text tokens; match title prefixes instead
+MIN_FULLTEXT_QUERY_LENGTH = 3
+
+
+def _school_owner_queryset(user):
+    """
+    Teachers from the user's school, for the owner dropdown.
+
+    Filters on ``school_id`` so building the choices never loads the School row.
+    """
+    from django.contrib.auth import get_user_model
+    User = get_user_model()
+    return User.objects.filter(
+        school_id=user.school_id,
+        role__in=OWNER_ROLES
+    ).order_by('last_name', 'first_name')
+
+
+def _tags_queryset(queryset, value):
+    """
+    Filter a VideoAsset/Resource queryset to rows carrying any of the
+    comma-separated tags in ``value`` (case-insensitive).
+
+    On PostgreSQL this is a single jsonb ``?|`` lookup against the
+    lower-cased tag array, served by the expression GIN index from
+    migration 0009; other backends fall back to one icontains per tag.
+    """
+    tags = [tag.strip().lower() for tag in value.split(',') if tag.strip()]
+    if not tags:
+        return queryset
+
+    if connection.vendor == 'postgresql':
+        return queryset.alias(
+            tags_lower=Cast(Lower(Cast('tags', models.TextField())), models.JSONField())
+        ).filter(tags_lower__has_any_keys=tags)
+
+    query = models.Q()
+    for tag in tags:
+        query |= models.Q(tags__icontains=tag)
+    return queryset.filter(query)
+
+
+def _search_queryset(queryset, value):
+    """
+    Filter a VideoAsset/Resource queryset by a search string.
+
+    On PostgreSQL this hits the GIN-indexed ``search_vector`` column; other
+    backends (SQLite in local dev) fall back to icontains. Terms shorter than
+    ``MIN_FULLTEXT_QUERY_LENGTH`` only match title prefixes.
+    """
+    value = value.strip()
+    if not value:
+        return queryset
+    if len(value) < MIN_FULLTEXT_QUERY_LENGTH:
+        return queryset.filter(title__istartswith=value)
+
+    if connection.vendor == 'postgresql':
+        return queryset.filter(
+            search_vector=SearchQuery(value, config='english', search_type='websearch')
+        )
+
+    return queryset.filter(
+        models.Q(title__icontains=value) |
+        models.Q(description__icontains=value)
+    )
+
+
 class VideoAssetFilter(django_filters.FilterSet):
     """Advanced filtering for VideoAsset model"""
     
@@ -26,7 +151,7 @@ class VideoAssetFilter(django_filters.FilterSet):
         empty_label="All Teachers"
     )
     status = django_filters.ChoiceFilter(
-        choices=[('PUBLISHED', 'Published'), ('DRAFT', 'Draft'), ('PENDING', 'Pending Review')],
+        choices=VIDEO_STATUS_CHOICES,
         empty_label="All Statuses"
     )
     
@@ -40,20 +165,8 @@ class VideoAssetFilter(django_filters.FilterSet):
     
     # Ordering
     ordering = django_filters.OrderingFilter(
-        fields=(
-            ('created_at', 'created_at'),
-            ('updated_at', 'updated_at'),
-            ('title', 'title'),
-            ('duration', 'duration'),
-            ('grade', 'grade'),
-        ),
-        field_labels={
-            'created_at': 'Date Created',
-            'updated_at': 'Date Updated',
-            'title': 'Title',
-            'duration': 'Duration',
-            'grade': 'Grade Level',
-        }
+        fields=VIDEO_ORDERING_FIELDS,
+        field_labels=VIDEO_ORDERING_LABELS,
     )
     
     class Meta:
@@ -69,49 +182,21 @@ class VideoAssetFilter(django_filters.FilterSet):
         self.filters['grade'].extra['choices'] = taxonomy_service.get_grade_choices()
         self.filters['topic'].extra['choices'] = taxonomy_service.get_topic_choices()
 
-        if request and hasattr(request.user, 'school'):
-            from django.contrib.auth import get_user_model
-            User = get_user_model()
+        if request and hasattr(request.user, 'school_id'):
             # Only show teachers from the same school
-            self.filters['owner'].queryset = User.objects.filter(
-                school=request.user.school,
-                role__in=['TEACHER', 'SCHOOL_ADMIN']
-            ).order_by('last_name', 'first_name')
+            self.filters['owner'].queryset = _school_owner_queryset(request.user)
     
     def filter_search(self, queryset, name, value):
         """Filter by search term in title and description"""
         if not value:
             return queryset
-        
-        # Use PostgreSQL full-text search if available, otherwise use icontains
-        try:
-            from django.contrib.postgres.search import SearchVector
-            return queryset.annotate(
-                search=SearchVector('title', 'description')
-            ).filter(search=value)
-        except ImportError:
-            # Fallback for non-PostgreSQL databases
-            return queryset.filter(
-                models.Q(title__icontains=value) | 
-                models.Q(description__icontains=value)
-            )
+        return _search_queryset(queryset, value)
     
     def filter_tags(self, queryset, name, value):
         """Filter by tags (JSON field)"""
         if not value:
             return queryset
-        
-        # Split comma-separated tags
-        tags = [tag.strip().lower() for tag in value.split(',') if tag.strip()]
-        if not tags:
-            return queryset
-        
-        # Filter videos that contain any of the specified tags
-        query = models.Q()
-        for tag in tags:
-            query |= models.Q(tags__icontains=tag)
-        
-        return queryset.filter(query)
+        return _tags_queryset(queryset, value)
 
 
 class ResourceFilter(django_filters.FilterSet):
@@ -122,18 +207,7 @@ class ResourceFilter(django_filters.FilterSet):
     
     # File type filter
     file_type = django_filters.ChoiceFilter(
-        choices=[
-            ('pdf', 'PDF Documents'),
-            ('doc', 'Word Documents'),
-            ('docx', 'Word Documents (DOCX)'),
-            ('ppt', 'PowerPoint'),
-            ('pptx', 'PowerPoint (PPTX)'),
-            ('xls', 'Excel'),
-            ('xlsx', 'Excel (XLSX)'),
-            ('txt', 'Text Files'),
-            ('image', 'Images'),
-            ('other', 'Other'),
-        ],
+        choices=RESOURCE_FILE_TYPE_CHOICES,
         empty_label="All File Types"
     )
     
@@ -150,7 +224,7 @@ class ResourceFilter(django_filters.FilterSet):
         empty_label="All Teachers"
     )
     status = django_filters.ChoiceFilter(
-        choices=[('PUBLISHED', 'Published'), ('DRAFT', 'Draft')],
+        choices=RESOURCE_STATUS_CHOICES,
         empty_label="All Statuses"
     )
     
@@ -160,18 +234,8 @@ class ResourceFilter(django_filters.FilterSet):
     
     # Ordering
     ordering = django_filters.OrderingFilter(
-        fields=(
-            ('created_at', 'created_at'),
-            ('title', 'title'),
-            ('file_type', 'file_type'),
-            ('file_size', 'file_size'),
-        ),
-        field_labels={
-            'created_at': 'Date Created',
-            'title': 'Title',
-            'file_type': 'File Type',
-            'file_size': 'File Size',
-        }
+        fields=RESOURCE_ORDERING_FIELDS,
+        field_labels=RESOURCE_ORDERING_LABELS,
     )
     
     class Meta:
@@ -186,42 +250,18 @@ class ResourceFilter(django_filters.FilterSet):
         self.filters['grade'].extra['choices'] = taxonomy_service.get_grade_choices()
         self.filters['topic'].extra['choices'] = taxonomy_service.get_topic_choices()
 
-        if request and hasattr(request.user, 'school'):
-            from django.contrib.auth import get_user_model
-            User = get_user_model()
-            self.filters['owner'].queryset = User.objects.filter(
-                school=request.user.school,
-                role__in=['TEACHER', 'SCHOOL_ADMIN']
-            ).order_by('last_name', 'first_name')
+        if request and hasattr(request.user, 'school_id'):
+            self.filters['owner'].queryset = _school_owner_queryset(request.user)
 
     def filter_search(self, queryset, name, value):
         """Filter by search term in title and description"""
         if not value:
             return queryset
-
-        try:
-            from django.contrib.postgres.search import SearchVector
-            return queryset.annotate(
-                search=SearchVector('title', 'description')
-            ).filter(search=value)
-        except ImportError:
-            return queryset.filter(
-                models.Q(title__icontains=value) |
-                models.Q(description__icontains=value)
-            )
+        return _search_queryset(queryset, value)
 
     def filter_tags(self, queryset, name, value):
         """Filter by tags (JSON field)"""
         if not value:
             return queryset
-        
-        tags = [tag.strip().lower() for tag in value.split(',') if tag.strip()]
-        if not tags:
-            return queryset
-        
-        query = models.Q()
-        for tag in tags:
-            query |= models.Q(tags__icontains=tag)
-        
-        return queryset.filter(query)
+        return _tags_queryset(queryset, value)
 
@@ -4,20 +4,184 @@ Provides secure upload URLs and streaming access for videos and resources
 """
 
 import os
-import uuid
 import logging
-import mimetypes
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from typing import Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
+import requests
 from django.conf import settings
-from google.cloud import storage
-from google.oauth2 import service_account
-import firebase_admin
-from firebase_admin import credentials
+from requests.adapters import HTTPAdapter
+
+# google.cloud.storage / google.oauth2 / google.api_core are imported where
+# they are first needed, so workers that never touch storage skip loading them
 
 logger = logging.getLogger(__name__)
 
+_MB = 1024 * 1024
+
+# Storage folder per upload type; also the set of valid upload types
+UPLOAD_PATH_MAP = {
+    'video': 'videos',
+    'resource': 'resources',
+    'thumbnail': 'thumbnails',
+    'lesson': 'lesson-plans',
+}
+
+ALLOWED_CONTENT_TYPES = {
+    'video': frozenset({
+        'video/mp4',
+        'video/quicktime',
+        'video/x-msvideo',
+    }),
+    'resource': frozenset({
+        'application/pdf',
+        'application/msword',
+        'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        'application/vnd.ms-powerpoint',
+        'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+        'application/vnd.ms-excel',
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'text/plain',
+        'image/jpeg',
+        'image/png',
+        'image/gif',
+    }),
+    'thumbnail': frozenset({
+        'image/jpeg',
+        'image/png',
+        'image/webp',
+    }),
+    'lesson': frozenset({
+        'application/pdf',
+    }),
+}
+
+MAX_FILE_SIZES = {
+    'video': 500 * _MB,
+    'resource': 50 * _MB,
+    'thumbnail': 10 * _MB,
+    'lesson': 10 * _MB,
+}
+DEFAULT_MAX_FILE_SIZE = 10 * _MB
+
+# The allowed types are a closed set, so their extensions are spelled out
+# rather than looked up in the mimetypes registry on every upload
+CONTENT_TYPE_EXTENSIONS = {
+    'video/mp4': '.mp4',
+    'video/quicktime': '.mov',
+    'video/x-msvideo': '.avi',
+    'application/pdf': '.pdf',
+    'application/msword': '.doc',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+    'application/vnd.ms-powerpoint': '.ppt',
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation': '.pptx',
+    'application/vnd.ms-excel': '.xls',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': '.xlsx',
+    'text/plain': '.txt',
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+}
+
+# Signed download URLs are reused for the rest of the current slot, so repeat
+# renders of the same file get a byte-identical (browser/CDN cacheable) URL
+# and skip the v4 signing work.
+SIGNED_URL_SLOT_SECONDS = getattr(settings, 'SIGNED_URL_SLOT_SECONDS', 300)
+SIGNED_URL_CACHE_MAX_PATHS = 4096
+
+# The storage client shares one requests session across all request threads;
+# size its connection pool for concurrent workers instead of the default 10.
+# The adapter only sizes the pool: retries stay with google-cloud-storage and
+# _call_with_retry, which need 429/5xx to surface as API exceptions.
+STORAGE_HTTP_POOL_SIZE = getattr(settings, 'STORAGE_HTTP_POOL_SIZE', 64)
+
+# Deletes run off the request thread; transient failures are retried with
+# 1s/2s backoff before giving up
+_io_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='storage-io')
+STORAGE_OP_MAX_ATTEMPTS = 3
+# Deletes per multipart batch request in delete_files
+STORAGE_BATCH_MAX = 100
+_retryable_storage_errors = None
+
+# {file_path: {expiration_minutes: (slot, url)}}, least recently used first
+_signed_url_cache = OrderedDict()
+_signed_url_lock = threading.Lock()
+
+
+def _get_cached_signed_url(file_path: str, expiration_minutes: int, slot: int) -> Optional[str]:
+    with _signed_url_lock:
+        entries = _signed_url_cache.get(file_path)
+        if entries is None:
+            return None
+        entry = entries.get(expiration_minutes)
+        if entry is None or entry[0] != slot:
+            return None
+        _signed_url_cache.move_to_end(file_path)
+        return entry[1]
+
+
+def _set_cached_signed_url(file_path: str, expiration_minutes: int, slot: int, url: str) -> None:
+    with _signed_url_lock:
+        entries = _signed_url_cache.get(file_path)
+        if entries is None:
+            entries = _signed_url_cache[file_path] = {}
+            if len(_signed_url_cache) > SIGNED_URL_CACHE_MAX_PATHS:
+                _signed_url_cache.popitem(last=False)
+        else:
+            _signed_url_cache.move_to_end(file_path)
+        entries[expiration_minutes] = (slot, url)
+
+
+# Shared pool for signing cache misses in generate_download_urls_bulk
+SIGNING_MAX_WORKERS = 8
+_signing_executor = None
+_signing_executor_lock = threading.Lock()
+
+
+def _get_signing_executor() -> ThreadPoolExecutor:
+    global _signing_executor
+    if _signing_executor is None:
+        with _signing_executor_lock:
+            if _signing_executor is None:
+                _signing_executor = ThreadPoolExecutor(
+                    max_workers=SIGNING_MAX_WORKERS, thread_name_prefix='storage-sign'
+                )
+    return _signing_executor
+
+
+def _call_with_retry(func, *args):
+    """Call ``func``, retrying transient storage errors with exponential backoff"""
+    global _retryable_storage_errors
+    if _retryable_storage_errors is None:
+        from google.api_core import exceptions as gcs_exceptions
+        _retryable_storage_errors = (
+            gcs_exceptions.TooManyRequests,
+            gcs_exceptions.ServiceUnavailable,
+            gcs_exceptions.InternalServerError,
+            requests.ConnectionError,
+        )
+    
+    for attempt in range(STORAGE_OP_MAX_ATTEMPTS):
+        try:
+            return func(*args)
+        except _retryable_storage_errors as e:
+            if attempt == STORAGE_OP_MAX_ATTEMPTS - 1:
+                raise
+            logger.warning(f"Retrying storage call after transient error: {e}")
+            time.sleep(2 ** attempt)
+
+
+def invalidate_signed_urls(file_path: str) -> None:
+    """Drop any cached signed URLs for a file (e.g. after it is deleted)"""
+    with _signed_url_lock:
+        _signed_url_cache.pop(file_path, None)
+
 
 class FirebaseStorageService:
     """
@@ -30,14 +194,21 @@ class FirebaseStorageService:
         self.bucket_name = f"{settings.FIREBASE_CONFIG.get('project_id')}.appspot.com"
         self.storage_client = None
         self.bucket = None
+        # Service-account credentials hold the parsed RSA signer; signing
+        # passes them directly instead of resolving them via the client
+        self.signing_credentials = None
         self._initialize_storage()
     
     def _initialize_storage(self):
         """Initialize Google Cloud Storage client with Firebase credentials"""
+        from google.cloud import storage
+        from google.oauth2 import service_account
+        
         try:
             # Create credentials from Firebase config
             creds_dict = settings.FIREBASE_CONFIG
             credentials_obj = service_account.Credentials.from_service_account_info(creds_dict)
+            self.signing_credentials = credentials_obj
             
             # Initialize storage client
             self.storage_client = storage.Client(
@@ -45,6 +216,11 @@ class FirebaseStorageService:
                 project=creds_dict.get('project_id')
             )
             
+            self.storage_client._http.mount('https://', HTTPAdapter(
+                pool_connections=STORAGE_HTTP_POOL_SIZE,
+                pool_maxsize=STORAGE_HTTP_POOL_SIZE,
+            ))
+            
             # Get bucket
             self.bucket = self.storage_client.bucket(self.bucket_name)
             logger.info(f"✅ Firebase Storage initialized: {self.bucket_name}")
@@ -73,7 +249,7 @@ class FirebaseStorageService:
             Tuple of (upload_url, file_path)
         """
         # Validate file type
-        if file_type not in ['video', 'resource', 'thumbnail', 'lesson']:
+        if file_type not in UPLOAD_PATH_MAP:
             raise ValueError(f"Invalid file type: {file_type}")
         
         # Validate content type
@@ -97,6 +273,7 @@ class FirebaseStorageService:
         # Generate signed upload URL (valid for 1 hour)
         upload_url = blob.generate_signed_url(
             version="v4",
+            credentials=self.signing_credentials,
             expiration=timedelta(hours=1),
             method="PUT",
             content_type=content_type,
@@ -109,27 +286,51 @@ class FirebaseStorageService:
     def generate_download_url(
         self,
         file_path: str,
-        expiration_minutes: int = 60
+        expiration_minutes: int = 60,
+        *,
+        stable: bool = True
     ) -> str:
         """
         Generate a signed download URL for accessing files
         
+        With ``stable`` (the default) the URL is signed once per
+        ``SIGNED_URL_SLOT_SECONDS`` slot and reused until the slot ends. It is
+        signed for one extra slot, so it stays valid for at least
+        ``expiration_minutes`` whenever it is handed out. Requested lifetimes
+        are rounded up to whole slots so nearby values share an entry.
+        
         Args:
             file_path: Path to file in storage
             expiration_minutes: How long the URL should be valid
+            stable: Reuse the URL cached for the current slot
         
         Returns:
             Signed download URL
         """
         try:
-            blob = self.bucket.blob(file_path)
+            if not stable:
+                return self.bucket.blob(file_path).generate_signed_url(
+                    version="v4",
+                    credentials=self.signing_credentials,
+                    expiration=timedelta(minutes=expiration_minutes),
+                    method="GET"
+                )
+            
+            slot_minutes = max(SIGNED_URL_SLOT_SECONDS // 60, 1)
+            bucketed_minutes = -(-expiration_minutes // slot_minutes) * slot_minutes
+            slot = int(time.time() // SIGNED_URL_SLOT_SECONDS)
+            
+            download_url = _get_cached_signed_url(file_path, bucketed_minutes, slot)
+            if download_url is not None:
+                return download_url
             
-            # Generate signed URL
-            download_url = blob.generate_signed_url(
+            download_url = self.bucket.blob(file_path).generate_signed_url(
                 version="v4",
-                expiration=timedelta(minutes=expiration_minutes),
+                credentials=self.signing_credentials,
+                expiration=timedelta(minutes=bucketed_minutes, seconds=SIGNED_URL_SLOT_SECONDS),
                 method="GET"
             )
+            _set_cached_signed_url(file_path, bucketed_minutes, slot, download_url)
             
             return download_url
             
@@ -137,6 +338,35 @@ class FirebaseStorageService:
             logger.error(f"Error generating download URL for {file_path}: {e}")
             raise
     
+    def generate_download_urls_bulk(
+        self,
+        file_paths: Iterable[str],
+        expiration_minutes: int = 60
+    ) -> Dict[str, str]:
+        """
+        Generate signed download URLs for many files at once
+        
+        Paths already signed in the current slot come straight from the cache.
+        Only the remaining paths are signed, spread over a shared thread pool.
+        
+        Args:
+            file_paths: Paths to files in storage
+            expiration_minutes: How long the URLs should be valid
+        
+        Returns:
+            Dict mapping each distinct path to its signed URL
+        """
+        paths = list(dict.fromkeys(file_paths))
+        if len(paths) <= 1:
+            return {path: self.generate_download_url(path, expiration_minutes) for path in paths}
+        
+        executor = _get_signing_executor()
+        futures = [
+            executor.submit(self.generate_download_url, path, expiration_minutes)
+            for path in paths
+        ]
+        return {path: future.result() for path, future in zip(paths, futures)}
+    
     def generate_streaming_url(
         self,
         file_path: str,
@@ -155,19 +385,80 @@ class FirebaseStorageService:
         """
         return self.generate_download_url(file_path, expiration_minutes)
     
-    def delete_file(self, file_path: str) -> bool:
+    def delete_file(self, file_path: str, wait: bool = False) -> bool:
         """
         Delete a file from Firebase Storage
         
+        The delete runs on a background pool and is retried on transient
+        errors, so by default the caller does not wait for the round trip.
+        
         Args:
             file_path: Path to file in storage
+            wait: Block until the delete finishes and report its outcome
         
         Returns:
-            True if deleted successfully
+            True if deleted successfully (or, without ``wait``, once queued)
         """
+        invalidate_signed_urls(file_path)
+        future = _io_executor.submit(self._delete_blob, file_path)
+        if not wait:
+            return True
+        return future.result()
+    
+    def delete_files(self, file_paths: Iterable[str], wait: bool = False) -> bool:
+        """
+        Delete many files using batched (multipart) requests
+        
+        Up to ``STORAGE_BATCH_MAX`` deletes share one HTTP request. After each
+        batch, the files that still exist are retried with backoff, up to
+        ``STORAGE_OP_MAX_ATTEMPTS`` times. Like ``delete_file``, this runs on
+        the background pool.
+        
+        Args:
+            file_paths: Paths to files in storage
+            wait: Block until the deletes finish and report their outcome
+        
+        Returns:
+            True if every file is gone (or, without ``wait``, once queued)
+        """
+        paths = list(dict.fromkeys(file_paths))
+        for path in paths:
+            invalidate_signed_urls(path)
+        future = _io_executor.submit(self._delete_blobs, paths)
+        if not wait:
+            return True
+        return future.result()
+    
+    def _delete_blobs(self, file_paths: list) -> bool:
+        remaining = []
+        for start in range(0, len(file_paths), STORAGE_BATCH_MAX):
+            chunk = file_paths[start:start + STORAGE_BATCH_MAX]
+            for attempt in range(STORAGE_OP_MAX_ATTEMPTS):
+                try:
+                    with self.storage_client.batch(raise_exception=False):
+                        for path in chunk:
+                            self.bucket.blob(path).delete()
+                except Exception as e:
+                    logger.warning(f"Batch delete of {len(chunk)} files failed: {e}")
+                
+                # Per-item statuses are not exposed, so check what is still there
+                exists = self.files_exist(chunk)
+                chunk = [path for path in chunk if exists[path]]
+                if not chunk:
+                    break
+                if attempt < STORAGE_OP_MAX_ATTEMPTS - 1:
+                    time.sleep(2 ** attempt)
+            remaining.extend(chunk)
+        
+        if remaining:
+            logger.error(f"Could not delete {len(remaining)} files, e.g. {remaining[:5]}")
+            return False
+        logger.info(f"Deleted {len(file_paths)} files")
+        return True
+    
+    def _delete_blob(self, file_path: str) -> bool:
         try:
-            blob = self.bucket.blob(file_path)
-            blob.delete()
+            _call_with_retry(self.bucket.blob(file_path).delete)
             logger.info(f"Deleted file: {file_path}")
             return True
             
@@ -192,32 +483,105 @@ class FirebaseStorageService:
             logger.error(f"Error checking file existence {file_path}: {e}")
             return False
     
-    def get_file_metadata(self, file_path: str) -> Optional[dict]:
+    def files_exist(self, file_paths: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check which of many files exist, with one name-only listing per folder
+        
+        Args:
+            file_paths: Paths to check
+        
+        Returns:
+            Dict mapping each path to whether it exists
+        """
+        paths = list(dict.fromkeys(file_paths))
+        try:
+            names = {
+                blob.name
+                for blob in self._list_blobs_under(paths, 'items(name),nextPageToken')
+            }
+        except Exception as e:
+            logger.error(f"Error listing {len(paths)} files, checking one by one: {e}")
+            return {path: self.file_exists(path) for path in paths}
+        return {path: path in names for path in paths}
+    
+    def get_file_metadata(
+        self,
+        file_path: str,
+        force_refresh: bool = False,
+        blob=None
+    ) -> Optional[dict]:
         """
         Get metadata for a file
         
+        A missing file gives None, so this doubles as an existence check.
+        
         Args:
             file_path: Path to file
+            force_refresh: Re-fetch even if ``blob`` already carries metadata
+            blob: Blob from an earlier upload/list response, if the caller has one
         
         Returns:
             Dictionary of metadata or None
         """
         try:
-            blob = self.bucket.blob(file_path)
-            blob.reload()
+            if blob is None:
+                blob = self.bucket.blob(file_path)
+            if force_refresh or blob.size is None:
+                blob.reload()
             
-            return {
-                'name': blob.name,
-                'size': blob.size,
-                'content_type': blob.content_type,
-                'created': blob.time_created,
-                'updated': blob.updated,
-                'md5_hash': blob.md5_hash,
-            }
+            return self._blob_metadata(blob)
         except Exception as e:
             logger.error(f"Error getting metadata for {file_path}: {e}")
             return None
     
+    def get_files_metadata_bulk(self, file_paths: Iterable[str]) -> Dict[str, dict]:
+        """
+        Get metadata for many files with one listing per storage folder
+        
+        Paths are grouped by parent folder (e.g. ``videos/20106/``), and
+        each folder is listed once with a field projection. This replaces one
+        ``reload()`` round trip per file.
+        
+        Args:
+            file_paths: Paths to files
+        
+        Returns:
+            Dict mapping each path found to its metadata (missing paths are omitted)
+        """
+        wanted = set(file_paths)
+        metadata = {}
+        try:
+            for blob in self._list_blobs_under(
+                wanted,
+                'items(name,size,contentType,timeCreated,updated,md5Hash),nextPageToken'
+            ):
+                if blob.name in wanted:
+                    metadata[blob.name] = self._blob_metadata(blob)
+        except Exception as e:
+            logger.error(f"Error listing metadata for {len(wanted)} files: {e}")
+        return metadata
+    
+    def _list_blobs_under(self, file_paths: Iterable[str], fields: str):
+        """Yield the blobs in every folder containing one of ``file_paths``"""
+        prefixes = {path.rpartition('/')[0] for path in file_paths}
+        for prefix in sorted(prefixes):
+            yield from self.bucket.list_blobs(
+                prefix=f"{prefix}/" if prefix else None,
+                delimiter=None if prefix else '/',
+                fields=fields,
+            )
+    
+    @staticmethod
+    def _blob_metadata(blob) -> dict:
+        return {
+            'name': blob.name,
+            'size': blob.size,
+            'content_type': blob.content_type,
+            'created': blob.time_created,
+            'updated': blob.updated,
+            'md5_hash': blob.md5_hash,
+        }
+    
     def _generate_file_path(
         self,
         file_type: str,
@@ -227,75 +591,70 @@ class FirebaseStorageService:
         """
         Generate a unique file path in storage
         
-        Format: {type}/{timestamp_prefix}/{unique_id}.{extension}
-        """
-        import time
-        
-        # Get file extension from content type
-        extension = mimetypes.guess_extension(content_type) or ''
-        
-        # Generate unique ID
-        unique_id = uuid.uuid4().hex
+        Format: {type}/{epoch_day}/{unique_id}.{extension}
         
-        # Create timestamp prefix (for better organization and lifecycle rules)
-        timestamp_prefix = str(int(time.time()))[:8]  # YYYYMMDD format approx
-        
-        # Map file types to storage paths
-        path_map = {
-            'video': 'videos',
-            'resource': 'resources',
-            'thumbnail': 'thumbnails',
-            'lesson': 'lesson-plans'
-        }
-        
-        base_path = path_map.get(file_type, 'uploads')
-        
-        # Construct path: videos/20250118/abc123def456.mp4
-        file_path = f"{base_path}/{timestamp_prefix}/{unique_id}{extension}"
-        
-        return file_path
+        One folder per UTC day keeps lifecycle rules and the per-folder
+        listings in get_files_metadata_bulk/files_exist small.
+        """
+        # Construct path: videos/20106/3f9c...e1.mp4
+        return (
+            f"{UPLOAD_PATH_MAP.get(file_type, 'uploads')}/{int(time.time()) // 86400}/"
+            f"{secrets.token_hex(16)}{CONTENT_TYPE_EXTENSIONS.get(content_type, '')}"
+        )
     
-    def _get_allowed_content_types(self, file_type: str) -> list:
+    def _get_allowed_content_types(self, file_type: str) -> frozenset:
         """Get allowed MIME types for each file type"""
-        type_map = {
-            'video': [
-                'video/mp4',
-                'video/quicktime',
-                'video/x-msvideo',
-            ],
-            'resource': [
-                'application/pdf',
-                'application/msword',
-                'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                'application/vnd.ms-powerpoint',
-                'application/vnd.openxmlformats-officedocument.presentationml.presentation',
-                'application/vnd.ms-excel',
-                'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                'text/plain',
-                'image/jpeg',
-                'image/png',
-                'image/gif',
-            ],
-            'thumbnail': [
-                'image/jpeg',
-                'image/png',
-                'image/webp',
-            ],
-            'lesson': [
-                'application/pdf',
-            ]
-        }
-        return type_map.get(file_type, [])
+        return ALLOWED_CONTENT_TYPES.get(file_type, frozenset())
     
     def _get_max_file_size(self, file_type: str) -> int:
         """Get maximum file size in bytes for each file type"""
-        size_map = {
-            'video': 500 * 1024 * 1024,      # 500 MB
-            'resource': 50 * 1024 * 1024,    # 50 MB
-            'thumbnail': 10 * 1024 * 1024,   # 10 MB
-            'lesson': 10 * 1024 * 1024,      # 10 MB
-        }
-        return size_map.get(file_type, 10 * 1024 * 1024)
+        return MAX_FILE_SIZES.get(file_type, DEFAULT_MAX_FILE_SIZE)
+
+
+class AsyncFirebaseStorageService:
+    """
+    Awaitable facade over FirebaseStorageService for ``async def`` views
+    
+    Each call runs the sync method on a worker thread (not the event loop),
+    so signing and storage round trips never block other requests on the
+    loop. Signing and caching behaviour is the sync service's.
+    """
+    
+    def __init__(self, service: Optional[FirebaseStorageService] = None):
+        self._service = service
+    
+    @property
+    def service(self) -> FirebaseStorageService:
+        if self._service is None:
+            self._service = get_storage_service()
+        return self._service
+    
+    async def _run(self, method, *args, **kwargs):
+        from asgiref.sync import sync_to_async
+        return await sync_to_async(method, thread_sensitive=False)(*args, **kwargs)
+    
+    async def generate_download_url(self, file_path: str, expiration_minutes: int = 60) -> str:
+        return await self._run(self.service.generate_download_url, file_path, expiration_minutes)
+    
+    async def generate_download_urls_bulk(
+        self, file_paths: Iterable[str], expiration_minutes: int = 60
+    ) -> Dict[str, str]:
+        return await self._run(
+            self.service.generate_download_urls_bulk, list(file_paths), expiration_minutes
+        )
+    
+    async def generate_upload_url(
+        self, file_type: str, content_type: str, file_size: int, user_id: int
+    ) -> Tuple[str, str]:
+        return await self._run(
+            self.service.generate_upload_url, file_type, content_type, file_size, user_id
+        )
+    
+    async def delete_file(self, file_path: str, wait: bool = False) -> bool:
+        return await self._run(self.service.delete_file, file_path, wait)
+    
+    async def files_exist(self, file_paths: Iterable[str]) -> Dict[str, bool]:
+        return await self._run(self.service.files_exist, list(file_paths))
 
 
 # Singleton instance
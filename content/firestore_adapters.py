@@ -5,12 +5,86 @@ These adapter classes convert Firestore documents to objects
 that are compatible with Django templates (mimicking Django model interfaces).
 """
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, List, Mapping, Optional, Union
 from datetime import datetime
 
+import orjson
 
-@dataclass
-class FirestoreActivity:
+
+class _JSONAdapter:
+    """Adds ``from_json`` to adapters that define ``from_dict``."""
+    __slots__ = ()
+
+    @classmethod
+    def from_json(cls, raw: Union[bytes, str]):
+        """
+        Create the adapter straight from a JSON-encoded document.
+
+        ISO timestamp strings are parsed by ``from_dict`` as usual.
+
+        Args:
+            raw: JSON document (bytes or str, with 'id' field added)
+        """
+        return cls.from_dict(orjson.loads(raw))
+
+
+_GRADE_MAP = {0: 'K', **{i: str(i) for i in range(1, 13)}}
+
+# courtType values written by the CMS (taxonomy keys and labels) → location;
+# '' means "no location implied, use the activity's own field"
+_COURT_MAP = {
+    '': '',
+    'classroom': 'classroom',
+    'Classroom': 'classroom',
+    'court': 'court',
+    'Court': 'court',
+    'Basketball Court': 'court',
+    'both': '',
+    'Both': '',
+    'field': '',
+    'Outdoor Field': '',
+}
+
+
+def _activity_grade(grade_levels) -> str:
+    """Grade string from a gradeLevel number or list ('K' for 0, '5' if unset)."""
+    if not grade_levels:
+        return '5'
+    grade_num = grade_levels[0] if isinstance(grade_levels, list) else grade_levels
+    return _GRADE_MAP.get(grade_num) or str(grade_num)
+
+
+def _activity_location(court_type: str, location: str) -> str:
+    """Location implied by a taxonomy courtType, else the activity's own location."""
+    from_court = _COURT_MAP.get(court_type)
+    if from_court is None:
+        # Unrecognized value: fall back to a substring match
+        lowered = court_type.lower()
+        from_court = 'court' if 'court' in lowered else 'classroom' if 'classroom' in lowered else ''
+    return from_court or location
+
+
+def _activity_topics(tags, taxonomy: Dict[str, Any]) -> List[str]:
+    """Tags with the taxonomy topic first (always a new list: data may be cached)."""
+    tags = tags or ()
+    topic_from_taxonomy = taxonomy.get('topic')
+    if topic_from_taxonomy and topic_from_taxonomy not in tags:
+        return [topic_from_taxonomy, *tags]
+    return list(tags)
+
+
+def _ref_ids(refs) -> List[str]:
+    """Doc IDs from a list of DocumentReferences and/or ID strings."""
+    return [
+        ref.id if hasattr(ref, 'id') else ref
+        for ref in refs or ()
+        if hasattr(ref, 'id') or isinstance(ref, str)
+    ]
+
+
+@dataclass(slots=True)
+class FirestoreActivity(_JSONAdapter):
     """
     Adapter class that mirrors Django Activity model interface.
     Allows Firestore data to be used directly in templates.
@@ -45,27 +119,28 @@ class FirestoreActivity:
     video_ids: List[str] = field(default_factory=list)
     teacher_resource_ids: List[str] = field(default_factory=list)
     student_resource_ids: List[str] = field(default_factory=list)
-    # For template compatibility
-    _video_asset: Any = None
+    # Template compatibility with Activity.video_asset (never set for Firestore data)
+    video_asset: ClassVar[Optional[Any]] = None
+
+    _LOCATION_DISPLAY: ClassVar[Mapping[str, str]] = MappingProxyType({
+        'classroom': 'Classroom',
+        'court': 'Court',
+        'both': 'Both',
+    })
 
     @property
     def topic_tags(self) -> List[str]:
         """Return topics as a list for template rendering"""
         return self.topics if isinstance(self.topics, list) else []
 
-    @property
-    def video_asset(self) -> Optional[Any]:
-        """Return video asset for template compatibility"""
-        return self._video_asset
-
     def get_location_display(self) -> str:
         """Return human-readable location name"""
-        location_map = {
-            'classroom': 'Classroom',
-            'court': 'Court',
-            'both': 'Both',
-        }
-        return location_map.get(self.location, self.location.title())
+        return self._LOCATION_DISPLAY.get(self.location) or self.location.title()
+
+    @staticmethod
+    def from_dict_summary(data: Dict[str, Any]) -> 'FirestoreActivitySummary':
+        """Create the card-sized FirestoreActivitySummary for listing pages."""
+        return FirestoreActivitySummary.from_dict(data)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FirestoreActivity':
@@ -78,123 +153,110 @@ class FirestoreActivity:
         Returns:
             FirestoreActivity instance
         """
-        # Extract grade level - convert from number to string format
-        grade_levels = data.get('gradeLevel', [])
-        if grade_levels:
-            grade_num = grade_levels[0] if isinstance(grade_levels, list) else grade_levels
-            grade = 'K' if grade_num == 0 else str(grade_num)
-        else:
-            grade = '5'  # Default
-
-        # Extract location from taxonomy
-        taxonomy = data.get('taxonomy', {})
-        court_type = taxonomy.get('courtType', '')
-        if 'court' in court_type.lower():
-            location = 'court'
-        elif 'classroom' in court_type.lower():
-            location = 'classroom'
-        else:
-            location = data.get('location', 'both')
-
-        # Extract topics from tags and taxonomy
-        topics = list(data.get('tags', []))
-        topic_from_taxonomy = taxonomy.get('topic')
-        if topic_from_taxonomy and topic_from_taxonomy not in topics:
-            topics.insert(0, topic_from_taxonomy)
-
-        # Extract video IDs from videos array
-        video_ids = []
-        for video_ref in data.get('videos', []):
-            if isinstance(video_ref, dict):
-                video_id = video_ref.get('videoId')
-                if video_id:
-                    # Handle Firestore DocumentReference
-                    if hasattr(video_id, 'id'):
-                        video_ids.append(video_id.id)
-                    elif isinstance(video_id, str):
-                        video_ids.append(video_id)
-
-        # Extract resource IDs
-        teacher_resource_ids = []
-        student_resource_ids = []
-        for resource_ref in data.get('resources', []):
+        g = data.get
+        taxonomy = g('taxonomy') or {}
+
+        # Extract video IDs from videos array (DocumentReference or str)
+        video_ids = [
+            video_id.id if hasattr(video_id, 'id') else video_id
+            for video_ref in g('videos') or ()
+            if isinstance(video_ref, dict)
+            for video_id in (video_ref.get('videoId'),)
+            if video_id and (hasattr(video_id, 'id') or isinstance(video_id, str))
+        ]
+
+        # Extract resource IDs, split into (teacher, student) in one pass
+        resource_ids = ([], [])
+        for resource_ref in g('resources') or ():
             if isinstance(resource_ref, dict):
                 resource_id = resource_ref.get('resourceId')
-                resource_type = resource_ref.get('type', 'teacher')
                 if resource_id:
-                    rid = resource_id.id if hasattr(resource_id, 'id') else resource_id
-                    if resource_type == 'student':
-                        student_resource_ids.append(rid)
-                    else:
-                        teacher_resource_ids.append(rid)
-
-        # Extract prerequisite activity references (EntityReference → doc IDs)
-        prerequisite_activity_refs = []
-        for ref in data.get('prerequisiteActivities', []) or []:
-            if hasattr(ref, 'id'):
-                prerequisite_activity_refs.append(ref.id)
-            elif isinstance(ref, str):
-                prerequisite_activity_refs.append(ref)
-
-        # Extract related activity references (EntityReference → doc IDs)
-        related_activity_refs = []
-        for ref in data.get('relatedActivities', []) or []:
-            if hasattr(ref, 'id'):
-                related_activity_refs.append(ref.id)
-            elif isinstance(ref, str):
-                related_activity_refs.append(ref)
-
-        # Extract direct upload fields (new CMS structure)
-        related_videos = data.get('relatedVideos', []) or []
-        teacher_resources = data.get('teacherResources', []) or []
-        student_resources = data.get('studentResources', []) or []
-        lesson_pdf = data.get('lessonPdf', '') or ''
-        estimated_time = data.get('estimatedTime', 0) or 0
-        lesson_overview = data.get('lessonOverview', []) or []
+                    resource_ids[resource_ref.get('type', 'teacher') == 'student'].append(
+                        resource_id.id if hasattr(resource_id, 'id') else resource_id
+                    )
 
         # Handle learningObjectives - can be string or array
-        learning_objectives_raw = data.get('learningObjectives', [])
-        if isinstance(learning_objectives_raw, str):
-            learning_objectives = [learning_objectives_raw] if learning_objectives_raw else []
-        else:
-            learning_objectives = learning_objectives_raw or []
+        learning_objectives = g('learningObjectives')
+        if isinstance(learning_objectives, str):
+            learning_objectives = [learning_objectives] if learning_objectives else []
 
         return cls(
-            id=data.get('id', ''),
-            title=data.get('title', 'Untitled Activity'),
-            slug=data.get('slug', ''),
-            description=data.get('description', ''),
-            grade=grade,
-            activity_number=data.get('activityNumber', 1),
-            topics=topics,
-            location=location,
-            icon_type=data.get('iconType', 'cone'),
-            prerequisites=data.get('prerequisites', []),
-            learning_objectives=learning_objectives,
-            materials=data.get('materials', []),
-            game_rules=data.get('gameRules', []),
-            key_terms=data.get('keyTerms', {}),
-            thumbnail_url=data.get('thumbnailUrl', ''),
-            order=data.get('order', 0),
-            # Activity references
-            prerequisite_activity_refs=prerequisite_activity_refs,
-            related_activity_refs=related_activity_refs,
+            id=g('id', ''),
+            title=g('title', 'Untitled Activity'),
+            slug=g('slug', ''),
+            description=g('description', ''),
+            grade=_activity_grade(g('gradeLevel')),
+            activity_number=g('activityNumber', 1),
+            topics=_activity_topics(g('tags'), taxonomy),
+            location=_activity_location(taxonomy.get('courtType', ''), g('location', 'both')),
+            icon_type=g('iconType', 'cone'),
+            prerequisites=g('prerequisites', []),
+            learning_objectives=learning_objectives or [],
+            materials=g('materials', []),
+            game_rules=g('gameRules', []),
+            key_terms=g('keyTerms', {}),
+            thumbnail_url=g('thumbnailUrl', ''),
+            order=g('order', 0),
+            # Activity references (EntityReference → doc IDs)
+            prerequisite_activity_refs=_ref_ids(g('prerequisiteActivities')),
+            related_activity_refs=_ref_ids(g('relatedActivities')),
             # New direct upload fields
-            estimated_time=estimated_time,
-            lesson_overview=lesson_overview,
-            related_videos=related_videos,
-            teacher_resources=teacher_resources,
-            student_resources=student_resources,
-            lesson_pdf=lesson_pdf,
+            estimated_time=g('estimatedTime') or 0,
+            lesson_overview=g('lessonOverview') or [],
+            related_videos=g('relatedVideos') or [],
+            teacher_resources=g('teacherResources') or [],
+            student_resources=g('studentResources') or [],
+            lesson_pdf=g('lessonPdf') or '',
             # Legacy fields
             video_ids=video_ids,
-            teacher_resource_ids=teacher_resource_ids,
-            student_resource_ids=student_resource_ids,
+            teacher_resource_ids=resource_ids[0],
+            student_resource_ids=resource_ids[1],
         )
 
 
-@dataclass
-class FirestoreVideo:
+@dataclass(slots=True)
+class FirestoreActivitySummary(_JSONAdapter):
+    """
+    Card-sized FirestoreActivity for listing pages and dropdowns.
+    Skips the reference, resource and lesson fields that only the
+    detail page renders.
+    """
+    id: str
+    title: str
+    slug: str
+    description: str
+    grade: str
+    activity_number: int
+    topics: List[str] = field(default_factory=list)
+    icon_type: str = 'cone'
+    thumbnail_url: str = ''
+    order: int = 0
+
+    @property
+    def topic_tags(self) -> List[str]:
+        """Return topics as a list for template rendering"""
+        return self.topics if isinstance(self.topics, list) else []
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FirestoreActivitySummary':
+        """Create a FirestoreActivitySummary from a Firestore document dict."""
+        g = data.get
+        return cls(
+            id=g('id', ''),
+            title=g('title', 'Untitled Activity'),
+            slug=g('slug', ''),
+            description=g('description', ''),
+            grade=_activity_grade(g('gradeLevel')),
+            activity_number=g('activityNumber', 1),
+            topics=_activity_topics(g('tags'), g('taxonomy') or {}),
+            icon_type=g('iconType', 'cone'),
+            thumbnail_url=g('thumbnailUrl', ''),
+            order=g('order', 0),
+        )
+
+
+@dataclass(slots=True)
+class FirestoreVideo(_JSONAdapter):
     """
     Adapter class for Firestore video documents.
     """
@@ -221,6 +283,40 @@ class FirestoreVideo:
         # TODO: Implement signed URL generation via firebase_storage.py
         return self.file_url
 
+    @classmethod
+    def hydrate_urls(cls, videos: List['FirestoreVideo'], service=None,
+                     expiration_minutes: int = 120) -> List['FirestoreVideo']:
+        """
+        Replace bare storage paths in ``file_url``/``thumbnail_url`` with
+        signed URLs, signing the whole batch in one bulk call. Values that
+        are already full URLs are left alone.
+
+        Args:
+            videos: Videos to update in place
+            service: FirebaseStorageService (defaults to the shared instance)
+            expiration_minutes: URL expiration time
+
+        Returns:
+            The same list, for chaining
+        """
+        paths = [
+            path
+            for video in videos
+            for path in (video.file_url, video.thumbnail_url)
+            if path and not path.startswith(('http://', 'https://'))
+        ]
+        if not paths:
+            return videos
+
+        if service is None:
+            from content.firebase_storage import get_storage_service
+            service = get_storage_service()
+        signed = service.generate_download_urls_bulk(paths, expiration_minutes)
+        for video in videos:
+            video.file_url = signed.get(video.file_url, video.file_url)
+            video.thumbnail_url = signed.get(video.thumbnail_url, video.thumbnail_url)
+        return videos
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FirestoreVideo':
         """Create a FirestoreVideo from a Firestore document dict."""
@@ -235,8 +331,8 @@ class FirestoreVideo:
         )
 
 
-@dataclass
-class FirestoreResource:
+@dataclass(slots=True)
+class FirestoreResource(_JSONAdapter):
     """
     Adapter class for Firestore resource documents.
     """
@@ -248,16 +344,17 @@ class FirestoreResource:
     file_name: str = ''
     file_size: int = 0
 
+    _FILE_TYPE_DISPLAY: ClassVar[Mapping[str, str]] = MappingProxyType({
+        'pdf': 'PDF',
+        'pptx': 'PowerPoint',
+        'docx': 'Word Document',
+        'xlsx': 'Excel Spreadsheet',
+    })
+
     @property
     def get_file_type_display(self) -> str:
         """Return human-readable file type"""
-        type_map = {
-            'pdf': 'PDF',
-            'pptx': 'PowerPoint',
-            'docx': 'Word Document',
-            'xlsx': 'Excel Spreadsheet',
-        }
-        return type_map.get(self.file_type, self.file_type.upper())
+        return self._FILE_TYPE_DISPLAY.get(self.file_type) or self.file_type.upper()
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FirestoreResource':
@@ -319,8 +416,11 @@ class FirestoreCategoryProxy:
         )
 
     @classmethod
-    def get_all_categories(cls, posts: list = None) -> list:
+    def get_all_categories(cls, posts: list = None, counts: Dict[str, int] = None) -> list:
+        """All taxonomy categories, with post counts taken from ``counts`` or tallied from ``posts``."""
         cat_map = cls._get_category_map()
+        if counts is not None:
+            return [cls.from_key(key, post_count=max(counts.get(key, 0), 0)) for key in cat_map]
         counts = {}
         if posts:
             for post in posts:
@@ -332,8 +432,8 @@ class FirestoreCategoryProxy:
         return [cls.from_key(key, post_count=counts.get(key, 0)) for key in cat_map]
 
 
-@dataclass
-class FirestoreCommunityPost:
+@dataclass(slots=True)
+class FirestoreCommunityPost(_JSONAdapter):
     """
     Adapter class for Firestore community post documents.
     """
@@ -355,6 +455,11 @@ class FirestoreCommunityPost:
     related_activity: Any = None
     comments: List['FirestoreComment'] = field(default_factory=list)
 
+    @property
+    def content_excerpt(self):
+        """Template compatibility with the ORM list query's annotated excerpt."""
+        return self.content
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FirestoreCommunityPost':
         """Create a FirestoreCommunityPost from a Firestore document dict."""
@@ -407,8 +512,19 @@ class FirestoreCommunityPost:
         )
 
 
-@dataclass
-class FirestoreComment:
+class _ReplyManager:
+    """Minimal stand-in for a related manager: ``comment.replies.all``."""
+    __slots__ = ('_items',)
+
+    def __init__(self, reply_items):
+        self._items = reply_items
+
+    def all(self):
+        return self._items
+
+
+@dataclass(slots=True)
+class FirestoreComment(_JSONAdapter):
     """
     Adapter class for Firestore comment documents (subcollection).
     """
@@ -419,21 +535,14 @@ class FirestoreComment:
     created_at: Optional[datetime] = None
     is_deleted: bool = False
     parent_comment_id: Optional[str] = None
+    reply_count: Optional[int] = None
+    is_own: bool = False
     _replies_list: List[Any] = field(default_factory=list)
 
     @property
     def replies(self):
         """Return manager-like object with .all() for template compatibility."""
-        items = self._replies_list
-
-        class _ReplyManager:
-            def __init__(self, reply_items):
-                self._items = reply_items
-
-            def all(self):
-                return self._items
-
-        return _ReplyManager(items)
+        return _ReplyManager(self._replies_list)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FirestoreComment':
@@ -457,11 +566,12 @@ class FirestoreComment:
             created_at=created_at,
             is_deleted=data.get('isDeleted', False),
             parent_comment_id=data.get('parentCommentId'),
+            reply_count=data.get('replyCount'),
         )
 
 
-@dataclass
-class FirestoreFAQ:
+@dataclass(slots=True)
+class FirestoreFAQ(_JSONAdapter):
     """
     Adapter class for Firestore FAQ documents.
     """
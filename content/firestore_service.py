@@ -2,14 +2,21 @@
 Firestore Service for reading data from FireCMS
 This module provides functions to sync Firestore collections to Django models
 """
+import atexit
+import itertools
 import logging
-from typing import Optional, List, Dict, Any
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import copy
 import hashlib
+import heapq
 import json
 from django.utils import timezone
 from django.core.cache import cache
+from django.db import connection as db_connection
 from django.conf import settings
 from firebase_admin import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
@@ -17,11 +24,58 @@ import firebase_admin
 
 logger = logging.getLogger(__name__)
 
-# Singleton Firestore client - reused across all requests to avoid
-# re-creating gRPC channels and re-parsing credentials on every call
-_firestore_client = None
+# Small pool of Firestore clients, built once and handed out round-robin:
+# each client has its own channel, so concurrent streams are not all
+# multiplexed over one connection (and credentials are parsed once per client)
+FIRESTORE_CLIENT_POOL_SIZE = getattr(settings, 'FIRESTORE_CLIENT_POOL_SIZE', 4)
+_client_pool: List[Any] = []
+_client_pool_lock = threading.Lock()
+_client_rr = itertools.count()
+# gRPC client for writes/transactions when reads go over REST
+_firestore_write_client = None
 FIRESTORE_QUERY_TIMEOUT_SECONDS = 5
+# 'grpc' (default) or 'rest'. REST streams large collections much faster
+# than gRPC, but has no listeners; writes always stay on gRPC.
+FIRESTORE_TRANSPORT = getattr(settings, 'FIRESTORE_TRANSPORT', 'grpc')
+
+# Shared pool for best-effort writes that should not block the request
+_write_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='firestore-write')
+# Shared pool for overlapping independent reads within one request
+_read_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='firestore-read')
+
+# Aggregate document holding {category_key: post_count} for community posts
+CATEGORY_COUNTS_COLLECTION = 'communityMeta'
+CATEGORY_COUNTS_DOCUMENT = 'categoryCounts'
 ACTIVITY_QUERY_CACHE_TTL = getattr(settings, 'ACTIVITY_QUERY_CACHE_TTL', 30)
+FIRESTORE_DOC_CACHE_TTL = getattr(settings, 'FIRESTORE_DOC_CACHE_TTL', 30)
+VIEW_COUNT_FLUSH_SECONDS = getattr(settings, 'VIEW_COUNT_FLUSH_SECONDS', 30)
+# Whole-collection reads (published activities, FAQs) shared by every filter
+COLLECTION_CACHE_TTL = getattr(settings, 'FIRESTORE_COLLECTION_CACHE_TTL', 60)
+# Let query_activities filter topics/location in Firestore via the searchTags /
+# locationNormalized fields written by sync_activities_to_django. Enable once a
+# sync has backfilled them; activities added in the CMS since the last sync
+# lack the fields and would not match.
+ACTIVITY_SERVER_FILTERS = getattr(settings, 'ACTIVITY_SERVER_FILTERS', False)
+# Firestore's cap on array_contains_any values
+ARRAY_CONTAINS_ANY_MAX = 10
+# slug -> document ID maps; entries are verified on read, so they can live long
+SLUG_ID_CACHE_TTL = getattr(settings, 'FIRESTORE_SLUG_CACHE_TTL', 600)
+SYNC_BULK_BATCH_SIZE = 500
+# IDs per get_all call in get_*_by_ids; larger lists fan out concurrently
+GET_ALL_CHUNK_SIZE = 300
+# Page size for iter_document_pages (full-collection reads)
+DOCUMENT_PAGE_SIZE = getattr(settings, 'FIRESTORE_DOCUMENT_PAGE_SIZE', 500)
+# Everything sync_activities_to_django sets on an existing row (slug is kept)
+ACTIVITY_SYNC_UPDATE_FIELDS = [
+    'title', 'description', 'activity_number', 'grade', 'topics', 'location',
+    'prerequisites', 'learning_objectives', 'materials', 'game_rules', 'key_terms',
+    'thumbnail_uri', 'is_published', 'order', 'video_asset', 'updated_at',
+]
+
+# Per-process buffer of pending community post views, flushed by a timer
+_pending_views = defaultdict(int)
+_pending_views_lock = threading.Lock()
+_view_flush_timer = None
 
 
 def _build_activity_query_cache_key(
@@ -41,15 +95,68 @@ def _build_activity_query_cache_key(
     }
     encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'))
     digest = hashlib.sha256(encoded.encode('utf-8')).hexdigest()
-    return f'activities:query:{digest}'
+    return f'activities:query:{_collection_generation("activities")}:{digest}'
+
+
+def _collection_generation(collection_name: str) -> int:
+    """Current cache generation for a collection; bumped by invalidate()."""
+    return cache.get_or_set(f'firestore:gen:{collection_name}', 0, None)
+
+
+def _collection_cache_key(collection_name: str, *parts: str) -> str:
+    suffix = ':'.join(parts)
+    return f'firestore:list:{collection_name}:{_collection_generation(collection_name)}:{suffix}'
+
+
+def invalidate(collection_name: str) -> None:
+    """
+    Drop every cached list read of a collection.
+
+    Bumping the generation orphans all keys built from the old one (including
+    query_activities results), so no key enumeration is needed; the orphans
+    expire on their own TTL.
+    """
+    key = f'firestore:gen:{collection_name}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
 
 
 def get_firestore_client():
-    """Get or create a singleton Firestore client with explicit database name and credentials"""
-    global _firestore_client
-    if _firestore_client is not None:
-        return _firestore_client
+    """
+    Get a Firestore client for reads from the round-robin pool.
 
+    Uses the FIRESTORE_TRANSPORT transport; see get_firestore_write_client
+    for writes.
+    """
+    if not _client_pool:
+        with _client_pool_lock:
+            if not _client_pool:
+                _client_pool.extend(
+                    _create_firestore_client(FIRESTORE_TRANSPORT)
+                    for _ in range(max(1, FIRESTORE_CLIENT_POOL_SIZE))
+                )
+    return _client_pool[next(_client_rr) % len(_client_pool)]
+
+
+def get_firestore_write_client():
+    """
+    Get the Firestore client for writes, transactions and BulkWriter.
+
+    This is a pooled client unless reads use REST, in which case a gRPC
+    singleton is kept for writes.
+    """
+    global _firestore_write_client
+    if FIRESTORE_TRANSPORT != 'rest':
+        return get_firestore_client()
+    if _firestore_write_client is None:
+        _firestore_write_client = _create_firestore_client('grpc')
+    return _firestore_write_client
+
+
+def _create_firestore_client(transport: str = 'grpc'):
+    """Create a Firestore client with explicit database name and credentials"""
     from google.cloud import firestore as gc_firestore
     from google.oauth2 import service_account
     from django.conf import settings
@@ -74,18 +181,86 @@ def get_firestore_client():
 
     # Use google-cloud-firestore directly with explicit database='default'
     # Note: The database is named 'default' (not '(default)') in this project
-    _firestore_client = gc_firestore.Client(
+    client = gc_firestore.Client(
         project=project_id,
         database='default',
         credentials=credentials
     )
-    return _firestore_client
+    if transport == 'rest':
+        # Client has no transport argument: pre-seed its lazily built GAPIC
+        # client with a REST transport using the client's scoped credentials
+        from google.cloud.firestore_v1.services.firestore import FirestoreClient
+        from google.cloud.firestore_v1.services.firestore.transports.rest import FirestoreRestTransport
+        client._firestore_api_internal = FirestoreClient(
+            transport=FirestoreRestTransport(host=client._target, credentials=client._credentials),
+            client_options=client._client_options,
+        )
+    return client
+
+
+def async_write(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """
+    Run a firestore_service write function on the background pool.
+
+    The write functions log and return False on failure rather than raising;
+    either outcome is logged as a warning once the future completes.
+
+    Returns:
+        The Future for the submitted write
+    """
+    future = _write_executor.submit(func, *args, **kwargs)
+
+    def _log_failure(done: Future) -> None:
+        try:
+            ok = done.result()
+        except Exception as e:
+            logger.warning(f"Background Firestore write {func.__name__} raised: {e}")
+            return
+        if ok is False:
+            logger.warning(f"Background Firestore write {func.__name__} failed")
+
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def iter_document_pages(
+    collection_name: str,
+    page_size: int = DOCUMENT_PAGE_SIZE,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield a collection page by page, in document ID order.
+
+    Each page is one bounded query resumed from the previous page's last
+    snapshot, so callers can process a large collection without holding it
+    all. Errors propagate to the caller.
+
+    Args:
+        collection_name: Name of the Firestore collection
+        page_size: Documents per page
+
+    Yields:
+        Lists of documents as dictionaries with 'id' field added
+    """
+    db = get_firestore_client()
+    query = db.collection(collection_name).order_by('__name__').limit(page_size)
+    cursor = None
+    while True:
+        page_query = query.start_after(cursor) if cursor is not None else query
+        docs = list(page_query.stream(timeout=FIRESTORE_QUERY_TIMEOUT_SECONDS))
+        if not docs:
+            return
+        yield [{**doc.to_dict(), 'id': doc.id} for doc in docs]
+        if len(docs) < page_size:
+            return
+        cursor = docs[-1]
 
 
 def get_all_documents(collection_name: str) -> List[Dict[str, Any]]:
     """
     Get all documents from a Firestore collection
     
+    Prefer iter_document_pages for collections that can grow large.
+    
     Args:
         collection_name: Name of the Firestore collection
         
@@ -93,14 +268,7 @@ def get_all_documents(collection_name: str) -> List[Dict[str, Any]]:
         List of documents as dictionaries with 'id' field added
     """
     try:
-        db = get_firestore_client()
-        docs = db.collection(collection_name).stream(timeout=FIRESTORE_QUERY_TIMEOUT_SECONDS)
-        
-        results = []
-        for doc in docs:
-            data = doc.to_dict()
-            data['id'] = doc.id
-            results.append(data)
+        results = [doc for page in iter_document_pages(collection_name) for doc in page]
         
         logger.info(f"Retrieved {len(results)} documents from '{collection_name}'")
         return results
@@ -110,24 +278,51 @@ def get_all_documents(collection_name: str) -> List[Dict[str, Any]]:
         return []
 
 
-def get_document(collection_name: str, doc_id: str) -> Optional[Dict[str, Any]]:
+def _document_cache_key(collection_name: str, doc_id: str) -> str:
+    return f"firestore:doc:{collection_name}:{doc_id}"
+
+
+def invalidate_document_cache(collection_name: str, doc_id: str) -> None:
+    """Drop a document cached by get_document(..., use_cache=True)."""
+    cache.delete(_document_cache_key(collection_name, str(doc_id)))
+
+
+def get_document(
+    collection_name: str,
+    doc_id: str,
+    use_cache: bool = False,
+    fields: Optional[List[str]] = None,
+) -> Optional[Dict[str, Any]]:
     """
     Get a single document from Firestore
     
     Args:
         collection_name: Name of the Firestore collection
         doc_id: Document ID
+        use_cache: Serve from / fill the Django cache (read-only GET paths;
+            mutation paths should read from the server)
+        fields: Only transfer these field paths (server-side field mask);
+            partial documents are never cached
         
     Returns:
         Document data as dictionary or None if not found
     """
+    cache_key = _document_cache_key(collection_name, doc_id)
+    use_cache = use_cache and not fields
+    if use_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     try:
         db = get_firestore_client()
-        doc = db.collection(collection_name).document(doc_id).get()
+        doc = db.collection(collection_name).document(doc_id).get(field_paths=fields)
         
         if doc.exists:
-            data = doc.to_dict()
+            data = doc.to_dict() or {}
             data['id'] = doc.id
+            if use_cache:
+                cache.set(cache_key, data, FIRESTORE_DOC_CACHE_TTL)
             return data
         
         return None
@@ -141,12 +336,22 @@ def get_published_activities() -> List[Dict[str, Any]]:
     """
     Get all published activities from Firestore
 
+    Served from the Django cache for COLLECTION_CACHE_TTL seconds; call
+    invalidate('activities') after writes that must be visible immediately.
+
     Returns:
         List of published activities
     """
+    cache_key = _collection_cache_key('activities', 'published')
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         db = get_firestore_client()
-        docs = db.collection('activities').where(filter=FieldFilter('status', '==', 'published')).stream()
+        docs = db.collection('activities').where(filter=FieldFilter('status', '==', 'published')).stream(
+            timeout=FIRESTORE_QUERY_TIMEOUT_SECONDS
+        )
 
         results = []
         for doc in docs:
@@ -154,6 +359,7 @@ def get_published_activities() -> List[Dict[str, Any]]:
             data['id'] = doc.id
             results.append(data)
 
+        cache.set(cache_key, results, COLLECTION_CACHE_TTL)
         logger.info(f"Retrieved {len(results)} published activities from Firestore")
         return results
 
@@ -180,8 +386,8 @@ def query_activities(
         search: Search query for title/description
         extra_taxonomy: Dict of additional taxonomy type->value filters
                         (e.g., {'standard': 'CCSS.3.NF.1'})
-        taxonomy_categories: Optional pre-fetched taxonomy categories to avoid
-                            duplicate reads in caller paths.
+        taxonomy_categories: Optional taxonomy categories to match against
+                            instead of the cached key -> label map.
 
     Returns:
         List of matching activities
@@ -198,33 +404,45 @@ def query_activities(
         if cached is not None:
             return copy.deepcopy(cached)
 
-        db = get_firestore_client()
-        query = db.collection('activities').where(filter=FieldFilter('status', '==', 'published'))
-
-        # Filter by grade level
-        if grade:
-            # Convert grade to number for Firestore (K=0, 1=1, etc.)
-            grade_num = 0 if grade == 'K' else int(grade)
-            query = query.where(filter=FieldFilter('gradeLevel', 'array_contains', grade_num))
+        # Convert grade to number as stored in Firestore (K=0, 1=1, etc.)
+        grade_num = (0 if grade == 'K' else int(grade)) if grade else None
 
         # Build key→label map from taxonomy data so we can match filter keys
         # against activity values (which store labels, not keys)
         key_to_label = {}
         if topics or extra_taxonomy:
+            from content import taxonomy_service
             if taxonomy_categories is None:
-                from content.taxonomy_service import get_all_taxonomy_categories
-                taxonomy_categories = get_all_taxonomy_categories()
-            for cat in taxonomy_categories:
-                for val in cat.get('values', []):
-                    key_to_label[val['key']] = val.get('label', val['key'])
-
-        # Execute query
-        docs = query.stream(timeout=FIRESTORE_QUERY_TIMEOUT_SECONDS)
+                key_to_label = taxonomy_service.get_key_to_label()
+            else:
+                key_to_label = taxonomy_service.build_key_to_label(taxonomy_categories)
+
+        # Activities store labels, filters send keys: match either, case-insensitively,
+        # against one pre-lowered term set per filter
+        def _filter_terms(value: str) -> set:
+            return {value.lower(), key_to_label.get(value, '').lower()} - {''}
+
+        topic_terms = set()
+        for t in topics or []:
+            topic_terms |= _filter_terms(t)
+        taxonomy_terms = {
+            tax_type: _filter_terms(tax_value)
+            for tax_type, tax_value in (extra_taxonomy or {}).items()
+        }
+        search_cf = search.casefold() if search else ''
+
+        # Filter the cached published set instead of streaming per query, unless
+        # Firestore can narrow it by the normalized topic/location fields
+        if ACTIVITY_SERVER_FILTERS and (topic_terms or location in ('court', 'classroom')):
+            candidates = _query_activity_candidates(topic_terms, location)
+        else:
+            candidates = get_published_activities()
+
         results = []
 
-        for doc in docs:
-            data = doc.to_dict()
-            data['id'] = doc.id
+        for data in candidates:
+            if grade_num is not None and grade_num not in (data.get('gradeLevel') or []):
+                continue
 
             # Apply location filter in Python (Firestore limitation on multiple array_contains)
             if location:
@@ -236,56 +454,32 @@ def query_activities(
 
             # Apply topic filter in Python
             if topics:
-                activity_tags = data.get('tags', [])
                 activity_topic = data.get('taxonomy', {}).get('topic', '')
-                all_activity_values = activity_tags + ([activity_topic] if activity_topic else [])
-                # Normalize: lowercase all activity values for comparison
-                all_activity_lower = [v.lower() for v in all_activity_values if v]
-                # Check if any filter topic matches (by key, label, or lowercase)
-                matched = False
-                for t in topics:
-                    t_lower = t.lower()
-                    label = key_to_label.get(t, '')
-                    if (t in all_activity_values
-                            or t_lower in all_activity_lower
-                            or label in all_activity_values
-                            or label.lower() in all_activity_lower):
-                        matched = True
-                        break
-                if not matched:
+                activity_terms = {v.lower() for v in data.get('tags', []) if v}
+                if activity_topic:
+                    activity_terms.add(activity_topic.lower())
+                if topic_terms.isdisjoint(activity_terms):
                     continue
 
-            # Apply search filter in Python
-            if search:
-                search_lower = search.lower()
-                title = data.get('title', '').lower()
-                description = data.get('description', '').lower()
-                if search_lower not in title and search_lower not in description:
-                    continue
+            # Apply search filter in Python; the (usually longer) description
+            # is only case-folded when the title misses
+            if search_cf and search_cf not in data.get('title', '').casefold() \
+                    and search_cf not in data.get('description', '').casefold():
+                continue
 
             # Apply extra taxonomy filters (auto-discovered taxonomy types)
-            if extra_taxonomy:
+            if taxonomy_terms:
                 activity_taxonomy = data.get('taxonomy', {})
                 skip = False
-                for tax_type, tax_value in extra_taxonomy.items():
+                for tax_type, terms in taxonomy_terms.items():
                     activity_tax_value = activity_taxonomy.get(tax_type, '')
-                    # Resolve filter key to label for comparison
-                    filter_label = key_to_label.get(tax_value, '')
                     if isinstance(activity_tax_value, list):
-                        act_lower = [v.lower() for v in activity_tax_value if isinstance(v, str)]
-                        if (tax_value not in activity_tax_value
-                                and tax_value.lower() not in act_lower
-                                and filter_label not in activity_tax_value
-                                and filter_label.lower() not in act_lower):
-                            skip = True
-                            break
+                        act_terms = {v.lower() for v in activity_tax_value if isinstance(v, str)}
                     elif isinstance(activity_tax_value, str):
-                        act_lower = activity_tax_value.lower()
-                        if (tax_value.lower() != act_lower
-                                and filter_label.lower() != act_lower):
-                            skip = True
-                            break
+                        act_terms = {activity_tax_value.lower()}
                     else:
+                        act_terms = set()
+                    if terms.isdisjoint(act_terms):
                         skip = True
                         break
                 if skip:
@@ -305,6 +499,118 @@ def query_activities(
         return []
 
 
+def _query_activity_candidates(topic_terms: set, location: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Published activities narrowed server-side by searchTags/locationNormalized.
+
+    Grade stays a Python filter: Firestore allows only one array-contains
+    clause per query. Callers still apply their full Python filters.
+    """
+    db = get_firestore_client()
+    query = db.collection('activities').where(filter=FieldFilter('status', '==', 'published'))
+    if topic_terms and len(topic_terms) <= ARRAY_CONTAINS_ANY_MAX:
+        query = query.where(filter=FieldFilter('searchTags', 'array_contains_any', sorted(topic_terms)))
+    if location in ('court', 'classroom'):
+        query = query.where(filter=FieldFilter('locationNormalized', 'in', [location, 'both']))
+    return [
+        {**doc.to_dict(), 'id': doc.id}
+        for doc in query.stream(timeout=FIRESTORE_QUERY_TIMEOUT_SECONDS)
+    ]
+
+
+def _activity_location_normalized(data: Dict[str, Any]) -> str:
+    """'court', 'classroom' or 'both', as query_activities' location filter reads it."""
+    activity_location = (data.get('location', '') or data.get('taxonomy', {}).get('courtType', '')).lower()
+    on_court = 'court' in activity_location
+    in_classroom = 'classroom' in activity_location
+    if on_court and not in_classroom:
+        return 'court'
+    if in_classroom and not on_court:
+        return 'classroom'
+    return 'both'
+
+
+def _activity_search_tags(data: Dict[str, Any], label_to_keys: Dict[str, List[str]]) -> List[str]:
+    """Lowercased tags + topic, plus the taxonomy keys whose label they carry."""
+    terms = {v.lower() for v in data.get('tags', []) if isinstance(v, str) and v}
+    topic = data.get('taxonomy', {}).get('topic', '')
+    if isinstance(topic, str) and topic:
+        terms.add(topic.lower())
+    for term in list(terms):
+        terms.update(label_to_keys.get(term, ()))
+    return sorted(terms)
+
+
+def backfill_activity_search_fields(
+    activities: List[Dict[str, Any]],
+    taxonomy_categories: Optional[List[Dict[str, Any]]] = None,
+) -> int:
+    """
+    Write searchTags/locationNormalized onto activities whose values are stale.
+
+    Args:
+        activities: Activity dicts (with 'id') as read from Firestore
+        taxonomy_categories: Optional pre-fetched taxonomy categories
+
+    Returns:
+        Number of activity documents updated
+    """
+    if taxonomy_categories is None:
+        from content.taxonomy_service import get_all_taxonomy_categories
+        taxonomy_categories = get_all_taxonomy_categories()
+    label_to_keys = defaultdict(list)
+    for cat in taxonomy_categories:
+        for val in cat.get('values', []):
+            label_to_keys[val.get('label', val['key']).lower()].append(val['key'].lower())
+
+    db = get_firestore_write_client()
+    # BulkWriter batches (20 writes/RPC), runs batches in parallel and retries
+    # throttled writes; close() flushes and waits
+    writer = db.bulk_writer()
+    updated = 0
+    try:
+        for data in activities:
+            fields = {
+                'searchTags': _activity_search_tags(data, label_to_keys),
+                'locationNormalized': _activity_location_normalized(data),
+            }
+            if all(data.get(k) == v for k, v in fields.items()):
+                continue
+            writer.update(db.collection('activities').document(data['id']), fields)
+            updated += 1
+    finally:
+        writer.close()
+    logger.info(f"Backfilled search fields on {updated} activities")
+    return updated
+
+
+def _slug_cache_key(collection_name: str, slug: str) -> str:
+    return f"firestore:slug:{collection_name}:{slug}"
+
+
+def _get_by_cached_slug(
+    collection_name: str,
+    slug: str,
+    status: str,
+    use_cache: bool = False,
+    default_status: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Resolve a slug through the cached slug -> document ID map.
+
+    A hit costs one direct document get instead of an indexed where+limit
+    query. The document is re-checked, so a stale mapping (slug changed,
+    status changed, document deleted) just reads as a miss.
+    """
+    doc_id = cache.get(_slug_cache_key(collection_name, slug))
+    if not doc_id:
+        return None
+    data = get_document(collection_name, doc_id, use_cache=use_cache)
+    if data and data.get('slug') == slug and data.get('status', default_status) == status:
+        return data
+    return None
+
+
 def get_activity_by_slug(slug: str) -> Optional[Dict[str, Any]]:
     """
     Get a single activity by its slug
@@ -316,12 +622,18 @@ def get_activity_by_slug(slug: str) -> Optional[Dict[str, Any]]:
         Activity data or None if not found
     """
     try:
+        data = _get_by_cached_slug('activities', slug, 'published')
+        if data is not None:
+            return data
+
         db = get_firestore_client()
         docs = db.collection('activities').where(filter=FieldFilter('slug', '==', slug)).where(filter=FieldFilter('status', '==', 'published')).limit(1).stream()
 
         for doc in docs:
             data = doc.to_dict()
             data['id'] = doc.id
+            # slug -> id is stable; later lookups can get the document directly
+            cache.set(_slug_cache_key('activities', slug), doc.id, SLUG_ID_CACHE_TTL)
             return data
 
         return None
@@ -331,9 +643,29 @@ def get_activity_by_slug(slug: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _get_documents_by_ids(collection_name: str, doc_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Batch-read documents by ID, skipping missing ones.
+
+    IDs are split into GET_ALL_CHUNK_SIZE chunks; beyond one chunk, each
+    get_all runs on the read pool with its own pooled client, so latency
+    stays near one chunk's round-trip. Errors propagate to the caller.
+    """
+    def fetch(chunk: List[str]) -> List[Dict[str, Any]]:
+        db = get_firestore_client()
+        refs = [db.collection(collection_name).document(doc_id) for doc_id in chunk]
+        return [{**doc.to_dict(), 'id': doc.id} for doc in db.get_all(refs) if doc.exists]
+
+    chunks = [doc_ids[i:i + GET_ALL_CHUNK_SIZE] for i in range(0, len(doc_ids), GET_ALL_CHUNK_SIZE)]
+    if len(chunks) == 1:
+        return fetch(chunks[0])
+    futures = [_read_executor.submit(fetch, chunk) for chunk in chunks]
+    return [data for future in futures for data in future.result()]
+
+
 def get_videos_by_ids(video_ids: List[str]) -> List[Dict[str, Any]]:
     """
-    Get multiple videos by their document IDs (single batch read)
+    Get multiple videos by their document IDs (batched, concurrent reads)
 
     Args:
         video_ids: List of Firestore document IDs
@@ -345,18 +677,7 @@ def get_videos_by_ids(video_ids: List[str]) -> List[Dict[str, Any]]:
         return []
 
     try:
-        db = get_firestore_client()
-        doc_refs = [db.collection('videos').document(vid) for vid in video_ids]
-        docs = db.get_all(doc_refs)
-
-        results = []
-        for doc in docs:
-            if doc.exists:
-                data = doc.to_dict()
-                data['id'] = doc.id
-                results.append(data)
-
-        return results
+        return _get_documents_by_ids('videos', video_ids)
 
     except Exception as e:
         logger.error(f"Error fetching videos by IDs: {e}")
@@ -365,7 +686,7 @@ def get_videos_by_ids(video_ids: List[str]) -> List[Dict[str, Any]]:
 
 def get_activities_by_ids(activity_ids: List[str]) -> List[Dict[str, Any]]:
     """
-    Get multiple activities by their document IDs (single batch read)
+    Get multiple activities by their document IDs (batched, concurrent reads)
 
     Args:
         activity_ids: List of Firestore document IDs
@@ -377,18 +698,7 @@ def get_activities_by_ids(activity_ids: List[str]) -> List[Dict[str, Any]]:
         return []
 
     try:
-        db = get_firestore_client()
-        doc_refs = [db.collection('activities').document(aid) for aid in activity_ids]
-        docs = db.get_all(doc_refs)
-
-        results = []
-        for doc in docs:
-            if doc.exists:
-                data = doc.to_dict()
-                data['id'] = doc.id
-                results.append(data)
-
-        return results
+        return _get_documents_by_ids('activities', activity_ids)
 
     except Exception as e:
         logger.error(f"Error fetching activities by IDs: {e}")
@@ -397,7 +707,7 @@ def get_activities_by_ids(activity_ids: List[str]) -> List[Dict[str, Any]]:
 
 def get_resources_by_ids(resource_ids: List[str]) -> List[Dict[str, Any]]:
     """
-    Get multiple resources by their document IDs (single batch read)
+    Get multiple resources by their document IDs (batched, concurrent reads)
 
     Args:
         resource_ids: List of Firestore document IDs
@@ -409,18 +719,7 @@ def get_resources_by_ids(resource_ids: List[str]) -> List[Dict[str, Any]]:
         return []
 
     try:
-        db = get_firestore_client()
-        doc_refs = [db.collection('resources').document(rid) for rid in resource_ids]
-        docs = db.get_all(doc_refs)
-
-        results = []
-        for doc in docs:
-            if doc.exists:
-                data = doc.to_dict()
-                data['id'] = doc.id
-                results.append(data)
-
-        return results
+        return _get_documents_by_ids('resources', resource_ids)
 
     except Exception as e:
         logger.error(f"Error fetching resources by IDs: {e}")
@@ -439,9 +738,10 @@ def check_community_slug_exists(slug: str) -> bool:
     """
     try:
         db = get_firestore_client()
+        # Key-only projection: we only need to know whether a match exists
         docs = db.collection('communityPosts').where(
             filter=FieldFilter('slug', '==', slug)
-        ).limit(1).stream()
+        ).select([]).limit(1).stream(timeout=FIRESTORE_QUERY_TIMEOUT_SECONDS)
         for doc in docs:
             return True
         return False
@@ -466,10 +766,52 @@ def get_community_posts(
     Returns:
         List of community posts
     """
+    posts, _ = get_community_posts_page(limit=limit, category=category, search=search)
+    return posts
+
+
+def get_community_posts_page(
+    limit: int = 20,
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+    start_after: Optional[Tuple[datetime, str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, str]]]:
+    """
+    Get one page of community posts, newest activity first, using a cursor.
+
+    Args:
+        limit: Number of posts to scan for this page
+        category: Optional category key to filter by
+        search: Optional search string for title/content
+        start_after: (lastActivityAt, document ID) of the last post scanned
+            on the previous page
+
+    Returns:
+        Tuple of (posts, cursor for the next page or None)
+    """
+    search_cf = search.casefold() if search else ''
+
+    def wanted(data: Dict[str, Any]) -> bool:
+        # Filter by status in Python (fallback path may not have it)
+        if data.get('status') and data['status'] != 'active':
+            return False
+        # Category filter in Python (in case Firestore filter wasn't applied)
+        if category and data.get('category') != category:
+            return False
+        # Search filter in Python (Firestore has no full-text search);
+        # content is only case-folded when the title misses
+        if search_cf and search_cf not in data.get('title', '').casefold() \
+                and search_cf not in data.get('content', '').casefold():
+            return False
+        return True
+
     try:
         db = get_firestore_client()
+        next_cursor = None
+        results = []
 
-        # Try with status filter + ordering (requires composite index)
+        # Try with status filter + ordering (requires composite index);
+        # the cursor costs O(limit) reads however deep the page is
         try:
             query = db.collection('communityPosts').where(
                 filter=FieldFilter('status', '==', 'active')
@@ -477,51 +819,51 @@ def get_community_posts(
             if category:
                 query = query.where(filter=FieldFilter('category', '==', category))
             query = query.order_by(
-                'createdAt', direction=firestore.Query.DESCENDING
-            ).limit(limit)
-            docs = list(query.stream())
+                'lastActivityAt', direction=firestore.Query.DESCENDING
+            ).order_by(
+                '__name__', direction=firestore.Query.DESCENDING
+            )
+            if start_after:
+                query = query.start_after({
+                    'lastActivityAt': start_after[0],
+                    '__name__': start_after[1],
+                })
+            # Decode and filter straight off the stream; only the last
+            # snapshot is kept, for the cursor
+            scanned = 0
+            last = None
+            for doc in query.limit(limit).stream(timeout=FIRESTORE_QUERY_TIMEOUT_SECONDS):
+                scanned += 1
+                last = doc
+                data = {**doc.to_dict(), 'id': doc.id}
+                if wanted(data):
+                    results.append(data)
+            if scanned == limit:
+                next_cursor = (last.get('lastActivityAt'), last.id)
         except Exception as index_err:
-            # Fallback: fetch without ordering, sort in Python
+            # Fallback: fetch without ordering, sort in Python (single page only)
             logger.warning(f"Composite index may be needed, falling back to simple query: {index_err}")
+            if start_after:
+                return [], None
             query = db.collection('communityPosts').limit(limit)
-            docs = list(query.stream())
-
-        results = []
-        for doc in docs:
-            data = doc.to_dict()
-            data['id'] = doc.id
-
-            # Filter by status in Python (fallback path may not have it)
-            if data.get('status') and data['status'] != 'active':
-                continue
-
-            # Category filter in Python (in case Firestore filter wasn't applied)
-            if category and data.get('category') != category:
-                continue
+            results = [
+                data for data in ({**doc.to_dict(), 'id': doc.id} for doc in query.stream())
+                if wanted(data)
+            ]
 
-            # Search filter in Python (Firestore has no full-text search)
-            if search:
-                search_lower = search.lower()
-                title = data.get('title', '').lower()
-                content = data.get('content', '').lower()
-                if search_lower not in title and search_lower not in content:
-                    continue
-
-            results.append(data)
-
-        # Sort: pinned first, then by createdAt descending
+        # Sort: pinned first, then by lastActivityAt descending
         def sort_key(x):
-            created = x.get('createdAt')
-            ts = created.timestamp() if hasattr(created, 'timestamp') else 0
+            active = x.get('lastActivityAt') or x.get('createdAt')
+            ts = active.timestamp() if hasattr(active, 'timestamp') else 0
             return (not x.get('isPinned', False), -ts)
 
         results.sort(key=sort_key)
 
-        return results
+        return results, next_cursor
 
     except Exception as e:
         logger.error(f"Error fetching community posts: {e}")
-        return []
+        return [], None
 
 
 def get_post_with_comments(post_id: str) -> Optional[Dict[str, Any]]:
@@ -537,24 +879,16 @@ def get_post_with_comments(post_id: str) -> Optional[Dict[str, Any]]:
     try:
         db = get_firestore_client()
 
-        # Get the post
+        # The post and its comments are independent reads: overlap them
+        comments_future = _read_executor.submit(_fetch_post_comments, db, post_id)
         post_doc = db.collection('communityPosts').document(post_id).get()
         if not post_doc.exists:
+            comments_future.cancel()
             return None
 
         post_data = post_doc.to_dict()
         post_data['id'] = post_doc.id
-
-        # Get comments from subcollection
-        comments_docs = db.collection('communityPosts').document(post_id).collection('comments').order_by('createdAt').stream()
-
-        comments = []
-        for doc in comments_docs:
-            comment_data = doc.to_dict()
-            comment_data['id'] = doc.id
-            comments.append(comment_data)
-
-        post_data['comments'] = comments
+        post_data['comments'] = comments_future.result()
         return post_data
 
     except Exception as e:
@@ -562,12 +896,113 @@ def get_post_with_comments(post_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def get_community_post_by_slug(slug: str) -> Optional[Dict[str, Any]]:
+def _fetch_post_comments(db, post_id: str) -> List[Dict[str, Any]]:
+    """Read a post's whole comments subcollection, oldest first."""
+    comments_ref = db.collection('communityPosts').document(post_id).collection('comments')
+    try:
+        return [
+            {**doc.to_dict(), 'id': doc.id}
+            for doc in comments_ref.order_by('createdAt').stream(timeout=FIRESTORE_QUERY_TIMEOUT_SECONDS)
+        ]
+    except Exception:
+        # Fallback: fetch without ordering
+        return [
+            {**doc.to_dict(), 'id': doc.id}
+            for doc in comments_ref.stream(timeout=FIRESTORE_QUERY_TIMEOUT_SECONDS)
+        ]
+
+
+def get_community_category_counts() -> Dict[str, int]:
+    """
+    Get community post counts per category from the aggregate document.
+
+    Returns:
+        Dict of category key -> post count (empty if unavailable)
+    """
+    try:
+        db = get_firestore_client()
+        doc = db.collection(CATEGORY_COUNTS_COLLECTION).document(CATEGORY_COUNTS_DOCUMENT).get(
+            timeout=FIRESTORE_QUERY_TIMEOUT_SECONDS
+        )
+        if not doc.exists:
+            return {}
+        return doc.to_dict() or {}
+    except Exception as e:
+        logger.error(f"Error fetching community category counts: {e}")
+        return {}
+
+
+def _increment_category_count(db, category: Optional[str], delta: int) -> None:
+    """Best-effort +/- on the category counts document."""
+    if not category:
+        return
+    try:
+        db.collection(CATEGORY_COUNTS_COLLECTION).document(CATEGORY_COUNTS_DOCUMENT).set(
+            {category: firestore.Increment(delta)}, merge=True
+        )
+    except Exception as e:
+        logger.warning(f"Failed to update category count for {category}: {e}")
+
+
+def move_community_category_count(old_category: Optional[str], new_category: Optional[str]) -> bool:
+    """
+    Move one post between categories in the aggregate counts document.
+
+    Args:
+        old_category: Previous category key (may be empty)
+        new_category: New category key (may be empty)
+
+    Returns:
+        True if successful (or nothing to do), False otherwise
+    """
+    if old_category == new_category:
+        return True
+    updates = {}
+    if old_category:
+        updates[old_category] = firestore.Increment(-1)
+    if new_category:
+        updates[new_category] = firestore.Increment(1)
+    if not updates:
+        return True
+    try:
+        db = get_firestore_write_client()
+        db.collection(CATEGORY_COUNTS_COLLECTION).document(CATEGORY_COUNTS_DOCUMENT).set(updates, merge=True)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to move category count {old_category} -> {new_category}: {e}")
+        return False
+
+
+def rebuild_community_category_counts() -> Dict[str, int]:
+    """
+    Recount posts per category and overwrite the aggregate document.
+
+    Returns:
+        The recomputed counts
+    """
+    db = get_firestore_write_client()
+    counts: Dict[str, int] = {}
+    for doc in db.collection('communityPosts').select(['category']).stream():
+        category = (doc.to_dict() or {}).get('category')
+        if category:
+            counts[category] = counts.get(category, 0) + 1
+    db.collection(CATEGORY_COUNTS_COLLECTION).document(CATEGORY_COUNTS_DOCUMENT).set(counts)
+    logger.info(f"Rebuilt community category counts for {len(counts)} categories")
+    return counts
+
+
+def get_community_post_by_slug(
+    slug: str,
+    include_comments: bool = True,
+    use_cache: bool = False,
+) -> Optional[Dict[str, Any]]:
     """
     Get a community post by its slug, with comments.
 
     Args:
         slug: URL-friendly post identifier
+        include_comments: Also read the full comments subcollection
+        use_cache: Serve the post document from the Django cache when warm
 
     Returns:
         Post data with comments array, or None if not found
@@ -575,52 +1010,66 @@ def get_community_post_by_slug(slug: str) -> Optional[Dict[str, Any]]:
     try:
         db = get_firestore_client()
 
-        # Try with slug + status filter (may need composite index)
-        try:
-            docs = db.collection('communityPosts').where(
-                filter=FieldFilter('slug', '==', slug)
-            ).where(
-                filter=FieldFilter('status', '==', 'active')
-            ).limit(1).stream()
-            post_data = None
-            for doc in docs:
-                post_data = doc.to_dict()
-                post_data['id'] = doc.id
-                break
-        except Exception:
-            # Fallback: query by slug only, check status in Python
-            docs = db.collection('communityPosts').where(
-                filter=FieldFilter('slug', '==', slug)
-            ).limit(1).stream()
-            post_data = None
-            for doc in docs:
-                data = doc.to_dict()
-                if data.get('status', 'active') == 'active':
-                    post_data = data
+        # When the slug's post ID is already known, read the comments while
+        # the post itself is being fetched
+        comments_future = None
+        known_id = cache.get(_slug_cache_key('communityPosts', slug)) if include_comments else None
+        if known_id:
+            comments_future = _read_executor.submit(_fetch_post_comments, db, known_id)
+
+        # slug -> id is stable: go straight to the document when it is known
+        # (and, with use_cache, to the cached copy of the document)
+        post_data = _get_by_cached_slug(
+            'communityPosts', slug, 'active', use_cache=use_cache, default_status='active'
+        )
+
+        if post_data is None:
+            # Try with slug + status filter (may need composite index)
+            try:
+                docs = db.collection('communityPosts').where(
+                    filter=FieldFilter('slug', '==', slug)
+                ).where(
+                    filter=FieldFilter('status', '==', 'active')
+                ).limit(1).stream()
+                post_data = None
+                for doc in docs:
+                    post_data = doc.to_dict()
                     post_data['id'] = doc.id
-                break
+                    break
+            except Exception:
+                # Fallback: query by slug only, check status in Python
+                docs = db.collection('communityPosts').where(
+                    filter=FieldFilter('slug', '==', slug)
+                ).limit(1).stream()
+                post_data = None
+                for doc in docs:
+                    data = doc.to_dict()
+                    if data.get('status', 'active') == 'active':
+                        post_data = data
+                        post_data['id'] = doc.id
+                    break
+
+            if post_data:
+                cache.set(_slug_cache_key('communityPosts', slug), post_data['id'], SLUG_ID_CACHE_TTL)
+            if post_data and use_cache:
+                cache.set(
+                    _document_cache_key('communityPosts', post_data['id']),
+                    post_data,
+                    FIRESTORE_DOC_CACHE_TTL,
+                )
 
         if not post_data:
+            if comments_future is not None:
+                comments_future.cancel()
             return None
 
-        # Get comments from subcollection
-        try:
-            comments_docs = db.collection('communityPosts').document(
-                post_data['id']
-            ).collection('comments').order_by('createdAt').stream()
-        except Exception:
-            # Fallback: fetch without ordering
-            comments_docs = db.collection('communityPosts').document(
-                post_data['id']
-            ).collection('comments').stream()
-
-        comments = []
-        for doc in comments_docs:
-            comment_data = doc.to_dict()
-            comment_data['id'] = doc.id
-            comments.append(comment_data)
-
-        post_data['comments'] = comments
+        if not include_comments:
+            return post_data
+
+        if comments_future is not None and post_data['id'] == known_id:
+            post_data['comments'] = comments_future.result()
+        else:
+            post_data['comments'] = _fetch_post_comments(db, post_data['id'])
         return post_data
 
     except Exception as e:
@@ -628,37 +1077,134 @@ def get_community_post_by_slug(slug: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def increment_post_view_count(post_id: str) -> bool:
+def get_post_comments(
+    post_id: str,
+    parent_comment_id: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Get the comments of a post that share a parent, oldest first.
+
+    Args:
+        post_id: Firestore document ID of the post
+        parent_comment_id: Parent comment ID, or None for top-level comments
+        limit: Optional maximum number of comments to return
+
+    Returns:
+        List of comment dicts
+    """
+    try:
+        db = get_firestore_client()
+        comments_ref = db.collection('communityPosts').document(post_id).collection('comments')
+        query = comments_ref.where(filter=FieldFilter('parentCommentId', '==', parent_comment_id))
+
+        try:
+            # Requires composite index (parentCommentId, createdAt)
+            ordered = query.order_by('createdAt')
+            if limit:
+                ordered = ordered.limit(limit)
+            return [
+                {**doc.to_dict(), 'id': doc.id}
+                for doc in ordered.stream(timeout=FIRESTORE_QUERY_TIMEOUT_SECONDS)
+            ]
+        except Exception as index_err:
+            logger.warning(f"Comment index may be needed, sorting in Python: {index_err}")
+
+        # Decode each document once and order oldest first (missing createdAt
+        # last); with a limit, keep only a bounded heap of the first `limit`
+        comments = (
+            {**doc.to_dict(), 'id': doc.id}
+            for doc in query.stream(timeout=FIRESTORE_QUERY_TIMEOUT_SECONDS)
+        )
+
+        def sort_key(c):
+            return (c.get('createdAt') is None, c.get('createdAt') or 0)
+
+        if limit:
+            return heapq.nsmallest(limit, comments, key=sort_key)
+        return sorted(comments, key=sort_key)
+
+    except Exception as e:
+        logger.error(f"Error fetching comments for post {post_id}: {e}")
+        return []
+
+
+def increment_post_view_count(post_id: str, amount: int = 1) -> bool:
     """
     Increment the view count for a community post.
 
     Args:
         post_id: Firestore document ID
+        amount: Number of views to add
 
     Returns:
         True if successful
     """
     try:
-        db = get_firestore_client()
+        db = get_firestore_write_client()
         db.collection('communityPosts').document(post_id).update({
-            'viewCount': firestore.Increment(1)
+            'viewCount': firestore.Increment(amount)
         })
+        invalidate_document_cache('communityPosts', post_id)
         return True
     except Exception as e:
         logger.error(f"Error incrementing view count for post {post_id}: {e}")
         return False
 
 
+def buffer_post_view(post_id: str) -> None:
+    """
+    Record a post view in memory; views are written in one Increment(n) per
+    post every VIEW_COUNT_FLUSH_SECONDS instead of one write per page view.
+    """
+    global _view_flush_timer
+    with _pending_views_lock:
+        _pending_views[post_id] += 1
+        if _view_flush_timer is None:
+            _view_flush_timer = threading.Timer(VIEW_COUNT_FLUSH_SECONDS, flush_post_view_counts)
+            _view_flush_timer.daemon = True
+            _view_flush_timer.start()
+
+
+def flush_post_view_counts() -> int:
+    """
+    Write all buffered post views to Firestore.
+
+    Returns:
+        Number of posts updated
+    """
+    global _view_flush_timer
+    with _pending_views_lock:
+        pending = dict(_pending_views)
+        _pending_views.clear()
+        _view_flush_timer = None
+
+    for post_id, amount in pending.items():
+        increment_post_view_count(post_id, amount)
+    return len(pending)
+
+
+# Don't lose buffered views on a graceful worker shutdown
+atexit.register(flush_post_view_counts)
+
+
 def get_faqs_by_category(category: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Get FAQs, optionally filtered by category
 
+    Served from the Django cache for COLLECTION_CACHE_TTL seconds.
+
     Args:
         category: Optional category filter
 
     Returns:
         List of FAQ entries
     """
+    cache_key = _collection_cache_key('faqs', category or '')
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         db = get_firestore_client()
         # Query without order_by to avoid composite index requirement; sort in Python
@@ -678,6 +1224,7 @@ def get_faqs_by_category(category: Optional[str] = None) -> List[Dict[str, Any]]
         # Sort by displayOrder in Python
         results.sort(key=lambda x: x.get('displayOrder', 0))
 
+        cache.set(cache_key, results, COLLECTION_CACHE_TTL)
         return results
 
     except Exception as e:
@@ -730,6 +1277,89 @@ def get_resources() -> List[Dict[str, Any]]:
     return get_all_documents('resources')
 
 
+def _sync_assets(model, docs, user, school, title_default, build_defaults):
+    """
+    Upsert Firestore docs into a school-scoped asset model by title.
+
+    One SELECT for every title involved, then one bulk_update and one
+    bulk_create, instead of a SELECT plus a save() per document.
+
+    Returns:
+        Tuple of (created_count, updated_count)
+    """
+    from content.file_validators import UploadRateLimiter
+
+    existing_by_title = {}
+    titles = {doc.get('title', '') for doc in docs}
+    for obj in model.objects.filter(title__in=titles, school=school):
+        # Newest first (model ordering), matching the old .first()
+        existing_by_title.setdefault(obj.title, obj)
+
+    to_update = {}
+    to_create = []
+    update_fields = {'updated_at'}
+    owner_ids = {user.pk}
+    now = timezone.now()
+    for doc in docs:
+        defaults = build_defaults(doc)
+        existing = existing_by_title.get(doc.get('title', ''))
+        if existing:
+            owner_ids.add(existing.owner_id)
+            for key, value in defaults.items():
+                if value is not None:
+                    setattr(existing, key, value)
+                    update_fields.add(key)
+            existing.updated_at = now
+            # A repeated title edits the pending row instead of inserting twice
+            if not existing._state.adding:
+                to_update[existing.pk] = existing
+            logger.info(f"Updated {model._meta.verbose_name}: {existing.title}")
+        else:
+            obj = model(title=doc.get('title', title_default), **defaults)
+            to_create.append(obj)
+            existing_by_title.setdefault(obj.title, obj)
+            logger.info(f"Created {model._meta.verbose_name}: {obj.title}")
+
+    model.objects.bulk_update(list(to_update.values()), sorted(update_fields), batch_size=SYNC_BULK_BATCH_SIZE)
+    model.objects.bulk_create(to_create, batch_size=SYNC_BULK_BATCH_SIZE)
+
+    # Bulk writes skip post_save, which normally drops the cached quotas
+    for owner_id in owner_ids:
+        UploadRateLimiter.invalidate_storage_usage(owner_id)
+
+    return len(to_create), len(docs) - len(to_create)
+
+
+def _sync_asset_pages(model, collection_name, user, school, title_default, build_defaults):
+    """
+    Run _sync_assets over a collection one page at a time.
+
+    Each page is written before the next is read, so a title repeated on a
+    later page finds the row the earlier page created.
+
+    Returns:
+        Tuple of (created_count, updated_count)
+    """
+    created = 0
+    updated = 0
+    pages = iter_document_pages(collection_name)
+    while True:
+        # Read failures end the sync like an empty collection; DB errors raise
+        try:
+            page = next(pages, None)
+        except Exception as e:
+            logger.error(f"Error fetching documents from '{collection_name}': {e}")
+            break
+        if page is None:
+            break
+        page_created, page_updated = _sync_assets(
+            model, page, user, school, title_default, build_defaults
+        )
+        created += page_created
+        updated += page_updated
+    return created, updated
+
+
 def sync_videos_to_django(user, school):
     """
     Sync videos from Firestore to Django VideoAsset model
@@ -743,20 +1373,8 @@ def sync_videos_to_django(user, school):
     """
     from content.models import VideoAsset
     
-    videos = get_videos()
-    created = 0
-    updated = 0
-    
-    for video_data in videos:
-        firestore_id = video_data.get('id')
-        
-        # Check if video already exists (by matching title or creating a mapping)
-        existing = VideoAsset.objects.filter(
-            title=video_data.get('title', ''),
-            school=school
-        ).first()
-        
-        defaults = {
+    def build_defaults(video_data):
+        return {
             'description': video_data.get('description', ''),
             'storage_uri': video_data.get('fileUrl', ''),
             'thumbnail_uri': video_data.get('thumbnailUrl', ''),
@@ -768,23 +1386,8 @@ def sync_videos_to_django(user, school):
             'grade': '5',  # Default grade
             'topic': 'fractions_basics',  # Default topic
         }
-        
-        if existing:
-            for key, value in defaults.items():
-                if value is not None:
-                    setattr(existing, key, value)
-            existing.save()
-            updated += 1
-            logger.info(f"Updated video: {existing.title}")
-        else:
-            video = VideoAsset.objects.create(
-                title=video_data.get('title', 'Untitled Video'),
-                **defaults
-            )
-            created += 1
-            logger.info(f"Created video: {video.title}")
     
-    return created, updated
+    return _sync_asset_pages(VideoAsset, 'videos', user, school, 'Untitled Video', build_defaults)
 
 
 def sync_resources_to_django(user, school):
@@ -800,10 +1403,6 @@ def sync_resources_to_django(user, school):
     """
     from content.models import Resource
     
-    resources = get_resources()
-    created = 0
-    updated = 0
-    
     # File type mapping from FireCMS to Django
     type_mapping = {
         'pdf': 'pdf',
@@ -813,43 +1412,18 @@ def sync_resources_to_django(user, school):
         'doc': 'doc',
     }
     
-    for resource_data in resources:
-        firestore_id = resource_data.get('id')
-        
-        existing = Resource.objects.filter(
-            title=resource_data.get('title', ''),
-            school=school
-        ).first()
-        
-        file_type = resource_data.get('fileType', 'pdf')
-        file_type = type_mapping.get(file_type, 'pdf')
-        
-        defaults = {
+    def build_defaults(resource_data):
+        return {
             'description': resource_data.get('description', ''),
             'file_uri': resource_data.get('fileUrl', ''),
-            'file_type': file_type,
+            'file_type': type_mapping.get(resource_data.get('fileType', 'pdf'), 'pdf'),
             'file_size': resource_data.get('fileSize'),
             'status': 'PUBLISHED',
             'owner': user,
             'school': school,
         }
-        
-        if existing:
-            for key, value in defaults.items():
-                if value is not None:
-                    setattr(existing, key, value)
-            existing.save()
-            updated += 1
-            logger.info(f"Updated resource: {existing.title}")
-        else:
-            resource = Resource.objects.create(
-                title=resource_data.get('title', 'Untitled Resource'),
-                **defaults
-            )
-            created += 1
-            logger.info(f"Created resource: {resource.title}")
     
-    return created, updated
+    return _sync_asset_pages(Resource, 'resources', user, school, 'Untitled Resource', build_defaults)
 
 
 def sync_activities_to_django(user, school):
@@ -863,27 +1437,60 @@ def sync_activities_to_django(user, school):
     Returns:
         Tuple of (created_count, updated_count)
     """
+    from content.community_views import invalidate_form_context_cache
     from content.models import Activity, VideoAsset, Resource
     from django.utils.text import slugify
     
+    # A sync is an explicit "pull what the CMS has now": skip the list cache
+    invalidate('activities')
     activities = get_published_activities()
     created = 0
     updated = 0
+
+    # Resolve every referenced video/resource title in one query each; the
+    # newest match wins, as .first() did under the models' -created_at ordering
+    video_titles = set()
+    resource_titles = set()
+    for activity_data in activities:
+        video_titles.update(_ref_titles(activity_data.get('videos', [])))
+        resource_titles.update(_ref_titles(activity_data.get('resources', [])))
+    videos_by_title = {}
+    for video_obj in VideoAsset.objects.filter(title__in=video_titles, school=school):
+        videos_by_title.setdefault(video_obj.title, video_obj)
+    resources_by_title = {}
+    for resource_obj in Resource.objects.filter(title__in=resource_titles, school=school):
+        resources_by_title.setdefault(resource_obj.title, resource_obj)
+
+    # Slug uniqueness and activity numbering look at the whole (small, curated)
+    # activity table, so load it once and keep the indexes current in memory.
+    # Per-grade counts come from the same rows: no COUNT query per activity.
+    # Only the lookup columns are read; every other field that is written back
+    # is assigned below before bulk_update reads it.
+    by_slug = {}
+    by_title = {}
+    grade_counts = defaultdict(int)
+    for activity in Activity.objects.only('id', 'slug', 'title', 'grade', 'video_asset'):
+        by_slug[activity.slug] = activity
+        by_title.setdefault(activity.title, activity)
+        grade_counts[activity.grade] += 1
+
+    to_update = {}
+    to_create = []
+    resource_links = []
+    now = timezone.now()
     
     for activity_data in activities:
-        firestore_id = activity_data.get('id')
         title = activity_data.get('title', 'Untitled Activity')
         slug = slugify(title)
         
         # Ensure unique slug
         base_slug = slug
         counter = 1
-        while Activity.objects.filter(slug=slug).exclude(title=title).exists():
+        while slug in by_slug and by_slug[slug].title != title:
             slug = f"{base_slug}-{counter}"
             counter += 1
         
-        existing = Activity.objects.filter(slug=slug).first() or \
-                   Activity.objects.filter(title=title).first()
+        existing = by_slug.get(slug) or by_title.get(title)
         
         # Get grade levels - convert numbers to string format
         grade_levels = activity_data.get('gradeLevel', [5])
@@ -903,7 +1510,7 @@ def sync_activities_to_django(user, school):
             'title': title,
             'slug': slug,
             'description': activity_data.get('description', ''),
-            'activity_number': len(Activity.objects.filter(grade=grade)) + 1,
+            'activity_number': grade_counts[grade] + 1,
             'grade': grade,
             'topics': topics,
             'location': location,
@@ -918,40 +1525,78 @@ def sync_activities_to_django(user, school):
         }
         
         if existing:
+            grade_counts[existing.grade] -= 1
+            grade_counts[grade] += 1
             for key, value in defaults.items():
                 if key != 'slug' or not existing.slug:  # Don't overwrite existing slug
                     setattr(existing, key, value)
-            existing.save()
+            existing.updated_at = now
             activity = existing
+            if not activity._state.adding:
+                to_update[activity.pk] = activity
             updated += 1
             logger.info(f"Updated activity: {activity.title}")
         else:
-            activity = Activity.objects.create(**defaults)
+            activity = Activity(**defaults)
+            to_create.append(activity)
+            by_slug[activity.slug] = activity
+            by_title.setdefault(activity.title, activity)
+            grade_counts[grade] += 1
             created += 1
             logger.info(f"Created activity: {activity.title}")
         
-        # Link videos if they exist
-        videos_data = activity_data.get('videos', [])
-        for video_ref in videos_data:
-            if isinstance(video_ref, dict):
-                video_title = video_ref.get('title', '')
-                video_obj = VideoAsset.objects.filter(title=video_title, school=school).first()
-                if video_obj and not activity.video_asset:
+        # Link the first referenced video that exists
+        if not activity.video_asset_id:
+            for video_title in _ref_titles(activity_data.get('videos', [])):
+                video_obj = videos_by_title.get(video_title)
+                if video_obj:
                     activity.video_asset = video_obj
-                    activity.save()
+                    break
         
         # Link resources if they exist
-        resources_data = activity_data.get('resources', [])
-        for resource_ref in resources_data:
-            if isinstance(resource_ref, dict):
-                resource_title = resource_ref.get('title', '')
-                resource_obj = Resource.objects.filter(title=resource_title, school=school).first()
-                if resource_obj:
-                    activity.teacher_resources.add(resource_obj)
+        resource_links.extend(
+            (activity.pk, resources_by_title[title].pk)
+            for title in _ref_titles(activity_data.get('resources', []))
+            if title in resources_by_title
+        )
+    
+    Activity.objects.bulk_update(
+        list(to_update.values()), ACTIVITY_SYNC_UPDATE_FIELDS, batch_size=SYNC_BULK_BATCH_SIZE
+    )
+    Activity.objects.bulk_create(to_create, batch_size=SYNC_BULK_BATCH_SIZE)
+    
+    Link = Activity.teacher_resources.through
+    Link.objects.bulk_create(
+        [Link(activity_id=a_id, resource_id=r_id) for a_id, r_id in set(resource_links)],
+        batch_size=SYNC_BULK_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    
+    # Bulk writes skip post_save, which normally drops this cache
+    invalidate_form_context_cache()
+    
+    # Keep the normalized fields behind ACTIVITY_SERVER_FILTERS current
+    try:
+        backfill_activity_search_fields(activities)
+    except Exception as e:
+        logger.warning(f"Failed to backfill activity search fields: {e}")
     
     return created, updated
 
 
+def _ref_titles(refs: List[Any]) -> List[str]:
+    """Titles of the {title: ...} reference dicts an activity embeds."""
+    return [ref.get('title', '') for ref in refs if isinstance(ref, dict)]
+
+
+def _run_sync_stage(sync_func: Callable[..., Tuple[int, int]], user, school) -> Tuple[int, int]:
+    """Run one sync_* stage on a worker thread and release its DB connection."""
+    try:
+        return sync_func(user, school)
+    finally:
+        db_connection.close()
+
+
 def full_sync(user, school):
     """
     Perform a full sync of all Firestore content to Django
@@ -971,15 +1616,17 @@ def full_sync(user, school):
         'activities': {'created': 0, 'updated': 0},
     }
 
-    # Sync videos first (activities reference them)
-    v_created, v_updated = sync_videos_to_django(user, school)
-    results['videos'] = {'created': v_created, 'updated': v_updated}
-
-    # Sync resources
-    r_created, r_updated = sync_resources_to_django(user, school)
-    results['resources'] = {'created': r_created, 'updated': r_updated}
+    # Videos and resources are independent: fetch and write them concurrently
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='firestore-sync') as executor:
+        stages = {
+            executor.submit(_run_sync_stage, sync_videos_to_django, user, school): 'videos',
+            executor.submit(_run_sync_stage, sync_resources_to_django, user, school): 'resources',
+        }
+        for future in as_completed(stages):
+            created, updated = future.result()
+            results[stages[future]] = {'created': created, 'updated': updated}
 
-    # Sync activities last
+    # Sync activities last (they link to the videos and resources above)
     a_created, a_updated = sync_activities_to_django(user, school)
     results['activities'] = {'created': a_created, 'updated': a_updated}
 
@@ -1026,7 +1673,7 @@ def create_or_update_user_profile(firebase_uid: str, user_data: Dict[str, Any])
         True if successful, False otherwise
     """
     try:
-        db = get_firestore_client()
+        db = get_firestore_write_client()
         db.collection('users').document(firebase_uid).set(user_data, merge=True)
         logger.info(f"Synced user profile to Firestore: {firebase_uid}")
         return True
@@ -1047,9 +1694,10 @@ def create_community_post(post_id: str, post_data: Dict[str, Any]) -> bool:
         True if successful, False otherwise
     """
     try:
-        db = get_firestore_client()
+        db = get_firestore_write_client()
         db.collection('communityPosts').document(str(post_id)).set(post_data)
         logger.info(f"Created community post in Firestore: {post_id}")
+        _increment_category_count(db, post_data.get('category'), 1)
         return True
     except Exception as e:
         logger.error(f"Failed to create community post in Firestore: {e}")
@@ -1058,7 +1706,9 @@ def create_community_post(post_id: str, post_data: Dict[str, Any]) -> bool:
 
 def add_comment_to_post(post_id: str, comment_id: str, comment_data: Dict[str, Any]) -> bool:
     """
-    Add comment to Firestore post's comments subcollection
+    Add comment to Firestore post's comments subcollection, together with the
+    post's commentCount/lastActivityAt and the parent's replyCount, in one
+    atomic WriteBatch.
 
     Args:
         post_id: Django post ID
@@ -1069,8 +1719,28 @@ def add_comment_to_post(post_id: str, comment_id: str, comment_data: Dict[str, A
         True if successful, False otherwise
     """
     try:
-        db = get_firestore_client()
-        db.collection('communityPosts').document(str(post_id)).collection('comments').document(str(comment_id)).set(comment_data)
+        db = get_firestore_write_client()
+        post_ref = db.collection('communityPosts').document(str(post_id))
+        comments_ref = post_ref.collection('comments')
+
+        batch = db.batch()
+        batch.set(comments_ref.document(str(comment_id)), comment_data)
+        # update() - the whole batch fails if the post itself is missing
+        batch.update(post_ref, {
+            'commentCount': firestore.Increment(1),
+            'lastActivityAt': comment_data.get('createdAt') or timezone.now(),
+        })
+        parent_id = comment_data.get('parentCommentId')
+        if parent_id:
+            # merge so a parent that never synced cannot fail the batch
+            batch.set(
+                comments_ref.document(str(parent_id)),
+                {'replyCount': firestore.Increment(1)},
+                merge=True,
+            )
+        batch.commit()
+
+        invalidate_document_cache('communityPosts', post_id)
         logger.info(f"Added comment {comment_id} to post {post_id} in Firestore")
         return True
     except Exception as e:
@@ -1090,8 +1760,9 @@ def update_community_post(post_id: str, updates: Dict[str, Any]) -> bool:
         True if successful, False otherwise
     """
     try:
-        db = get_firestore_client()
+        db = get_firestore_write_client()
         db.collection('communityPosts').document(str(post_id)).update(updates)
+        invalidate_document_cache('communityPosts', post_id)
         logger.info(f"Updated community post in Firestore: {post_id}")
         return True
     except Exception as e:
@@ -1110,20 +1781,94 @@ def delete_community_post(post_id: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        db = get_firestore_client()
-        # Delete all comments in subcollection first
-        comments_ref = db.collection('communityPosts').document(str(post_id)).collection('comments')
-        for comment in comments_ref.stream():
-            comment.reference.delete()
+        db = get_firestore_write_client()
+        post_ref = db.collection('communityPosts').document(str(post_id))
+        post_doc = post_ref.get()
+        # Delete all comments in subcollection first: list references only
+        # (no comment bodies) and delete them through one BulkWriter
+        writer = db.bulk_writer()
+        try:
+            for comment_ref in post_ref.collection('comments').list_documents():
+                writer.delete(comment_ref)
+        finally:
+            writer.close()
         # Delete the post document
-        db.collection('communityPosts').document(str(post_id)).delete()
+        post_ref.delete()
+        invalidate_document_cache('communityPosts', post_id)
         logger.info(f"Deleted community post from Firestore: {post_id}")
+        if post_doc.exists:
+            _increment_category_count(db, (post_doc.to_dict() or {}).get('category'), -1)
         return True
     except Exception as e:
         logger.error(f"Failed to delete community post from Firestore: {e}")
         return False
 
 
+# Outcomes of soft_delete_comment
+COMMENT_DELETED = 'deleted'
+COMMENT_NOT_FOUND = 'not_found'
+COMMENT_FORBIDDEN = 'forbidden'
+COMMENT_DELETE_FAILED = 'failed'
+
+
+def soft_delete_comment(
+    post_id: str,
+    comment_id: str,
+    expected_author_id: Optional[str] = None,
+) -> str:
+    """
+    Soft delete a comment and adjust the post/parent counters in one
+    transaction (one read, one commit).
+
+    Args:
+        post_id: Firestore post ID
+        comment_id: Firestore comment ID
+        expected_author_id: If set, only delete when the comment's authorId
+            matches (the author path needs no separate permission read)
+
+    Returns:
+        One of COMMENT_DELETED, COMMENT_NOT_FOUND, COMMENT_FORBIDDEN,
+        COMMENT_DELETE_FAILED
+    """
+    try:
+        db = get_firestore_write_client()
+        post_ref = db.collection('communityPosts').document(str(post_id))
+        comments_ref = post_ref.collection('comments')
+        comment_ref = comments_ref.document(str(comment_id))
+
+        @firestore.transactional
+        def _soft_delete(transaction):
+            snapshot = comment_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return COMMENT_NOT_FOUND
+            comment_data = snapshot.to_dict() or {}
+            if expected_author_id is not None and comment_data.get('authorId') != expected_author_id:
+                return COMMENT_FORBIDDEN
+            if comment_data.get('isDeleted'):
+                # Already deleted - counters were adjusted the first time
+                return COMMENT_DELETED
+
+            transaction.update(comment_ref, {'isDeleted': True})
+            transaction.update(post_ref, {'commentCount': firestore.Increment(-1)})
+            parent_id = comment_data.get('parentCommentId')
+            if parent_id:
+                transaction.set(
+                    comments_ref.document(str(parent_id)),
+                    {'replyCount': firestore.Increment(-1)},
+                    merge=True,
+                )
+            return COMMENT_DELETED
+
+        result = _soft_delete(db.transaction())
+        if result == COMMENT_DELETED:
+            invalidate_document_cache('communityPosts', post_id)
+            logger.info(f"Soft deleted comment {comment_id} in Firestore")
+        return result
+    except Exception as e:
+        logger.error(f"Failed to delete comment from Firestore: {e}")
+        return COMMENT_DELETE_FAILED
+
+
 def delete_comment(post_id: str, comment_id: str) -> bool:
     """
     Soft delete comment in Firestore (mark as deleted)
@@ -1135,11 +1880,4 @@ def delete_comment(post_id: str, comment_id: str) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    try:
-        db = get_firestore_client()
-        db.collection('communityPosts').document(str(post_id)).collection('comments').document(str(comment_id)).update({'isDeleted': True})
-        logger.info(f"Soft deleted comment {comment_id} in Firestore")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to delete comment from Firestore: {e}")
-        return False
+    return soft_delete_comment(post_id, comment_id) == COMMENT_DELETED
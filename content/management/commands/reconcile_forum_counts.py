@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from content.models import ForumCategory, ForumPost, ForumComment
+from content import firestore_service
+
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized community forum counters (run nightly to correct drift)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--firestore',
+            action='store_true',
+            help='Also rebuild the Firestore communityMeta/categoryCounts document',
+        )
+
+    def handle(self, *args, **options):
+        post_counts = ForumPost.objects.filter(
+            category=OuterRef('pk')
+        ).order_by().values('category').annotate(c=Count('pk')).values('c')
+
+        categories_updated = ForumCategory.objects.update(
+            post_count=Coalesce(Subquery(post_counts), Value(0))
+        )
+
+        comment_counts = ForumComment.objects.filter(
+            post=OuterRef('pk'), is_deleted=False
+        ).order_by().values('post').annotate(c=Count('pk')).values('c')
+
+        posts_updated = ForumPost.objects.update(
+            comment_count=Coalesce(Subquery(comment_counts), Value(0))
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ Reconciled post counts for {categories_updated} categories '
+                f'and comment counts for {posts_updated} posts'
+            )
+        )
+
+        if options['firestore']:
+            counts = firestore_service.rebuild_community_category_counts()
+            self.stdout.write(
+                self.style.SUCCESS(f'✅ Rebuilt Firestore category counts for {len(counts)} categories')
+            )
@@ -116,6 +116,11 @@ class Command(BaseCommand):
                 self.stdout.write(f"  Created: [{item['location']}] {item['label']}")
             created += 1
 
+        if not dry_run:
+            from django.core.cache import cache
+            from content.menu_service import MENU_CACHE_KEY
+            cache.delete(MENU_CACHE_KEY)
+
         self.stdout.write(self.style.SUCCESS(f'  Menu items: {created} items'))
 
     def seed_site_config(self, db, clear, dry_run):
@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 # Cache TTL in seconds (5 minutes default - menus change infrequently)
 MENU_CACHE_TTL = getattr(settings, 'MENU_CACHE_TTL', 300)
 
+# Header and footer share one cache entry so a page render is a single cache read
+MENU_CACHE_KEY = 'menu:all:v1'
+
 
 def _get_firestore_client():
     """Get Firestore client - reuse from firestore_service"""
@@ -186,8 +189,7 @@ def get_menus() -> Dict[str, List[Dict[str, Any]]]:
     """
     Get both header and footer menus using one cache entry/read path.
     """
-    cache_key = 'menu:all'
-    cached = cache.get(cache_key)
+    cached = cache.get(MENU_CACHE_KEY)
     if cached is not None:
         return cached
 
@@ -198,7 +200,7 @@ def get_menus() -> Dict[str, List[Dict[str, Any]]]:
     if not menus.get('footer'):
         menus['footer'] = _get_fallback_footer_menu()
 
-    cache.set(cache_key, menus, MENU_CACHE_TTL)
+    cache.set(MENU_CACHE_KEY, menus, MENU_CACHE_TTL)
     return menus
 
 
@@ -209,25 +211,7 @@ def get_header_menu() -> List[Dict[str, Any]]:
     Returns:
         List of menu items with nested children
     """
-    cache_key = 'menu:header'
-
-    # Try cache first
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    # Prefer shared menu cache to avoid duplicate Firestore reads per request
-    menus = get_menus()
-    menu_items = menus.get('header', [])
-
-    # Use fallback if empty
-    if not menu_items:
-        logger.warning("Using fallback header menu - Firestore unavailable or empty")
-        menu_items = _get_fallback_header_menu()
-
-    # Cache and return
-    cache.set(cache_key, menu_items, MENU_CACHE_TTL)
-    return menu_items
+    return get_menus()['header']
 
 
 def get_footer_menu() -> List[Dict[str, Any]]:
@@ -237,25 +221,7 @@ def get_footer_menu() -> List[Dict[str, Any]]:
     Returns:
         List of menu items with nested children
     """
-    cache_key = 'menu:footer'
-
-    # Try cache first
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    # Prefer shared menu cache to avoid duplicate Firestore reads per request
-    menus = get_menus()
-    menu_items = menus.get('footer', [])
-
-    # Use fallback if empty
-    if not menu_items:
-        logger.warning("Using fallback footer menu - Firestore unavailable or empty")
-        menu_items = _get_fallback_footer_menu()
-
-    # Cache and return
-    cache.set(cache_key, menu_items, MENU_CACHE_TTL)
-    return menu_items
+    return get_menus()['footer']
 
 
 def _get_fallback_header_menu() -> List[Dict[str, Any]]:
@@ -277,13 +243,9 @@ def refresh_menu_cache():
     Force refresh all menu caches
     Call this when menus have changed in CMS
     """
-    cache.delete('menu:header')
-    cache.delete('menu:footer')
-    cache.delete('menu:all')
+    cache.delete(MENU_CACHE_KEY)
 
-    # Pre-populate caches
+    # Pre-populate cache
     get_menus()
-    get_header_menu()
-    get_footer_menu()
 
     logger.info("Menu caches refreshed")
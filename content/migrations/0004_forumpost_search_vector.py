@@ -0,0 +1,60 @@
+# Generated by Django 5.1.1 on 2026-10-16 23:14
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+SEARCH_VECTOR_FORWARD_SQL = [
+    """
+    CREATE INDEX IF NOT EXISTS content_forumpost_search_vector_gin
+        ON content_forumpost USING gin (search_vector)
+    """,
+    """
+    CREATE TRIGGER content_forumpost_search_vector_update
+        BEFORE INSERT OR UPDATE OF title, content ON content_forumpost
+        FOR EACH ROW EXECUTE FUNCTION
+        tsvector_update_trigger(search_vector, 'pg_catalog.english', title, content)
+    """,
+    """
+    UPDATE content_forumpost
+        SET search_vector = to_tsvector(
+            'pg_catalog.english', coalesce(title, '') || ' ' || coalesce(content, '')
+        )
+    """,
+]
+
+SEARCH_VECTOR_REVERSE_SQL = [
+    'DROP TRIGGER IF EXISTS content_forumpost_search_vector_update ON content_forumpost',
+    'DROP INDEX IF EXISTS content_forumpost_search_vector_gin',
+]
+
+
+def create_search_vector_trigger(apps, schema_editor):
+    """GIN index + tsvector trigger; PostgreSQL only (SQLite keeps icontains search)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in SEARCH_VECTOR_FORWARD_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_vector_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in SEARCH_VECTOR_REVERSE_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0003_forumcategory_forumpost_forumcomment_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forumpost',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_vector_trigger, drop_search_vector_trigger),
+    ]
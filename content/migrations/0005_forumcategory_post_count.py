@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-16 23:18
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_post_counts(apps, schema_editor):
+    ForumCategory = apps.get_model('content', 'ForumCategory')
+    ForumPost = apps.get_model('content', 'ForumPost')
+    counts = ForumPost.objects.exclude(category=None).values('category').annotate(c=Count('pk'))
+    for row in counts:
+        ForumCategory.objects.filter(pk=row['category']).update(post_count=row['c'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0004_forumpost_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forumcategory',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_post_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.1 on 2026-10-16 23:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_tree_paths(apps, schema_editor):
+    """Populate tree_path for existing comments (parents always predate replies)."""
+    ForumComment = apps.get_model('content', 'ForumComment')
+    paths = {}
+    comments = ForumComment.objects.order_by('created_at').only(
+        'id', 'parent_comment_id', 'created_at'
+    )
+    for comment in comments.iterator():
+        micros = int(comment.created_at.timestamp() * 1_000_000)
+        parent_path = paths.get(comment.parent_comment_id, '')
+        paths[comment.id] = f"{parent_path}/{micros:014x}{comment.id.hex[:4]}"
+        ForumComment.objects.filter(pk=comment.pk).update(tree_path=paths[comment.id])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0005_forumcategory_post_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forumcomment',
+            name='tree_path',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='forumcomment',
+            index=models.Index(fields=['post', 'tree_path'], name='content_for_post_id_518ea4_idx'),
+        ),
+        migrations.RunPython(backfill_tree_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-16 23:27
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_comment_counts(apps, schema_editor):
+    ForumPost = apps.get_model('content', 'ForumPost')
+    ForumComment = apps.get_model('content', 'ForumComment')
+    counts = ForumComment.objects.filter(is_deleted=False).values('post').annotate(c=Count('pk'))
+    for row in counts:
+        ForumPost.objects.filter(pk=row['post']).update(comment_count=row['c'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0006_forumcomment_tree_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forumpost',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Denormalized count of non-deleted comments (see content.signals)'),
+        ),
+        migrations.RunPython(backfill_comment_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.1 on 2026-10-17 00:22
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+SEARCH_VECTOR_TABLES = ('content_videoasset', 'content_resource')
+
+
+def _forward_sql(table):
+    return [
+        f"""
+        CREATE INDEX IF NOT EXISTS {table}_search_vector_gin
+            ON {table} USING gin (search_vector)
+        """,
+        f"""
+        CREATE TRIGGER {table}_search_vector_update
+            BEFORE INSERT OR UPDATE OF title, description ON {table}
+            FOR EACH ROW EXECUTE FUNCTION
+            tsvector_update_trigger(search_vector, 'pg_catalog.english', title, description)
+        """,
+        f"""
+        UPDATE {table}
+            SET search_vector = to_tsvector(
+                'pg_catalog.english', coalesce(title, '') || ' ' || coalesce(description, '')
+            )
+        """,
+    ]
+
+
+def _reverse_sql(table):
+    return [
+        f'DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}',
+        f'DROP INDEX IF EXISTS {table}_search_vector_gin',
+    ]
+
+
+def create_search_vector_triggers(apps, schema_editor):
+    """GIN index + tsvector trigger; PostgreSQL only (SQLite keeps icontains search)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in SEARCH_VECTOR_TABLES:
+        for sql in _forward_sql(table):
+            schema_editor.execute(sql)
+
+
+def drop_search_vector_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in SEARCH_VECTOR_TABLES:
+        for sql in _reverse_sql(table):
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0007_forumpost_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resource',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='videoasset',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_vector_triggers, drop_search_vector_triggers),
+    ]
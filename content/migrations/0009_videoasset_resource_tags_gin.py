@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+TAGS_INDEX_TABLES = ('content_videoasset', 'content_resource')
+
+
+def create_tags_indexes(apps, schema_editor):
+    """
+    GIN index over the lower-cased tag array so filter_tags' ``?|`` lookup is
+    an index scan; PostgreSQL only (SQLite keeps icontains matching).
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TAGS_INDEX_TABLES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_tags_lower_gin '
+            f'ON {table} USING gin ((lower(tags::text)::jsonb))'
+        )
+
+
+def drop_tags_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TAGS_INDEX_TABLES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_tags_lower_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0008_videoasset_resource_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_tags_indexes, drop_tags_indexes),
+    ]
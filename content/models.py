@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
+from django.utils import timezone
 from accounts.models import School
 import uuid
 
@@ -131,6 +133,10 @@ class VideoAsset(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Full-text search (PostgreSQL only). Populated by a database trigger on
+    # title/description and backed by a GIN index - see migration 0008.
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Video Asset'
@@ -288,6 +294,9 @@ class Resource(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Full-text search (PostgreSQL only) - see migration 0008
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Resource'
@@ -742,6 +751,9 @@ class ForumCategory(models.Model):
     order = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
     
+    # Denormalized counter maintained by content.signals
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -781,6 +793,10 @@ class ForumPost(models.Model):
     
     # Engagement
     view_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False,
+        help_text="Denormalized count of non-deleted comments (see content.signals)"
+    )
     is_pinned = models.BooleanField(default=False, help_text="Pin to top of list")
     is_locked = models.BooleanField(default=False, help_text="Prevent new comments")
     
@@ -789,6 +805,10 @@ class ForumPost(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     last_activity_at = models.DateTimeField(auto_now_add=True, help_text="Last comment or update time")
     
+    # Full-text search (PostgreSQL only). Populated by a database trigger on
+    # title/content and backed by a GIN index - see migration 0004.
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         ordering = ['-is_pinned', '-last_activity_at']
         verbose_name = 'Forum Post'
@@ -827,6 +847,13 @@ class ForumComment(models.Model):
     # Moderation
     is_deleted = models.BooleanField(default=False)
     
+    # Materialized path ("/<seg>/<seg>..."), one fixed-width, time-ordered
+    # segment per ancestor. Ordering by it yields depth-first thread order.
+    tree_path = models.CharField(max_length=255, blank=True, editable=False)
+    
+    # Deepest reply tree_path can hold: 19-char segments, (depth + 1) of them
+    MAX_DEPTH = 12
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -838,11 +865,31 @@ class ForumComment(models.Model):
         indexes = [
             models.Index(fields=['post', 'created_at']),
             models.Index(fields=['author', 'created_at']),
+            models.Index(fields=['post', 'tree_path']),
         ]
     
     def __str__(self):
         return f"Comment by {self.author.get_full_name()} on {self.post.title}"
     
+    @staticmethod
+    def build_tree_path(parent_path, created_at, comment_id):
+        """Append a sortable segment (microsecond timestamp + id prefix) to parent_path"""
+        micros = int(created_at.timestamp() * 1_000_000)
+        return f"{parent_path or ''}/{micros:014x}{comment_id.hex[:4]}"
+    
+    def save(self, *args, **kwargs):
+        if not self.tree_path:
+            parent_path = self.parent_comment.tree_path if self.parent_comment_id else ''
+            self.tree_path = self.build_tree_path(
+                parent_path, self.created_at or timezone.now(), self.id
+            )
+        super().save(*args, **kwargs)
+    
+    @property
+    def depth(self):
+        """0 for top-level comments, 1 for direct replies, ..."""
+        return max(self.tree_path.count('/') - 1, 0)
+    
     @property
     def author_name(self):
         return self.author.get_full_name() or self.author.username
@@ -0,0 +1,95 @@
+"""
+Signal handlers that keep denormalized community counters and caches in sync.
+"""
+from django.db.models import F
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from .file_validators import UploadRateLimiter
+from .models import Activity, ForumCategory, ForumPost, ForumComment, Resource, VideoAsset
+
+# Marks a field that was deferred when the instance was loaded
+_NOT_LOADED = object()
+
+
+def _adjust_counter(model, pk, field, delta, **also_set):
+    """F() += delta on one row (never below zero), plus any extra columns in the same UPDATE."""
+    if not pk:
+        return
+    rows = model.objects.filter(pk=pk)
+    if delta < 0:
+        rows = rows.filter(**{f'{field}__gte': -delta})
+    rows.update(**{field: F(field) + delta}, **also_set)
+
+
+@receiver(post_init, sender=ForumPost)
+def remember_post_category(sender, instance, **kwargs):
+    """Remember the loaded category so a re-categorised post moves its count."""
+    instance._loaded_category_id = instance.__dict__.get('category_id', _NOT_LOADED)
+
+
+@receiver(post_save, sender=ForumPost)
+def update_category_post_count_on_save(sender, instance, created, **kwargs):
+    previous = None if created else instance._loaded_category_id
+    if previous is not _NOT_LOADED and previous != instance.category_id:
+        _adjust_counter(ForumCategory, previous, 'post_count', -1)
+        _adjust_counter(ForumCategory, instance.category_id, 'post_count', 1)
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(post_delete, sender=ForumPost)
+def update_category_post_count_on_delete(sender, instance, **kwargs):
+    if instance._loaded_category_id is not _NOT_LOADED:
+        _adjust_counter(ForumCategory, instance._loaded_category_id, 'post_count', -1)
+
+
+@receiver(post_init, sender=ForumComment)
+def remember_comment_deleted(sender, instance, **kwargs):
+    """Remember the loaded soft-delete flag so toggling it moves the count."""
+    instance._loaded_is_deleted = instance.__dict__.get('is_deleted', _NOT_LOADED)
+
+
+@receiver(post_save, sender=ForumComment)
+def update_post_comment_count_on_save(sender, instance, created, **kwargs):
+    if instance._loaded_is_deleted is _NOT_LOADED:
+        return
+    was_visible = not created and not instance._loaded_is_deleted
+    is_visible = not instance.is_deleted
+    if created and is_visible:
+        # A new comment is post activity; bump both in one UPDATE
+        _adjust_counter(
+            ForumPost, instance.post_id, 'comment_count', 1,
+            last_activity_at=instance.created_at,
+        )
+    elif was_visible != is_visible:
+        _adjust_counter(ForumPost, instance.post_id, 'comment_count', 1 if is_visible else -1)
+    instance._loaded_is_deleted = instance.is_deleted
+
+
+def _deleting_post(origin):
+    """True when a delete() call on a ForumPost (instance or queryset) started the cascade."""
+    return isinstance(origin, ForumPost) or getattr(origin, 'model', None) is ForumPost
+
+
+@receiver(post_delete, sender=ForumComment)
+def update_post_comment_count_on_delete(sender, instance, origin=None, **kwargs):
+    # Comments cascaded from their post's deletion: the post row is going too
+    if _deleting_post(origin):
+        return
+    if instance._loaded_is_deleted is False:
+        _adjust_counter(ForumPost, instance.post_id, 'comment_count', -1)
+
+
+@receiver([post_save, post_delete], sender=ForumCategory)
+@receiver([post_save, post_delete], sender=Activity)
+def invalidate_community_form_context(sender, **kwargs):
+    """Categories/activities feed the cached create/edit post dropdowns."""
+    from .community_views import invalidate_form_context_cache
+    invalidate_form_context_cache()
+
+
+@receiver([post_save, post_delete], sender=VideoAsset)
+@receiver([post_save, post_delete], sender=Resource)
+def invalidate_storage_usage(sender, instance, **kwargs):
+    """Asset sizes feed the cached per-user storage quota."""
+    UploadRateLimiter.invalidate_storage_usage(instance.owner_id)
@@ -367,6 +367,36 @@ def get_all_taxonomy_categories() -> List[Dict[str, Any]]:
         ]
 
 
+def build_key_to_label(categories: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Flatten taxonomy categories into {value key: label}."""
+    return {
+        val['key']: val.get('label', val['key'])
+        for cat in categories
+        for val in cat.get('values', [])
+    }
+
+
+def get_key_to_label() -> Dict[str, str]:
+    """
+    Get {value key: label} across all active taxonomy categories
+
+    Cached alongside the categories, so filter matching is a dict lookup
+    rather than a rebuild from the category list on every query.
+
+    Returns:
+        Dict mapping taxonomy value keys to their display labels
+    """
+    cache_key = 'taxonomy:key_to_label'
+
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    key_to_label = build_key_to_label(get_all_taxonomy_categories())
+    cache.set(cache_key, key_to_label, TAXONOMY_CACHE_TTL)
+    return key_to_label
+
+
 def refresh_cache():
     """
     Force refresh all taxonomy caches
@@ -376,6 +406,7 @@ def refresh_cache():
     cache.delete('taxonomy:topics')
     cache.delete('taxonomy:courtTypes')
     cache.delete('taxonomy:all_categories')
+    cache.delete('taxonomy:key_to_label')
     cache.delete('taxonomy:community_categories')
 
     # Pre-populate caches
@@ -383,6 +414,7 @@ def refresh_cache():
     get_topics()
     get_court_types()
     get_all_taxonomy_categories()
+    get_key_to_label()
     get_community_categories()
 
     logger.info("Taxonomy caches refreshed")
@@ -1,12 +1,22 @@
+import io
+import uuid
+from datetime import timedelta
+
 import pytest
 from unittest.mock import patch, MagicMock
-from django.test import TestCase
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework import status
 from accounts.models import School
-from .models import VideoAsset, Resource, Playlist, PlaylistItem
+from .models import VideoAsset, Resource, Playlist, PlaylistItem, ForumCategory, ForumPost, ForumComment
 from .services import FirebaseStorageService
+from . import firebase_storage
+from .file_validators import FileValidator, UploadRateLimiter, sniff, validate_and_check_limits
 
 User = get_user_model()
 
@@ -97,6 +107,240 @@ class FirebaseStorageServiceTest(TestCase):
             self.service.generate_download_url('videos/2024/01/01/test.mp4')
 
 
+class StorageSignedUrlTest(TestCase):
+    """Test signed URL reuse in firebase_storage.FirebaseStorageService"""
+    
+    def setUp(self):
+        firebase_storage._signed_url_cache.clear()
+        self.service = firebase_storage.FirebaseStorageService.__new__(
+            firebase_storage.FirebaseStorageService
+        )
+        self.service.bucket = MagicMock()
+        self.service.signing_credentials = MagicMock()
+        blob = self.service.bucket.blob.return_value
+        blob.generate_signed_url.side_effect = lambda **kw: f"https://signed/{uuid.uuid4().hex}"
+        self.sign = blob.generate_signed_url
+    
+    def test_download_url_is_reused_within_a_slot(self):
+        """Test repeat requests in one slot return the same URL without re-signing"""
+        with patch.object(firebase_storage.time, 'time', return_value=1000.0):
+            first = self.service.generate_download_url('resources/a.pdf', 58)
+            self.assertEqual(self.service.generate_download_url('resources/a.pdf', 60), first)
+        self.assertEqual(self.sign.call_count, 1)
+        self.assertIs(self.sign.call_args.kwargs['credentials'], self.service.signing_credentials)
+        # Rounded up to 60 minutes, plus one slot so the reused URL never under-delivers
+        self.assertEqual(
+            self.sign.call_args.kwargs['expiration'],
+            timedelta(minutes=60, seconds=firebase_storage.SIGNED_URL_SLOT_SECONDS)
+        )
+        
+        with patch.object(firebase_storage.time, 'time',
+                          return_value=1000.0 + firebase_storage.SIGNED_URL_SLOT_SECONDS):
+            self.assertNotEqual(self.service.generate_download_url('resources/a.pdf'), first)
+        self.assertNotEqual(self.service.generate_download_url('resources/a.pdf', stable=False), first)
+    
+    def test_upload_url_validation_uses_the_static_tables(self):
+        """Test upload URLs reject unknown types and name files from the extension table"""
+        with self.assertRaises(ValueError):
+            self.service.generate_upload_url('video', 'image/png', 10, 1)
+        with self.assertRaises(ValueError):
+            self.service.generate_upload_url('lesson', 'application/pdf', 11 * 1024 * 1024, 1)
+        with self.assertRaises(ValueError):
+            self.service.generate_upload_url('podcast', 'audio/mpeg', 10, 1)
+        
+        with patch.object(firebase_storage.time, 'time', return_value=86400 * 20106 + 5):
+            _, file_path = self.service.generate_upload_url('video', 'video/quicktime', 10, 1)
+        folder, _, name = file_path.rpartition('/')
+        self.assertEqual(folder, 'videos/20106')
+        self.assertRegex(name, r'^[0-9a-f]{32}\.mov$')
+    
+    @patch('google.oauth2.service_account.Credentials.from_service_account_info')
+    @patch('google.cloud.storage.Client')
+    def test_client_session_gets_a_wide_connection_pool(self, client_cls, creds):
+        """Test the shared HTTP session is mounted with a sized adapter that does not retry"""
+        service = firebase_storage.FirebaseStorageService()
+        self.assertIs(service.signing_credentials, creds.return_value)
+        adapter = client_cls.return_value._http.mount.call_args.args[1]
+        self.assertEqual(adapter._pool_maxsize, firebase_storage.STORAGE_HTTP_POOL_SIZE)
+        self.assertEqual(adapter.max_retries.total, 0)
+    
+    def test_503_reaches_call_with_retry_as_retryable(self):
+        """Test a 503 surfaces as ServiceUnavailable, once per _call_with_retry attempt"""
+        import functools
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        from google.api_core.exceptions import ServiceUnavailable
+        from google.auth.credentials import AnonymousCredentials
+        from google.cloud import storage
+        
+        hits = []
+        
+        class Unavailable(BaseHTTPRequestHandler):
+            def do_DELETE(self):
+                hits.append(self.path)
+                self.send_response(503)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            
+            def log_message(self, *args):
+                pass
+        
+        server = HTTPServer(('127.0.0.1', 0), Unavailable)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        endpoint = f'http://127.0.0.1:{server.server_port}'
+        real_client = storage.Client
+        
+        def local_client(**kwargs):
+            return real_client(
+                credentials=AnonymousCredentials(), project='test',
+                client_options={'api_endpoint': endpoint},
+            )
+        
+        with patch('google.oauth2.service_account.Credentials.from_service_account_info'), \
+                patch('google.cloud.storage.Client', side_effect=local_client):
+            service = firebase_storage.FirebaseStorageService()
+        service.storage_client._http.mount('http://', service.storage_client._http.adapters['https://'])
+        
+        delete = functools.partial(service.bucket.blob('videos/a.mp4').delete, retry=None)
+        with patch.object(firebase_storage.time, 'sleep') as sleep, self.assertRaises(ServiceUnavailable):
+            firebase_storage._call_with_retry(delete)
+        self.assertEqual(len(hits), firebase_storage.STORAGE_OP_MAX_ATTEMPTS)
+        self.assertEqual(sleep.call_count, firebase_storage.STORAGE_OP_MAX_ATTEMPTS - 1)
+    
+    def test_bulk_urls_sign_each_distinct_path_once(self):
+        """Test bulk issuance dedupes paths and reuses already-cached URLs"""
+        cached = self.service.generate_download_url('resources/a.pdf')
+        urls = self.service.generate_download_urls_bulk(
+            ['resources/a.pdf', 'resources/b.pdf', 'resources/c.pdf', 'resources/b.pdf']
+        )
+        self.assertEqual(list(urls), ['resources/a.pdf', 'resources/b.pdf', 'resources/c.pdf'])
+        self.assertEqual(urls['resources/a.pdf'], cached)
+        self.assertEqual(self.sign.call_count, 3)
+    
+    def test_hydrate_urls_signs_only_bare_storage_paths(self):
+        """Test FirestoreVideo.hydrate_urls leaves full URLs untouched"""
+        from .firestore_adapters import FirestoreVideo
+        videos = [
+            FirestoreVideo(id='1', title='A', file_url='videos/a.mp4', thumbnail_url='https://cdn/a.png'),
+            FirestoreVideo(id='2', title='B', file_url='videos/b.mp4'),
+        ]
+        FirestoreVideo.hydrate_urls(videos, service=self.service)
+        self.assertTrue(videos[0].file_url.startswith('https://signed/'))
+        self.assertEqual(videos[0].thumbnail_url, 'https://cdn/a.png')
+        self.assertEqual(videos[1].thumbnail_url, '')
+        self.assertEqual(self.sign.call_count, 2)
+    
+    def test_activity_detail_signs_related_videos_in_one_batch(self):
+        """Test activity detail signs video paths together and falls back when signing fails"""
+        from .firestore_adapters import FirestoreVideo
+        from .v4_views import _hydrate_video_urls, get_storage_url
+        videos = [FirestoreVideo(id='1', title='A', file_url='videos/a.mp4', thumbnail_url='thumbs/a.png')]
+        with patch('content.firebase_storage.get_storage_service', return_value=self.service), \
+                patch.object(self.service, 'generate_download_urls_bulk',
+                             wraps=self.service.generate_download_urls_bulk) as bulk:
+            _hydrate_video_urls(videos)
+        bulk.assert_called_once_with(['videos/a.mp4', 'thumbs/a.png'], 120)
+        self.assertTrue(videos[0].file_url.startswith('https://signed/'))
+        
+        videos = [FirestoreVideo(id='2', title='B', file_url='videos/b.mp4')]
+        with patch('content.firebase_storage.get_storage_service', side_effect=RuntimeError('no creds')):
+            _hydrate_video_urls(videos)
+        self.assertEqual(videos[0].file_url, 'videos/b.mp4')
+        self.assertIn('?alt=media', get_storage_url(videos[0].file_url))
+    
+    def _listed(self, *names):
+        blobs = []
+        for name in names:
+            blob = MagicMock(size=10, content_type='application/pdf')
+            blob.name = name
+            blobs.append(blob)
+        return blobs
+    
+    def test_bulk_metadata_lists_each_folder_once(self):
+        """Test metadata for many files costs one listing per folder, not one GET per file"""
+        listings = {
+            'resources/20250118/': self._listed('resources/20250118/a.pdf', 'resources/20250118/other.pdf'),
+            'videos/20250118/': self._listed('videos/20250118/v.mp4'),
+        }
+        self.service.bucket.list_blobs.side_effect = lambda prefix, **kw: listings[prefix]
+        
+        metadata = self.service.get_files_metadata_bulk([
+            'resources/20250118/a.pdf', 'videos/20250118/v.mp4', 'videos/20250118/missing.mp4',
+        ])
+        self.assertEqual(set(metadata), {'resources/20250118/a.pdf', 'videos/20250118/v.mp4'})
+        self.assertEqual(metadata['videos/20250118/v.mp4']['size'], 10)
+        self.assertEqual(self.service.bucket.list_blobs.call_count, 2)
+        self.assertIn('nextPageToken', self.service.bucket.list_blobs.call_args.kwargs['fields'])
+        self.service.bucket.blob.return_value.reload.assert_not_called()
+    
+    def test_files_exist_lists_each_folder_once(self):
+        """Test bulk existence checks use one name-only listing per folder"""
+        self.service.bucket.list_blobs.side_effect = lambda prefix, **kw: self._listed(f"{prefix}a.pdf")
+        exists = self.service.files_exist(['resources/1/a.pdf', 'resources/1/b.pdf', 'videos/1/a.pdf'])
+        self.assertEqual(exists, {'resources/1/a.pdf': True, 'resources/1/b.pdf': False, 'videos/1/a.pdf': True})
+        self.assertEqual(self.service.bucket.list_blobs.call_count, 2)
+        self.assertEqual(self.service.bucket.list_blobs.call_args.kwargs['fields'], 'items(name),nextPageToken')
+        self.service.bucket.blob.return_value.exists.assert_not_called()
+    
+    @patch.object(firebase_storage.time, 'sleep')
+    def test_delete_retries_transient_errors(self, sleep):
+        """Test a delete that hits 503s is retried with backoff"""
+        from google.api_core.exceptions import NotFound, ServiceUnavailable
+        delete = self.service.bucket.blob.return_value.delete
+        delete.side_effect = [ServiceUnavailable('busy'), ServiceUnavailable('busy'), None]
+        self.assertTrue(self.service.delete_file('resources/a.pdf', wait=True))
+        self.assertEqual(delete.call_count, 3)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [1, 2])
+        
+        delete.side_effect = NotFound('gone')
+        self.assertFalse(self.service.delete_file('resources/a.pdf', wait=True))
+    
+    @patch.object(firebase_storage.time, 'sleep')
+    def test_delete_files_batches_and_retries_leftovers(self, sleep):
+        """Test bulk deletes go out in capped batches and leftovers are retried"""
+        self.service.storage_client = MagicMock()
+        listings = iter([self._listed('resources/1/p1.pdf'), [], []])
+        self.service.bucket.list_blobs.side_effect = lambda **kw: next(listings)
+        paths = [f'resources/1/p{i}.pdf' for i in range(firebase_storage.STORAGE_BATCH_MAX + 1)]
+        
+        self.assertTrue(self.service.delete_files(paths, wait=True))
+        # Two chunks, the first one sent twice because p1 survived
+        self.assertEqual(self.service.storage_client.batch.call_count, 3)
+        self.assertEqual(self.service.bucket.blob.return_value.delete.call_count, len(paths) + 1)
+        sleep.assert_called_once_with(1)
+    
+    def test_async_facade_awaits_the_sync_service(self):
+        """Test AsyncFirebaseStorageService returns the same cached URL off-loop"""
+        from asgiref.sync import async_to_sync
+        facade = firebase_storage.AsyncFirebaseStorageService(self.service)
+        url = async_to_sync(facade.generate_download_url)('resources/a.pdf')
+        self.assertEqual(url, self.service.generate_download_url('resources/a.pdf'))
+        bulk = async_to_sync(facade.generate_download_urls_bulk)(iter(['resources/a.pdf']))
+        self.assertEqual(bulk, {'resources/a.pdf': url})
+    
+    def test_metadata_skips_reload_when_blob_is_populated(self):
+        """Test get_file_metadata only reloads blobs that lack metadata"""
+        from google.cloud.storage import Blob
+        listed = self._listed('resources/1/a.pdf')[0]
+        self.assertEqual(self.service.get_file_metadata('resources/1/a.pdf', blob=listed)['size'], 10)
+        listed.reload.assert_not_called()
+        self.service.get_file_metadata('resources/1/a.pdf', force_refresh=True, blob=listed)
+        listed.reload.assert_called_once_with()
+        
+        fresh = Blob('resources/1/b.pdf', bucket=MagicMock())
+        with patch.object(Blob, 'reload') as reload:
+            self.service.get_file_metadata('resources/1/b.pdf', blob=fresh)
+        reload.assert_called_once_with()
+    
+    def test_delete_drops_cached_urls(self):
+        """Test deleting a file forgets its signed URLs"""
+        first = self.service.generate_download_url('resources/a.pdf')
+        self.service.delete_file('resources/a.pdf', wait=True)
+        self.assertNotEqual(self.service.generate_download_url('resources/a.pdf'), first)
+
+
 class ContentAPITest(APITestCase):
     """Test content API endpoints"""
     
@@ -126,4 +370,1016 @@ class ContentAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
         
         response = self.client.post('/api/uploads/sign/', {})
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ForumCounterTest(TestCase):
+    """Test denormalized community forum counters"""
+    
+    def setUp(self):
+        self.school = School.objects.create(name="Test School", domain="test")
+        self.teacher = User.objects.create_user(
+            username='teacher1',
+            email='teacher1@test.edu',
+            firebase_uid='teacher1_uid',
+            role='TEACHER',
+            school=self.school
+        )
+        self.general = ForumCategory.objects.create(name="General", slug="general")
+        self.ideas = ForumCategory.objects.create(name="Ideas", slug="ideas")
+    
+    def test_category_post_count_follows_posts(self):
+        """Test post_count tracks create, re-categorise and delete"""
+        post = ForumPost.objects.create(
+            title="Hello", slug="hello", content="Body",
+            author=self.teacher, category=self.general
+        )
+        self.general.refresh_from_db()
+        self.assertEqual(self.general.post_count, 1)
+        
+        post = ForumPost.objects.get(pk=post.pk)
+        post.category = self.ideas
+        post.save()
+        self.general.refresh_from_db()
+        self.ideas.refresh_from_db()
+        self.assertEqual(self.general.post_count, 0)
+        self.assertEqual(self.ideas.post_count, 1)
+        
+        post.delete()
+        self.ideas.refresh_from_db()
+        self.assertEqual(self.ideas.post_count, 0)
+    
+    def test_comment_tree_path_orders_threads_depth_first(self):
+        """Test replies sort directly under their parent by tree_path"""
+        post = ForumPost.objects.create(
+            title="Thread", slug="thread", content="Body", author=self.teacher
+        )
+        first = ForumComment.objects.create(post=post, author=self.teacher, content="first")
+        second = ForumComment.objects.create(post=post, author=self.teacher, content="second")
+        reply = ForumComment.objects.create(
+            post=post, author=self.teacher, content="reply", parent_comment=first
+        )
+        
+        ordered = list(post.comments.order_by('tree_path'))
+        self.assertEqual(ordered, [first, reply, second])
+        self.assertTrue(reply.tree_path.startswith(first.tree_path + '/'))
+        self.assertEqual(reply.depth, 1)
+    
+    def test_post_comment_count_follows_comments(self):
+        """Test comment_count tracks new, soft-deleted and hard-deleted comments"""
+        post = ForumPost.objects.create(
+            title="Counted", slug="counted", content="Body", author=self.teacher
+        )
+        first = ForumComment.objects.create(post=post, author=self.teacher, content="a")
+        latest = ForumComment.objects.create(post=post, author=self.teacher, content="b")
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 2)
+        self.assertEqual(post.last_activity_at, latest.created_at)
+        
+        first.is_deleted = True
+        first.save(update_fields=['is_deleted'])
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 1)
+        
+        first.delete()  # already soft-deleted, must not decrement again
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 1)
+    
+    def test_deleting_post_skips_per_comment_counter_updates(self):
+        """Test cascaded comment deletes do not UPDATE the post being deleted"""
+        post = ForumPost.objects.create(
+            title="Doomed", slug="doomed", content="Body",
+            author=self.teacher, category=self.general
+        )
+        parent = ForumComment.objects.create(post=post, author=self.teacher, content="a")
+        ForumComment.objects.create(
+            post=post, author=self.teacher, content="b", parent_comment=parent
+        )
+        ForumComment.objects.create(post=post, author=self.teacher, content="c")
+        
+        with CaptureQueriesContext(connection) as queries:
+            ForumPost.objects.filter(pk=post.pk).delete()
+        
+        post_updates = [
+            q['sql'] for q in queries.captured_queries
+            if q['sql'].startswith('UPDATE "content_forumpost"')
+        ]
+        self.assertEqual(post_updates, [])
+        self.general.refresh_from_db()
+        self.assertEqual(self.general.post_count, 0)
+
+
+@override_settings(USE_FIRESTORE=False)
+class CommunityViewTest(TestCase):
+    """Test the ORM-backed community views"""
+    
+    def setUp(self):
+        self.school = School.objects.create(name="Test School", domain="test")
+        self.author = User.objects.create_user(
+            username='author', email='author@test.edu', password='pw',
+            firebase_uid='author_uid', role='REGISTERED_USER', school=self.school
+        )
+        self.other = User.objects.create_user(
+            username='other', email='other@test.edu', password='pw',
+            firebase_uid='other_uid', role='REGISTERED_USER', school=self.school
+        )
+        self.moderator = User.objects.create_user(
+            username='moderator', email='moderator@test.edu', password='pw',
+            firebase_uid='moderator_uid', role='ADMIN', school=self.school
+        )
+        self.post = ForumPost.objects.create(
+            title="Hello", slug="hello", content="Body", author=self.author
+        )
+        # Keep role permissions and page menus off Firestore
+        from accounts import role_service
+        patcher = patch.object(role_service, 'get_all_roles', return_value=role_service.FALLBACK_ROLES)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('content.context_processors.get_menus', return_value={'header': [], 'footer': []})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def delete_post(self, post_id):
+        return self.client.post(f'/community/post/{post_id}/delete/')
+    
+    def test_author_can_delete_own_post(self):
+        """Test the author deletes their own post"""
+        self.client.login(username='author', password='pw')
+        response = self.delete_post(self.post.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(ForumPost.objects.filter(pk=self.post.pk).exists())
+    
+    def test_non_author_cannot_delete_post(self):
+        """Test a non-author without moderate permission gets 403"""
+        self.client.login(username='other', password='pw')
+        response = self.delete_post(self.post.id)
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(ForumPost.objects.filter(pk=self.post.pk).exists())
+    
+    def test_moderator_can_delete_any_post(self):
+        """Test a moderator deletes another user's post"""
+        self.client.login(username='moderator', password='pw')
+        response = self.delete_post(self.post.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(ForumPost.objects.filter(pk=self.post.pk).exists())
+    
+    def test_delete_missing_post_returns_404(self):
+        """Test deleting an unknown post id gets 404"""
+        self.client.login(username='moderator', password='pw')
+        response = self.delete_post(uuid.uuid4())
+        self.assertEqual(response.status_code, 404)
+    
+    def test_deep_reply_attaches_to_parents_parent(self):
+        """Test replies past MAX_DEPTH become siblings of the comment they answer"""
+        grandparent = parent = ForumComment.objects.create(
+            post=self.post, author=self.author, content="root"
+        )
+        for _ in range(ForumComment.MAX_DEPTH):
+            grandparent = parent
+            parent = ForumComment.objects.create(
+                post=self.post, author=self.author, content="reply", parent_comment=parent
+            )
+        self.assertEqual(parent.depth, ForumComment.MAX_DEPTH)
+        
+        self.client.login(username='other', password='pw')
+        response = self.client.post(
+            f'/community/post/{self.post.slug}/comment/',
+            {'content': 'too deep', 'parent_id': str(parent.id)}
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        reply = ForumComment.objects.get(pk=response.json()['comment']['id'])
+        self.assertEqual(reply.parent_comment_id, grandparent.id)
+        self.assertEqual(reply.depth, ForumComment.MAX_DEPTH)
+    
+    def test_reply_with_malformed_parent_id_returns_400(self):
+        """Test a non-UUID parent_id is rejected instead of erroring"""
+        self.client.login(username='other', password='pw')
+        response = self.client.post(
+            f'/community/post/{self.post.slug}/comment/',
+            {'content': 'hi', 'parent_id': 'not-a-uuid'}
+        )
+        self.assertEqual(response.status_code, 400)
+    
+    def test_comment_replies_returns_visible_replies_in_thread_order(self):
+        """Test the replies endpoint lists descendants depth-first, skipping deleted ones"""
+        root = ForumComment.objects.create(post=self.post, author=self.author, content="root")
+        first = ForumComment.objects.create(
+            post=self.post, author=self.other, content="first", parent_comment=root
+        )
+        second = ForumComment.objects.create(
+            post=self.post, author=self.author, content="second", parent_comment=root
+        )
+        ForumComment.objects.create(
+            post=self.post, author=self.author, content="nested", parent_comment=first
+        )
+        ForumComment.objects.create(
+            post=self.post, author=self.author, content="gone",
+            parent_comment=second, is_deleted=True
+        )
+        
+        self.client.login(username='author', password='pw')
+        response = self.client.get(f'/community/post/{self.post.id}/comment/{root.id}/replies/')
+        
+        self.assertEqual(response.status_code, 200)
+        replies = response.json()['replies']
+        self.assertEqual([r['content'] for r in replies], ['first', 'nested', 'second'])
+        self.assertEqual([r['is_own'] for r in replies], [False, True, True])
+    
+    def test_comment_replies_unknown_comment_returns_404(self):
+        """Test the replies endpoint 404s for a comment outside the post"""
+        self.client.login(username='author', password='pw')
+        response = self.client.get(
+            f'/community/post/{self.post.id}/comment/{uuid.uuid4()}/replies/'
+        )
+        self.assertEqual(response.status_code, 404)
+    
+    @patch('content.community_views.COMMENTS_PAGE_SIZE', 2)
+    def test_post_detail_pages_top_level_comments_with_reply_counts(self):
+        """Test post_detail pages top-level comments and counts their visible replies"""
+        first = ForumComment.objects.create(post=self.post, author=self.author, content="a")
+        reply = ForumComment.objects.create(
+            post=self.post, author=self.other, content="a1", parent_comment=first
+        )
+        ForumComment.objects.create(
+            post=self.post, author=self.other, content="a1x", parent_comment=reply
+        )
+        ForumComment.objects.create(
+            post=self.post, author=self.other, content="a2",
+            parent_comment=first, is_deleted=True
+        )
+        ForumComment.objects.create(post=self.post, author=self.author, content="b")
+        ForumComment.objects.create(post=self.post, author=self.author, content="c")
+        
+        self.client.login(username='author', password='pw')
+        response = self.client.get(f'/community/post/{self.post.slug}/')
+        self.assertEqual(response.status_code, 200)
+        comments = response.context['comments']
+        self.assertEqual([c.content for c in comments], ['a', 'b'])
+        self.assertEqual([c.reply_count for c in comments], [2, 0])
+        self.assertTrue(response.context['has_more_comments'])
+        
+        response = self.client.get(f'/community/post/{self.post.slug}/?page=2')
+        self.assertEqual([c.content for c in response.context['comments']], ['c'])
+        self.assertFalse(response.context['has_more_comments'])
+
+
+@override_settings(USE_FIRESTORE=True)
+class CommunityFirestoreViewTest(TestCase):
+    """Test the Firestore-backed community views with a mocked service"""
+    
+    def setUp(self):
+        self.school = School.objects.create(name="Test School", domain="test")
+        self.user = User.objects.create_user(
+            username='author', email='author@test.edu', password='pw',
+            firebase_uid='author_uid', role='REGISTERED_USER', school=self.school
+        )
+        self.client.login(username='author', password='pw')
+    
+    @patch('content.community_views.firestore_service')
+    def test_add_comment_rejects_unknown_parent(self, service):
+        """Test a reply to a missing parent is refused before the batch write"""
+        service.get_community_post_by_slug.return_value = {'id': 'post1', 'isLocked': False}
+        service.get_document.return_value = None
+        
+        response = self.client.post(
+            '/community/post/hello/comment/', {'content': 'hi', 'parent_id': 'a/b'}
+        )
+        
+        self.assertEqual(response.status_code, 400)
+        service.add_comment_to_post.assert_not_called()
+    
+    @patch('content.community_views.firestore_service')
+    def test_add_comment_reports_failed_write(self, service):
+        """Test a failed batch write is not reported as success"""
+        service.get_community_post_by_slug.return_value = {'id': 'post1', 'isLocked': False}
+        service.add_comment_to_post.return_value = False
+        
+        response = self.client.post('/community/post/hello/comment/', {'content': 'hi'})
+        
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(response.json()['success'])
+
+
+class FirestoreCommunityServiceTest(TestCase):
+    """Test Firestore community helpers against a mocked client"""
+    
+    def setUp(self):
+        from . import firestore_service
+        self.service = firestore_service
+        self.db = MagicMock()
+        self.transaction = self.db.transaction.return_value
+        patcher = patch.object(firestore_service, 'get_firestore_client', return_value=self.db)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Run the transactional function directly against the mocked transaction
+        patcher = patch.object(firestore_service.firestore, 'transactional', lambda func: func)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def comment_snapshot(self, exists=True, **data):
+        comments = self.db.collection.return_value.document.return_value.collection.return_value
+        snapshot = comments.document.return_value.get.return_value
+        snapshot.exists = exists
+        snapshot.to_dict.return_value = data
+        return snapshot
+    
+    def test_soft_delete_comment_missing(self):
+        """Test a missing comment reports not found"""
+        self.comment_snapshot(exists=False)
+        result = self.service.soft_delete_comment('post1', 'c1')
+        self.assertEqual(result, self.service.COMMENT_NOT_FOUND)
+        self.transaction.update.assert_not_called()
+    
+    def test_soft_delete_comment_forbidden_for_other_author(self):
+        """Test the author check refuses another user's comment without writing"""
+        self.comment_snapshot(authorId='someone_else')
+        result = self.service.soft_delete_comment('post1', 'c1', expected_author_id='me')
+        self.assertEqual(result, self.service.COMMENT_FORBIDDEN)
+        self.transaction.update.assert_not_called()
+        self.transaction.set.assert_not_called()
+    
+    def test_soft_delete_comment_already_deleted_keeps_counters(self):
+        """Test deleting twice does not decrement the counters again"""
+        self.comment_snapshot(authorId='me', isDeleted=True)
+        result = self.service.soft_delete_comment('post1', 'c1', expected_author_id='me')
+        self.assertEqual(result, self.service.COMMENT_DELETED)
+        self.transaction.update.assert_not_called()
+    
+    def test_soft_delete_comment_updates_counters(self):
+        """Test a soft delete decrements the post and parent counters in the transaction"""
+        self.comment_snapshot(authorId='me', parentCommentId='parent1')
+        result = self.service.soft_delete_comment('post1', 'c1', expected_author_id='me')
+        self.assertEqual(result, self.service.COMMENT_DELETED)
+        
+        updates = [call.args[1] for call in self.transaction.update.call_args_list]
+        self.assertEqual(updates[0], {'isDeleted': True})
+        self.assertEqual(updates[1]['commentCount'].value, -1)
+        parent_update = self.transaction.set.call_args
+        self.assertEqual(parent_update.args[1]['replyCount'].value, -1)
+        self.assertTrue(parent_update.kwargs['merge'])
+    
+    def test_posts_page_passes_cursor_and_returns_next(self):
+        """Test the page query starts after the cursor and returns the last doc as the next one"""
+        query = MagicMock()
+        for method in ('where', 'order_by', 'start_after', 'limit'):
+            getattr(query, method).return_value = query
+        self.db.collection.return_value = query
+        last_activity = timezone.now()
+        docs = []
+        for doc_id in ('p2', 'p1'):
+            doc = MagicMock(id=doc_id)
+            doc.to_dict.return_value = {'status': 'active', 'title': doc_id}
+            doc.get.return_value = last_activity
+            docs.append(doc)
+        query.stream.return_value = docs
+        cursor = (last_activity, 'p3')
+        
+        posts, next_cursor = self.service.get_community_posts_page(limit=2, start_after=cursor)
+        
+        query.start_after.assert_called_once_with({
+            'lastActivityAt': last_activity, '__name__': 'p3'
+        })
+        self.assertEqual([p['id'] for p in posts], ['p2', 'p1'])
+        self.assertEqual(next_cursor, (last_activity, 'p1'))
+    
+    def test_post_with_comments_reads_both(self):
+        """Test the post and its ordered comments are assembled, and a missing post is None"""
+        post_ref = self.db.collection.return_value.document.return_value
+        post_ref.get.return_value = MagicMock(id='post1', exists=True)
+        post_ref.get.return_value.to_dict.return_value = {'title': 'Halves'}
+        comment = MagicMock(id='c1')
+        comment.to_dict.return_value = {'content': 'Nice'}
+        post_ref.collection.return_value.order_by.return_value.stream.return_value = [comment]
+        
+        post = self.service.get_post_with_comments('post1')
+        self.assertEqual(post['title'], 'Halves')
+        self.assertEqual(post['comments'], [{'content': 'Nice', 'id': 'c1'}])
+        
+        post_ref.get.return_value.exists = False
+        self.assertIsNone(self.service.get_post_with_comments('post1'))
+    
+    def test_post_comments_fallback_keeps_oldest_within_limit(self):
+        """Test the unindexed fallback returns the oldest `limit` comments, undated last"""
+        comments_ref = self.db.collection.return_value.document.return_value.collection.return_value
+        query = comments_ref.where.return_value
+        query.order_by.side_effect = Exception('index required')
+        now = timezone.now()
+        docs = []
+        for doc_id, created in (('c3', now), ('c0', None), ('c1', now - timedelta(hours=2)), ('c2', now - timedelta(hours=1))):
+            doc = MagicMock(id=doc_id)
+            doc.to_dict.return_value = {'createdAt': created}
+            docs.append(doc)
+        query.stream.return_value = docs
+        
+        self.assertEqual([c['id'] for c in self.service.get_post_comments('post1', limit=2)], ['c1', 'c2'])
+        self.assertEqual([c['id'] for c in self.service.get_post_comments('post1')], ['c1', 'c2', 'c3', 'c0'])
+    
+    def test_delete_post_removes_comments_through_bulk_writer(self):
+        """Test comment references are deleted via one BulkWriter before the post"""
+        post_ref = self.db.collection.return_value.document.return_value
+        comment_refs = [MagicMock(), MagicMock()]
+        post_ref.collection.return_value.list_documents.return_value = comment_refs
+        post_ref.get.return_value.exists = False
+        writer = self.db.bulk_writer.return_value
+        
+        self.assertTrue(self.service.delete_community_post('post1'))
+        self.assertEqual([c.args[0] for c in writer.delete.call_args_list], comment_refs)
+        writer.close.assert_called_once()
+        post_ref.delete.assert_called_once_with()
+
+
+class CommunityPostCursorTest(TestCase):
+    """Test the ?after= cursor encoding used by community_home"""
+    
+    def test_cursor_round_trip(self):
+        """Test an encoded cursor decodes back to the same timestamp and id"""
+        from .community_views import _decode_post_cursor, _encode_post_cursor
+        cursor = (timezone.now(), 'post|with|pipes')
+        self.assertEqual(_decode_post_cursor(_encode_post_cursor(cursor)), cursor)
+        self.assertEqual(_encode_post_cursor(None), '')
+    
+    def test_malformed_cursor_decodes_to_none(self):
+        """Test malformed ?after= values are ignored rather than raising"""
+        from .community_views import _decode_post_cursor
+        for value in ('', 'garbage', 'not-a-date|post1', '2026-01-01T00:00:00|'):
+            self.assertIsNone(_decode_post_cursor(value), value)
+
+
+class FileValidatorTest(TestCase):
+    """Test upload file validation"""
+    
+    def test_sniff_identifies_whitelisted_signatures(self):
+        """Test leading-byte sniffing for the accepted formats"""
+        self.assertEqual(sniff(b'%PDF-1.7\n'), 'application/pdf')
+        self.assertEqual(sniff(b'\x89PNG\r\n\x1a\n....'), 'image/png')
+        self.assertEqual(sniff(b'RIFF\x00\x00\x00\x00WEBPVP8 '), 'image/webp')
+        self.assertEqual(sniff(b'\x00\x00\x00\x18ftypmp42'), 'video/mp4')
+        self.assertEqual(
+            sniff(b'PK\x03\x04' + b'\x00' * 26 + b'word/document.xml'),
+            'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+        )
+        self.assertIsNone(sniff(b'plain text'))
+    
+    def test_content_validation_rejects_mismatched_type(self):
+        """Test declared type must match the sniffed content"""
+        is_valid, _ = FileValidator.validate_file_content_from_stream(
+            io.BytesIO(b'%PDF-1.7\n'), 'application/pdf'
+        )
+        self.assertTrue(is_valid)
+        is_valid, error = FileValidator.validate_file_content_from_stream(
+            b'\x89PNG\r\n\x1a\n', 'video/mp4'
+        )
+        self.assertFalse(is_valid)
+        self.assertIn('image/png', error)
+    
+    def test_validate_raises_first_failure_with_code(self):
+        """Test upload validation stops at the first failing check"""
+        FileValidator.validate('video', 'video/mp4', 1024, 'lesson.mp4')
+        with self.assertRaises(ValidationError) as ctx:
+            # Both the size and the name are bad; size is checked first
+            FileValidator.validate('video', 'video/mp4', 0, 'payload.exe')
+        self.assertEqual(ctx.exception.code, 'invalid_file_size')
+        self.assertEqual(
+            FileValidator.validate_file_name('payload.exe'),
+            (False, "File extension '.exe' is not allowed for security reasons")
+        )
+
+
+class UploadRateLimiterTest(TestCase):
+    """Test upload quota and rate limit checks"""
+    
+    def setUp(self):
+        self.school = School.objects.create(name="Test School", domain="test")
+        self.teacher = User.objects.create_user(
+            username='teacher1', email='teacher1@test.edu',
+            firebase_uid='teacher1_uid', school=self.school
+        )
+    
+    def test_storage_usage_sums_videos_and_resources_in_one_query(self):
+        """Test storage usage adds both asset tables with a single query"""
+        VideoAsset.objects.create(
+            title="Video", owner=self.teacher, school=self.school,
+            file_size=100, storage_uri="videos/a.mp4"
+        )
+        Resource.objects.create(
+            title="Worksheet", owner=self.teacher, school=self.school,
+            file_size=7, file_type='pdf'
+        )
+        
+        with self.assertNumQueries(1):
+            usage = UploadRateLimiter.get_storage_usage(self.teacher.pk)
+        self.assertEqual(usage, 107)
+        self.assertEqual(UploadRateLimiter.get_storage_usage(self.teacher.pk + 1000), 0)
+    
+    @patch.object(UploadRateLimiter, 'MAX_UPLOADS_PER_HOUR', 2)
+    def test_upload_limit_counts_atomically_and_ignores_refused_uploads(self):
+        """Test the hourly limit refuses the third upload without counting it"""
+        from django.core.cache import cache
+        cache.clear()
+        user_id = self.teacher.pk
+        
+        self.assertEqual(UploadRateLimiter.check_upload_limit(user_id), (True, None))
+        self.assertEqual(UploadRateLimiter.check_upload_limit(user_id)[0], True)
+        self.assertEqual(UploadRateLimiter.check_upload_limit(user_id)[0], False)
+        self.assertEqual(UploadRateLimiter.check_upload_limit(user_id)[0], False)
+        
+        with patch.object(UploadRateLimiter, 'MAX_UPLOADS_PER_HOUR', 3):
+            # Refused attempts were not counted, so one more fits
+            self.assertEqual(UploadRateLimiter.check_upload_limit(user_id)[0], True)
+            self.assertEqual(UploadRateLimiter.check_upload_limit(user_id)[0], False)
+    
+    def test_rejected_file_leaves_upload_counters_unchanged(self):
+        """Test a file that fails validation is not counted against the upload limits"""
+        from django.core.cache import cache
+        cache.clear()
+        user_id = self.teacher.pk
+        keys = list(UploadRateLimiter._window_keys(user_id))
+        
+        with self.assertRaises(ValidationError) as ctx:
+            validate_and_check_limits(user_id, 'video', 'video/mp4', 1024, 'payload.exe')
+        self.assertNotEqual(ctx.exception.code, 'rate_limited')
+        self.assertEqual(cache.get_many(keys), {})
+        
+        validate_and_check_limits(user_id, 'video', 'video/mp4', 1024, 'lesson.mp4')
+        self.assertEqual(sorted(cache.get_many(keys).values()), [1, 1])
+    
+    def test_storage_quota_cache_is_dropped_when_assets_change(self):
+        """Test the cached usage is reused, then refreshed after an upload"""
+        from django.core.cache import cache
+        cache.clear()
+        UploadRateLimiter.check_storage_quota(self.teacher.pk, 1)
+        with self.assertNumQueries(0):
+            UploadRateLimiter.check_storage_quota(self.teacher.pk, 1)
+        
+        Resource.objects.create(
+            title="Worksheet", owner=self.teacher, school=self.school,
+            file_size=UploadRateLimiter.MAX_USER_STORAGE, file_type='pdf'
+        )
+        is_allowed, _ = UploadRateLimiter.check_storage_quota(self.teacher.pk, 1)
+        self.assertFalse(is_allowed)
+
+
+class LibraryFilterTest(TestCase):
+    """Test VideoAssetFilter/ResourceFilter search and tag lookups"""
+    
+    def setUp(self):
+        self.school = School.objects.create(name="Test School", domain="test")
+        self.teacher = User.objects.create_user(
+            username='teacher1',
+            email='teacher1@test.edu',
+            firebase_uid='filter_teacher_uid',
+            role='TEACHER',
+            school=self.school
+        )
+        self.halves = self._video("Halves on the court", "Splitting the court in two", ["Visual"])
+        self.number_line = self._video("Number line relay", "Place fractions on a line", ["relay", "interactive"])
+    
+    def _video(self, title, description, tags):
+        return VideoAsset.objects.create(
+            title=title, description=description, tags=tags,
+            grade="3", topic="fractions_basics",
+            storage_uri="https://storage.googleapis.com/test.mp4",
+            owner=self.teacher, school=self.school
+        )
+    
+    def _search(self, value):
+        from .filters import VideoAssetFilter
+        return set(VideoAssetFilter().filter_search(VideoAsset.objects.all(), 'search', value))
+    
+    def test_search_matches_title_and_description(self):
+        """Test full search terms match either column"""
+        self.assertEqual(self._search('relay'), {self.number_line})
+        self.assertEqual(self._search('splitting'), {self.halves})
+        self.assertEqual(self._search('   '), {self.halves, self.number_line})
+    
+    def test_short_search_matches_title_prefix_only(self):
+        """Test terms below the full-text minimum only match title prefixes"""
+        self.assertEqual(self._search('nu'), {self.number_line})
+        self.assertEqual(self._search('in'), set())
+    
+    def test_tags_match_any_listed_tag_case_insensitively(self):
+        """Test comma-separated tags match assets carrying any of them"""
+        from .filters import ResourceFilter, VideoAssetFilter
+        qs = VideoAsset.objects.all()
+        self.assertEqual(set(VideoAssetFilter().filter_tags(qs, 'tags', 'visual, relay')),
+                         {self.halves, self.number_line})
+        self.assertEqual(set(VideoAssetFilter().filter_tags(qs, 'tags', 'INTERACTIVE')), {self.number_line})
+        self.assertEqual(set(VideoAssetFilter().filter_tags(qs, 'tags', ' , ')), {self.halves, self.number_line})
+        self.assertFalse(ResourceFilter().filter_tags(Resource.objects.all(), 'tags', 'visual').exists())
+
+
+class FirestoreAdapterTest(TestCase):
+    """Test the Firestore document adapters"""
+    
+    def test_adapters_use_slots(self):
+        """Test per-document adapters carry no instance __dict__"""
+        from .firestore_adapters import FirestoreActivity, FirestoreComment
+        activity = FirestoreActivity.from_dict({'id': 'a1', 'title': 'Relay'})
+        self.assertFalse(hasattr(activity, '__dict__'))
+        self.assertIsNone(activity.video_asset)
+        comment = FirestoreComment.from_dict({'id': 'c1'})
+        comment.is_own = True
+        with self.assertRaises(AttributeError):
+            comment.not_a_field = True
+    
+    def test_activity_from_dict_extracts_refs(self):
+        """Test FirestoreActivity.from_dict normalizes topics and reference lists"""
+        from types import SimpleNamespace
+        from .firestore_adapters import FirestoreActivity
+        tags = ['halves']
+        data = {
+            'id': 'a1', 'title': 'Relay', 'gradeLevel': [0], 'tags': tags,
+            'taxonomy': {'courtType': 'Basketball Court', 'topic': 'number_line'},
+            'videos': [{'videoId': SimpleNamespace(id='v1')}, {'videoId': 'v2'}, {'videoId': ''}, 'bad'],
+            'resources': [
+                {'resourceId': 'r1'},
+                {'resourceId': SimpleNamespace(id='r2'), 'type': 'student'},
+                {'resourceId': None, 'type': 'student'},
+            ],
+            'prerequisiteActivities': [SimpleNamespace(id='p1'), 'p2', 7],
+            'learningObjectives': 'Compare halves',
+        }
+        activity = FirestoreActivity.from_dict(data)
+        self.assertEqual(activity.grade, 'K')
+        self.assertEqual(activity.location, 'court')
+        self.assertEqual(activity.topics, ['number_line', 'halves'])
+        self.assertEqual(tags, ['halves'])
+        self.assertEqual(activity.video_ids, ['v1', 'v2'])
+        self.assertEqual(activity.teacher_resource_ids, ['r1'])
+        self.assertEqual(activity.student_resource_ids, ['r2'])
+        self.assertEqual(activity.prerequisite_activity_refs, ['p1', 'p2'])
+        self.assertEqual(activity.related_activity_refs, [])
+        self.assertEqual(activity.learning_objectives, ['Compare halves'])
+        self.assertEqual(FirestoreActivity.from_dict({'id': 'a2'}).grade, '5')
+    
+    def test_display_helpers_use_shared_tables(self):
+        """Test location/file-type display names, including unknown values"""
+        from .firestore_adapters import FirestoreActivity, FirestoreResource
+        self.assertEqual(FirestoreActivity.from_dict({'location': 'both'}).get_location_display(), 'Both')
+        self.assertEqual(FirestoreActivity.from_dict({'location': 'gym'}).get_location_display(), 'Gym')
+        self.assertEqual(FirestoreResource(id='r', title='R', file_type='docx').get_file_type_display, 'Word Document')
+        self.assertEqual(FirestoreResource(id='r', title='R', file_type='csv').get_file_type_display, 'CSV')
+    
+    def test_comment_replies_manager(self):
+        """Test FirestoreComment.replies.all() returns the attached replies"""
+        from .firestore_adapters import FirestoreComment
+        reply = FirestoreComment(id='r1')
+        comment = FirestoreComment(id='c1', _replies_list=[reply])
+        self.assertEqual(comment.replies.all(), [reply])
+        self.assertIs(type(comment.replies), type(FirestoreComment(id='c2').replies))
+    
+    def test_from_json_decodes_wire_bytes(self):
+        """Test adapters build straight from JSON bytes, parsing ISO timestamps"""
+        from .firestore_adapters import FirestoreCommunityPost, FirestoreFAQ
+        post = FirestoreCommunityPost.from_json(
+            b'{"id": "p1", "title": "Halves", "createdAt": "2026-01-02T03:04:05Z"}'
+        )
+        self.assertEqual(post.slug, 'p1')
+        self.assertEqual(post.created_at.year, 2026)
+        self.assertEqual(post.last_activity_at, post.created_at)
+        self.assertEqual(FirestoreFAQ.from_json('{"id": "f1", "question": "Why?"}').question, 'Why?')
+    
+    def test_activity_summary_keeps_card_fields_only(self):
+        """Test from_dict_summary matches from_dict on the fields list cards render"""
+        from .firestore_adapters import FirestoreActivity, FirestoreActivitySummary
+        data = {
+            'id': 'a1', 'title': 'Relay', 'slug': 'relay', 'gradeLevel': 4, 'tags': ['halves'],
+            'taxonomy': {'topic': 'number_line'}, 'order': 3, 'materials': ['cones'],
+        }
+        summary = FirestoreActivity.from_dict_summary(data)
+        full = FirestoreActivity.from_dict(data)
+        self.assertIsInstance(summary, FirestoreActivitySummary)
+        for name in ('id', 'title', 'slug', 'grade', 'activity_number', 'topics', 'icon_type', 'order'):
+            self.assertEqual(getattr(summary, name), getattr(full, name))
+        self.assertEqual(summary.topic_tags, ['number_line', 'halves'])
+        self.assertFalse(hasattr(summary, 'materials'))
+    
+    def test_activity_location_and_grade_tables(self):
+        """Test known courtType values, unknown ones, and grade numbers map as before"""
+        from .firestore_adapters import FirestoreActivity
+        
+        def build(court_type, **extra):
+            return FirestoreActivity.from_dict({'taxonomy': {'courtType': court_type}, **extra})
+        self.assertEqual(build('Basketball Court').location, 'court')
+        self.assertEqual(build('classroom').location, 'classroom')
+        self.assertEqual(build('Both', location='court').location, 'court')
+        self.assertEqual(build('Outdoor Field').location, 'both')
+        self.assertEqual(build('Indoor CLASSROOM').location, 'classroom')
+        self.assertEqual(build('', gradeLevel=[7]).grade, '7')
+        self.assertEqual(build('', gradeLevel=14).grade, '14')
+        self.assertEqual(build('', learningObjectives='').learning_objectives, [])
+
+
+class FirestoreCollectionCacheTest(TestCase):
+    """Test whole-collection reads are cached and dropped by invalidate()"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        from . import firestore_service
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.service = firestore_service
+        self.db = MagicMock()
+        self.query = self.db.collection.return_value.where.return_value
+        self.query.where.return_value = self.query
+        patcher = patch.object(firestore_service, 'get_firestore_client', return_value=self.db)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def stream(self, *rows):
+        docs = []
+        for doc_id, data in rows:
+            doc = MagicMock(id=doc_id)
+            doc.to_dict.return_value = dict(data)
+            docs.append(doc)
+        self.query.stream.side_effect = lambda **kwargs: iter(docs)
+    
+    def test_published_activities_stream_once_until_invalidated(self):
+        """Test repeat reads skip Firestore and invalidate() forces a refetch"""
+        self.stream(('a1', {'title': 'Relay'}))
+        self.assertEqual(self.service.get_published_activities()[0]['id'], 'a1')
+        self.service.get_published_activities()
+        self.assertEqual(self.query.stream.call_count, 1)
+        
+        self.service.invalidate('activities')
+        self.service.get_published_activities()
+        self.assertEqual(self.query.stream.call_count, 2)
+    
+    def test_query_activities_filters_cached_set(self):
+        """Test different filters share one stream of the published set"""
+        self.stream(
+            ('a1', {'title': 'Halves Relay', 'gradeLevel': [3], 'order': 2}),
+            ('a2', {'title': 'Number Line', 'gradeLevel': [0, 3], 'order': 1}),
+        )
+        self.assertEqual([a['id'] for a in self.service.query_activities(grade='3')], ['a2', 'a1'])
+        self.assertEqual([a['id'] for a in self.service.query_activities(grade='K')], ['a2'])
+        self.assertEqual([a['id'] for a in self.service.query_activities(search='halves')], ['a1'])
+        self.assertEqual([a['id'] for a in self.service.query_activities(search='LINE')], ['a2'])
+        self.assertEqual(self.query.stream.call_count, 1)
+    
+    def test_query_activities_matches_filter_keys_and_labels(self):
+        """Test topic/taxonomy filters match a key or its label regardless of case"""
+        self.stream(
+            ('a1', {'title': 'A', 'tags': ['Number Lines'], 'taxonomy': {'standard': ['CCSS.3.NF.1']}}),
+            ('a2', {'title': 'B', 'taxonomy': {'topic': 'equivalent fractions', 'standard': 'ccss.4.nf.1'}}),
+        )
+        taxonomy = [{'values': [
+            {'key': 'number_lines', 'label': 'Number Lines'},
+            {'key': 'equiv', 'label': 'Equivalent Fractions'},
+        ]}]
+        
+        def ids(**filters):
+            return [a['id'] for a in self.service.query_activities(taxonomy_categories=taxonomy, **filters)]
+        self.assertEqual(ids(topics=['number_lines']), ['a1'])
+        self.assertEqual(ids(topics=['equiv', 'NUMBER LINES']), ['a1', 'a2'])
+        self.assertEqual(ids(extra_taxonomy={'standard': 'CCSS.4.NF.1'}), ['a2'])
+        self.assertEqual(ids(extra_taxonomy={'standard': 'ccss.3.nf.1'}), ['a1'])
+        self.assertEqual(ids(extra_taxonomy={'missing': 'x'}), [])
+    
+    def test_query_activities_uses_cached_key_to_label(self):
+        """Test filter keys resolve through the cached taxonomy map when no categories are passed"""
+        from . import taxonomy_service
+        self.stream(('a1', {'title': 'A', 'tags': ['Number Lines']}))
+        categories = [{'values': [{'key': 'number_lines', 'label': 'Number Lines'}]}]
+        with patch.object(taxonomy_service, 'get_all_taxonomy_categories', return_value=categories) as fetch:
+            self.assertEqual([a['id'] for a in self.service.query_activities(topics=['number_lines'])], ['a1'])
+            self.assertEqual(self.service.query_activities(topics=['number_lines'], grade='3'), [])
+            self.assertEqual(taxonomy_service.get_key_to_label(), {'number_lines': 'Number Lines'})
+        fetch.assert_called_once_with()
+    
+    def test_backfill_writes_only_stale_search_fields(self):
+        """Test searchTags carries labels plus their keys and unchanged docs are skipped"""
+        writer = self.db.bulk_writer.return_value
+        taxonomy = [{'values': [{'key': 'equiv', 'label': 'Equivalent Fractions'}]}]
+        activities = [
+            {'id': 'a1', 'tags': ['Equivalent Fractions'], 'taxonomy': {'courtType': 'Basketball Court'}},
+            {'id': 'a2', 'taxonomy': {'topic': 'halves'}, 'location': 'classroom',
+             'searchTags': ['halves'], 'locationNormalized': 'classroom'},
+        ]
+        self.assertEqual(self.service.backfill_activity_search_fields(activities, taxonomy), 1)
+        writer.update.assert_called_once_with(
+            self.db.collection.return_value.document.return_value,
+            {'searchTags': ['equiv', 'equivalent fractions'], 'locationNormalized': 'court'},
+        )
+        writer.close.assert_called_once()
+    
+    def test_server_filters_narrow_topics_and_location_in_firestore(self):
+        """Test ACTIVITY_SERVER_FILTERS pushes topic terms and location into the query"""
+        self.stream(('a1', {'title': 'A', 'tags': ['Halves'], 'location': 'court'}))
+        with patch.object(self.service, 'ACTIVITY_SERVER_FILTERS', True):
+            result = self.service.query_activities(topics=['Halves'], location='court', taxonomy_categories=[])
+        self.assertEqual([a['id'] for a in result], ['a1'])
+        filters = [c.kwargs['filter'] for c in self.query.where.call_args_list]
+        self.assertEqual(
+            [(f.field_path, f.op_string, f.value) for f in filters],
+            [('searchTags', 'array_contains_any', ['halves']), ('locationNormalized', 'in', ['court', 'both'])],
+        )
+    
+    def test_location_naming_court_and_classroom_normalizes_to_both(self):
+        """Test an activity for either setting is found by both server-side location filters"""
+        data = {'location': 'Court or Classroom'}
+        self.assertEqual(self.service._activity_location_normalized(data), 'both')
+        self.assertEqual(self.service._activity_location_normalized({'location': 'Court'}), 'court')
+        self.stream(('a1', dict(data, title='A')))
+        with patch.object(self.service, 'ACTIVITY_SERVER_FILTERS', True):
+            for location in ('court', 'classroom'):
+                result = self.service.query_activities(location=location, taxonomy_categories=[])
+                self.assertEqual([a['id'] for a in result], ['a1'])
+                self.assertEqual(self.query.where.call_args.kwargs['filter'].value, [location, 'both'])
+    
+    def test_faqs_cached_per_category(self):
+        """Test FAQ lists are cached per category"""
+        self.stream(('f1', {'question': 'Why?', 'displayOrder': 1}))
+        self.service.get_faqs_by_category()
+        self.service.get_faqs_by_category()
+        self.service.get_faqs_by_category('general')
+        self.assertEqual(self.query.stream.call_count, 2)
+    
+    def test_activity_slug_resolved_by_document_get_once_known(self):
+        """Test the second slug lookup reads the document by ID instead of querying"""
+        self.query.limit.return_value = self.query
+        self.stream(('a1', {'title': 'Relay', 'slug': 'relay', 'status': 'published'}))
+        snapshot = self.db.collection.return_value.document.return_value.get.return_value
+        snapshot.exists = True
+        snapshot.id = 'a1'
+        snapshot.to_dict.return_value = {'title': 'Relay', 'slug': 'relay', 'status': 'published'}
+        
+        self.assertEqual(self.service.get_activity_by_slug('relay')['id'], 'a1')
+        self.assertEqual(self.service.get_activity_by_slug('relay')['id'], 'a1')
+        self.assertEqual(self.query.stream.call_count, 1)
+        self.db.collection.return_value.document.assert_called_once_with('a1')
+        
+        # A mapping that no longer matches falls back to the query
+        snapshot.to_dict.return_value = {'slug': 'renamed', 'status': 'published'}
+        self.service.get_activity_by_slug('relay')
+        self.assertEqual(self.query.stream.call_count, 2)
+
+
+class FirestoreSyncTest(TestCase):
+    """Test Firestore → Django sync against canned Firestore documents"""
+    
+    def setUp(self):
+        self.school = School.objects.create(name="Test School", domain="test")
+        self.teacher = User.objects.create_user(
+            username='teacher1', email='teacher1@test.edu', firebase_uid='teacher1_uid',
+            role='TEACHER', school=self.school
+        )
+    
+    def test_activity_links_resolved_from_prefetched_titles(self):
+        """Test video/resource links come from one query each, not one per reference"""
+        from . import firestore_service
+        from .models import Activity
+        video = VideoAsset.objects.create(
+            title="Relay Video", owner=self.teacher, school=self.school,
+            storage_uri="videos/a.mp4", grade="3", topic="fractions_basics"
+        )
+        sheets = [
+            Resource.objects.create(title=title, owner=self.teacher, school=self.school, file_type='pdf')
+            for title in ("Sheet A", "Sheet B")
+        ]
+        activities = [
+            {
+                'id': f'a{i}', 'title': f'Relay {i}', 'status': 'published', 'gradeLevel': [3],
+                'videos': [{'title': 'Missing'}, {'title': 'Relay Video'}],
+                'resources': [{'title': 'Sheet A'}, {'title': 'Sheet B'}, 'not-a-ref'],
+            }
+            for i in range(3)
+        ]
+        backfill = patch.object(firestore_service, 'backfill_activity_search_fields')
+        backfill.start()
+        self.addCleanup(backfill.stop)
+        with patch.object(firestore_service, 'get_published_activities', return_value=activities):
+            with self.assertNumQueries(5):
+                created, updated = firestore_service.sync_activities_to_django(self.teacher, self.school)
+        
+        self.assertEqual((created, updated), (3, 0))
+        for activity in Activity.objects.all():
+            self.assertEqual(activity.video_asset, video)
+            self.assertCountEqual(activity.teacher_resources.all(), sheets)
+        self.assertEqual(sorted(Activity.objects.values_list('activity_number', flat=True)), [1, 2, 3])
+        
+        # A second pass updates the same rows in place
+        with patch.object(firestore_service, 'get_published_activities', return_value=activities):
+            self.assertEqual(firestore_service.sync_activities_to_django(self.teacher, self.school), (0, 3))
+        self.assertEqual(Activity.objects.count(), 3)
+        self.assertEqual(Activity.objects.get(slug='relay-0').teacher_resources.count(), 2)
+    
+    def test_video_sync_updates_and_creates_in_bulk(self):
+        """Test video sync does one lookup and batched writes, folding repeated titles"""
+        from . import firestore_service
+        VideoAsset.objects.create(
+            title="Halves", owner=self.teacher, school=self.school,
+            storage_uri="videos/old.mp4", grade="3", topic="fractions_basics", duration=10
+        )
+        docs = [
+            {'id': 'v1', 'title': 'Halves', 'fileUrl': 'videos/new.mp4'},
+            {'id': 'v2', 'title': 'Thirds', 'fileUrl': 'videos/t1.mp4'},
+            {'id': 'v3', 'title': 'Thirds', 'fileUrl': 'videos/t2.mp4'},
+        ]
+        with patch.object(firestore_service, 'iter_document_pages', return_value=iter([docs])):
+            with self.assertNumQueries(3):
+                created, updated = firestore_service.sync_videos_to_django(self.teacher, self.school)
+        
+        self.assertEqual((created, updated), (1, 2))
+        halves = VideoAsset.objects.get(title='Halves')
+        self.assertEqual((halves.storage_uri, halves.duration, halves.status), ('videos/new.mp4', 10, 'PUBLISHED'))
+        self.assertEqual(VideoAsset.objects.get(title='Thirds').storage_uri, 'videos/t2.mp4')
+
+
+class FirestoreClientTest(TestCase):
+    """Test read/write Firestore client selection"""
+    
+    def setUp(self):
+        from . import firestore_service
+        self.service = firestore_service
+        for name, value in (('_client_pool', []), ('_firestore_write_client', None)):
+            patcher = patch.object(firestore_service, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def test_grpc_clients_handed_out_round_robin(self):
+        """Test the pool is built once and reads/writes rotate through it"""
+        with patch.object(self.service, 'FIRESTORE_CLIENT_POOL_SIZE', 3), \
+                patch.object(self.service, '_create_firestore_client', side_effect=lambda t: MagicMock(transport=t)) as create:
+            clients = [self.service.get_firestore_client() for _ in range(6)]
+            clients.append(self.service.get_firestore_write_client())
+        self.assertEqual(create.call_count, 3)
+        self.assertEqual(len({id(c) for c in clients}), 3)
+        self.assertEqual(clients[:3], clients[3:6])
+        self.assertIn(clients[6], clients[:3])
+    
+    def test_rest_reads_keep_grpc_writes(self):
+        """Test REST reads get their own client and writes stay on gRPC"""
+        with patch.object(self.service, 'FIRESTORE_TRANSPORT', 'rest'), \
+                patch.object(self.service, '_create_firestore_client', side_effect=lambda t: MagicMock(transport=t)):
+            self.assertEqual(self.service.get_firestore_client().transport, 'rest')
+            self.assertEqual(self.service.get_firestore_write_client().transport, 'grpc')
+            self.assertIs(self.service.get_firestore_write_client(), self.service.get_firestore_write_client())
+
+
+class FirestoreDocumentPagesTest(TestCase):
+    """Test paged and batched multi-document reads"""
+    
+    def test_pages_resume_after_last_snapshot(self):
+        """Test each page starts after the previous page's last document and a short page ends"""
+        from . import firestore_service
+        db = MagicMock()
+        query = db.collection.return_value.order_by.return_value.limit.return_value
+        docs = []
+        for doc_id in ('d1', 'd2', 'd3'):
+            doc = MagicMock(id=doc_id)
+            doc.to_dict.return_value = {'title': doc_id}
+            docs.append(doc)
+        query.stream.return_value = docs[:2]
+        query.start_after.return_value.stream.return_value = docs[2:]
+        
+        with patch.object(firestore_service, 'get_firestore_client', return_value=db):
+            pages = list(firestore_service.iter_document_pages('videos', page_size=2))
+        
+        self.assertEqual([[d['id'] for d in page] for page in pages], [['d1', 'd2'], ['d3']])
+        query.start_after.assert_called_once_with(docs[1])
+        db.collection.return_value.order_by.assert_called_once_with('__name__')
+    
+    def test_ids_read_in_concurrent_chunks(self):
+        """Test large ID lists are split into get_all chunks and missing docs dropped"""
+        from . import firestore_service
+        db = MagicMock()
+        db.collection.return_value.document.side_effect = lambda doc_id: doc_id
+        
+        def get_all(refs):
+            return [MagicMock(id=ref, exists=ref != 'v1', **{'to_dict.return_value': {}}) for ref in refs]
+        db.get_all.side_effect = get_all
+        ids = [f'v{i}' for i in range(5)]
+        
+        with patch.object(firestore_service, 'get_firestore_client', return_value=db), \
+                patch.object(firestore_service, 'GET_ALL_CHUNK_SIZE', 2):
+            videos = firestore_service.get_videos_by_ids(ids)
+        
+        self.assertEqual([v['id'] for v in videos], ['v0', 'v2', 'v3', 'v4'])
+        self.assertEqual(sorted(len(c.args[0]) for c in db.get_all.call_args_list), [1, 2, 2])
+
+
+class FileDeleteViewTest(TestCase):
+    """Test the storage delete-file endpoint reports the real outcome"""
+    
+    def test_delete_waits_for_the_result(self):
+        """Test the endpoint waits on the delete and maps failure to 500"""
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from .upload_views import FileUploadViewSet
+        user = User.objects.create_user(username='editor', email='editor@test.edu', firebase_uid='editor_uid')
+        view = FileUploadViewSet.as_view({'delete': 'delete_file'})
+        storage = MagicMock()
+        
+        def call():
+            request = APIRequestFactory().delete('/', {'file_path': 'videos/a.mp4'}, format='json')
+            force_authenticate(request, user=user)
+            with patch.object(FileUploadViewSet, 'permission_classes', []), \
+                    patch('content.upload_views.get_storage_service', return_value=storage):
+                return view(request)
+        
+        storage.delete_file.return_value = True
+        self.assertEqual(call().status_code, 200)
+        storage.delete_file.assert_called_with('videos/a.mp4', wait=True)
+        storage.delete_file.return_value = False
+        self.assertEqual(call().status_code, 500)
@@ -7,6 +7,7 @@ import logging
 from rest_framework import status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
+from django.core.exceptions import ValidationError
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
 
@@ -70,17 +71,17 @@ class FileUploadViewSet(viewsets.ViewSet):
                 )
             
             # Comprehensive validation and rate limiting
-            is_valid, error_msg = validate_and_check_limits(
-                user_id=request.user.id,
-                file_type=file_type,
-                content_type=content_type,
-                file_size=file_size,
-                file_name=file_name
-            )
-            
-            if not is_valid:
+            try:
+                validate_and_check_limits(
+                    user_id=request.user.id,
+                    file_type=file_type,
+                    content_type=content_type,
+                    file_size=file_size,
+                    file_name=file_name
+                )
+            except ValidationError as e:
                 return Response(
-                    {'error': error_msg},
+                    {'error': e.message},
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
@@ -165,16 +166,14 @@ class FileUploadViewSet(viewsets.ViewSet):
             # Get storage service
             storage_service = get_storage_service()
             
-            # Verify file exists in storage
-            if not storage_service.file_exists(file_path):
+            # Get file metadata (None if the file is not in storage)
+            metadata = storage_service.get_file_metadata(file_path)
+            if metadata is None:
                 return Response(
                     {'error': 'File not found in storage'},
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Get file metadata
-            metadata = storage_service.get_file_metadata(file_path)
-            
             # Create database record based on file type
             if file_type == 'video':
                 # Determine file type from metadata
@@ -317,6 +316,10 @@ class FileUploadViewSet(viewsets.ViewSet):
             "file_path": "videos/20250118/abc123.mp4"
         }
         
+        Waits for the delete, so the response reports its real outcome:
+        200 once the file is gone, 500 if the delete failed (including a
+        path that does not exist).
+        
         Returns:
         {
             "message": "File deleted successfully"
@@ -334,8 +337,8 @@ class FileUploadViewSet(viewsets.ViewSet):
             # Get storage service
             storage_service = get_storage_service()
             
-            # Delete file
-            success = storage_service.delete_file(file_path)
+            # Delete file (wait: the default only queues it)
+            success = storage_service.delete_file(file_path, wait=True)
             
             if success:
                 logger.info(
@@ -28,6 +28,7 @@ urlpatterns = [
     path('community/post/<str:post_id>/edit/', community_views.edit_post, name='community-edit-post'),
     path('community/post/<str:post_id>/flag/', community_views.flag_post, name='community-flag-post'),
     path('community/post/<str:post_id>/comment/<str:comment_id>/delete/', community_views.delete_comment, name='community-delete-comment'),
+    path('community/post/<str:post_id>/comment/<str:comment_id>/replies/', community_views.get_comment_replies, name='community-comment-replies'),
 
     # Download tracking
     path('download/resource/<uuid:resource_id>/', download_views.track_and_download_resource, name='download-resource'),
@@ -39,6 +39,19 @@ def get_storage_url(path: str) -> str:
     return f"https://firebasestorage.googleapis.com/v0/b/{FIREBASE_STORAGE_BUCKET}/o/{encoded_path}?alt=media"
 
 
+def _hydrate_video_urls(videos):
+    """
+    Sign bare storage paths on FirestoreVideo objects in one bulk call.
+    If signing is unavailable the paths are left as-is, so callers fall
+    back to get_storage_url().
+    """
+    try:
+        FirestoreVideo.hydrate_urls(videos, expiration_minutes=120)
+    except Exception as e:
+        logger.warning(f"Could not sign video URLs: {e}")
+    return videos
+
+
 _EXT_TO_TYPE = {
     '.pdf': 'pdf',
     '.doc': 'doc', '.docx': 'docx',
@@ -93,9 +106,8 @@ def home(request):
             location=selected_location if selected_location else None,
             search=search_query if search_query else None,
             extra_taxonomy=extra_taxonomy if extra_taxonomy else None,
-            taxonomy_categories=taxonomy_categories,
         )
-        activities = [FirestoreActivity.from_dict(a) for a in activities_data]
+        activities = [FirestoreActivity.from_dict_summary(a) for a in activities_data]
 
         # Extract topics from already-fetched activities (avoids redundant Firestore query)
         all_topics_set = set()
@@ -194,15 +206,17 @@ def activity_detail(request, slug):
 
         # Get video URL from related_videos (new direct upload) or legacy video_ids
         video_url = None
-        if activity.related_videos:
+        related_videos = _hydrate_video_urls(
+            [FirestoreVideo.from_dict(v) for v in (activity.related_videos or [])]
+        )
+        if related_videos:
             # Use first related video as main video
-            first_video = activity.related_videos[0]
-            video_url = first_video.get('fileUrl', '')
+            video_url = related_videos[0].file_url
         elif activity.video_ids:
             # Fallback to legacy video references
             videos = firestore_service.get_videos_by_ids(activity.video_ids[:1])
             if videos:
-                video = FirestoreVideo.from_dict(videos[0])
+                video = _hydrate_video_urls([FirestoreVideo.from_dict(videos[0])])[0]
                 video_url = video.get_streaming_url(expiration_minutes=120)
 
         # Get teacher resources from direct uploads or legacy references
@@ -266,7 +280,7 @@ def activity_detail(request, slug):
         if activity.related_activity_refs:
             related_data = firestore_service.get_activities_by_ids(activity.related_activity_refs)
             related_activities = [
-                FirestoreActivity.from_dict(a) for a in related_data
+                FirestoreActivity.from_dict_summary(a) for a in related_data
                 if a.get('id') != activity.id
             ]
 
@@ -354,11 +368,11 @@ def activity_detail(request, slug):
     if getattr(settings, 'USE_FIRESTORE', False):
         # Transform related_videos URLs
         transformed_videos = []
-        for video in (activity.related_videos or []):
+        for video, signed in zip(activity.related_videos or [], related_videos):
             transformed_videos.append({
                 'title': video.get('title', ''),
-                'fileUrl': get_storage_url(video.get('fileUrl', '')),
-                'thumbnailUrl': get_storage_url(video.get('thumbnailUrl', '')),
+                'fileUrl': get_storage_url(signed.file_url),
+                'thumbnailUrl': get_storage_url(signed.thumbnail_url),
                 'duration': video.get('duration', 0),
                 'type': video.get('type', ''),
                 'caption': video.get('caption', ''),
@@ -459,10 +473,6 @@ def search_activities(request):
     extra_taxonomy = filters if filters else None
 
     if getattr(settings, 'USE_FIRESTORE', False):
-        taxonomy_categories = None
-        if topics or extra_taxonomy:
-            taxonomy_categories = taxonomy_service.get_all_taxonomy_categories()
-
         # Use Firestore for data
         activities_data = firestore_service.query_activities(
             grade=grade if grade else None,
@@ -470,9 +480,8 @@ def search_activities(request):
             location=location if location else None,
             search=query if query else None,
             extra_taxonomy=extra_taxonomy,
-            taxonomy_categories=taxonomy_categories,
         )
-        activities = [FirestoreActivity.from_dict(a) for a in activities_data]
+        activities = [FirestoreActivity.from_dict_summary(a) for a in activities_data]
     else:
         # Use Django ORM (fallback)
         activities = Activity.objects.filter(is_published=True)